@@ -5,7 +5,7 @@ analysis/ 配下のスクリプトから共有される:
   - XBRL パイプライン実行
   - 証券コード正規化
   - 報告書様式コード推定
-  - XBRLファイル収集
+  - XBRLファイル収集（DEIインデックスによる銘柄指定を含む）
 """
 import logging
 import sys
@@ -18,9 +18,12 @@ if str(PROJECT_ROOT) not in sys.path:
 if str(PROJECT_ROOT / "src") not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT / "src"))
 
-from parser.xbrl_parser import XBRLParser
+from parser.parse_cache import ParseCache
+from parser.xbrl_parser import TagFilter
 from parser.context_resolver import ContextResolver
-from normalizer.fact_normalizer import FactNormalizer
+from normalizer.dei_index import DeiIndex
+from normalizer.fact_normalizer import FactNormalizer, build_tag_filter
+from normalizer.null_classifier import get_null_classifier
 from financial.financial_master import FinancialMaster
 from config_loader import get_fact_keys, get_derived_keys
 from constants import SKIP_FILENAME_PATTERNS
@@ -29,6 +32,9 @@ logger = logging.getLogger(__name__)
 
 FACT_KEYS = get_fact_keys()
 DERIVED_KEYS = get_derived_keys()
+MAPPED_TAG_FILTER = build_tag_filter()
+NULL_REASONS_TAG_FILTER = get_null_classifier().extend_filter(MAPPED_TAG_FILTER)
+PARSE_CACHE = ParseCache.from_env()
 
 XBRL_BASE_DIR = PROJECT_ROOT / "data" / "edinet" / "raw_xbrl"
 
@@ -51,21 +57,33 @@ def check_form_code(filename: str) -> str:
 
 def run_pipeline(
     xbrl_path: Path,
+    tag_filter: TagFilter | None = None,
+    *,
+    provenance: bool = False,
+    null_reasons: bool = False,
 ) -> tuple[dict[str, Any], dict[str, Any], FactNormalizer, dict[str, Any], dict[str, Any]]:
     """XBRL ファイルを完全パイプラインで処理する。
 
+    Args:
+        xbrl_path: XBRL ファイルのパス
+        tag_filter: 指定時はマッピング対象タグのみを parse する（raw facts を走査しない用途向け）。
+            MAPPED_TAG_FILTER を渡すと normalizer 出力は変えずに parse コストを削減できる。
+            パース結果は PARSE_CACHE に保存され、同一内容の XBRL は再パースしない。
+        provenance: True の場合、normalized / master_result に "provenance"（採用 fact と棄却候補）を含める。
+        null_reasons: True の場合、master_result に "null_reasons"（NULL の fact_key ごとの分類）を含める。
+            tag_filter 指定時は NULL_REASONS_TAG_FILTER を渡す（分類用の部分一致パターンを含む）。
+
     Returns:
         (parsed, context_map, normalizer, normalized, master_result)
     Raises:
         Exception: パイプラインの任意のステップで失敗した場合
     """
-    parser = XBRLParser(xbrl_path)
-    parsed = parser.parse()
-    resolver = ContextResolver(parser.root)
+    parsed = PARSE_CACHE.parse(xbrl_path, tag_filter=tag_filter)
+    resolver = ContextResolver.from_parsed(parsed)
     ctx_map = resolver.build_context_map()
-    normalizer = FactNormalizer(parsed, ctx_map)
+    normalizer = FactNormalizer(parsed, ctx_map, provenance=provenance, null_reasons=null_reasons)
     normalized = normalizer.normalize()
-    master = FinancialMaster(normalized)
+    master = FinancialMaster(normalized, provenance=provenance, null_reasons=null_reasons)
     result = master.compute()
     return parsed, ctx_map, normalizer, normalized, result
 
@@ -78,3 +96,13 @@ def collect_xbrl_files(base_dir: Path | None = None) -> list[Path]:
         if not any(pat in f.name.lower() for pat in SKIP_FILENAME_PATTERNS):
             files.append(f)
     return sorted(files)
+
+
+def collect_xbrl_files_for_codes(
+    codes: set[str] | list[str],
+    base_dir: Path | None = None,
+) -> list[Path]:
+    """DEIインデックスを更新し、指定証券コードの XBRL ファイルのみを返す。"""
+    index = DeiIndex(base_dir or XBRL_BASE_DIR)
+    index.refresh()
+    return index.files_for(codes)
@@ -0,0 +1,106 @@
+"""
+出力形式（pretty / compact / gzip）のベンチマーク。
+
+financial-dataset の全銘柄別ファイルを読み込み、形式ごとに
+ディスク上のバイト数・エンコード時間・デコード時間（read_dataset_json と同じデコード処理）を計測する。
+orjson がインストールされている場合は、比較用に標準 json の compact も計測する。
+
+使用例:
+    python scripts/analysis/benchmark_serializers.py
+    python scripts/analysis/benchmark_serializers.py --dataset /path/to/financial-dataset --repeat 5
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from _pipeline import PROJECT_ROOT
+
+from output.serializer import (
+    DATASET_SUFFIXES,
+    SERIALIZERS,
+    CompactSerializer,
+    DatasetSerializer,
+    decode_dataset_bytes,
+    orjson,
+    read_dataset_json,
+)
+
+
+class _StdlibCompactSerializer(CompactSerializer):
+    """比較用: 標準 json の compact。"""
+
+    name = "compact (json)"
+
+    def dumps(self, payload: dict) -> bytes:
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def collect_documents(dataset_dir: Path) -> list[dict]:
+    """annual / quarterly 配下の全銘柄別ファイルを読み込む。"""
+    documents: list[dict] = []
+    for category in ("annual", "quarterly"):
+        for path in sorted((dataset_dir / category).glob("*/*")):
+            if path.name.endswith(DATASET_SUFFIXES):
+                documents.append(read_dataset_json(path))
+    return documents
+
+
+def benchmark(serializer: DatasetSerializer, documents: list[dict], repeat: int) -> dict:
+    """serializer で全件をエンコード・デコードし、最速の計測値を返す。"""
+    encode_times: list[float] = []
+    decode_times: list[float] = []
+    encoded: list[bytes] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        encoded = [serializer.encode(doc) for doc in documents]
+        encode_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for raw in encoded:
+            decode_dataset_bytes(raw)
+        decode_times.append(time.perf_counter() - start)
+
+    return {
+        "bytes": sum(len(raw) for raw in encoded),
+        "encode": min(encode_times),
+        "decode": min(decode_times),
+    }
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="出力形式のベンチマーク")
+    arg_parser.add_argument(
+        "--dataset", type=Path, default=None,
+        help="financial-dataset のパス（省略時は DATASET_PATH 環境変数、未設定ならリポジトリ内の financial-dataset）",
+    )
+    arg_parser.add_argument("--repeat", type=int, default=3, help="計測回数（最速値を採用）")
+    args = arg_parser.parse_args()
+
+    dataset_dir = args.dataset or Path(os.environ.get("DATASET_PATH") or PROJECT_ROOT / "financial-dataset")
+    documents = collect_documents(dataset_dir)
+    if not documents:
+        print(f"銘柄別ファイルが見つかりません: {dataset_dir}")
+        sys.exit(1)
+
+    serializers: list[DatasetSerializer] = [cls() for cls in SERIALIZERS.values()]
+    if orjson is not None:
+        serializers.insert(2, _StdlibCompactSerializer())
+
+    print(f"対象: {dataset_dir} ({len(documents)} files, encoder: {'orjson' if orjson else 'json'})")
+    print(f"\n{'format':<16} {'bytes':>12} {'ratio':>7} {'encode ms':>10} {'decode ms':>10}")
+    print("-" * 60)
+    baseline = None
+    for serializer in serializers:
+        result = benchmark(serializer, documents, args.repeat)
+        baseline = baseline or result["bytes"]
+        print(
+            f"{serializer.name:<16} {result['bytes']:>12,} {result['bytes'] / baseline:>6.1%} "
+            f"{result['encode'] * 1000:>10.1f} {result['decode'] * 1000:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
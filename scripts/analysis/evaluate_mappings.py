@@ -0,0 +1,207 @@
+"""
+マッピング候補比較スクリプト。
+
+各XBRLを1回だけパースし、複数のマッピング候補（taxonomy_mapping.yaml / canonical_keys.yaml）で
+正規化して以下を出力する:
+  1. 候補ごとの fact_key 別 NULL 率（current_year）
+  2. 基準候補（現行設定）との値の差分件数と差分例
+
+候補の指定: --variant MAPPING[,CANONICAL_KEYS]
+  MAPPING は taxonomy_mapping.yaml 形式、CANONICAL_KEYS は canonical_keys.yaml 形式（省略時は現行）。
+  候補名はファイル名（拡張子なし）。
+
+使用例:
+    python scripts/analysis/evaluate_mappings.py --variant candidate_mapping.yaml
+    python scripts/analysis/evaluate_mappings.py --variant a.yaml --variant b.yaml,b_keys.yaml --codes 7203 6758
+"""
+import argparse
+import json
+import logging
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from _pipeline import (
+    PARSE_CACHE,
+    collect_xbrl_files,
+    collect_xbrl_files_for_codes,
+    normalize_code,
+)
+from parser.context_resolver import ContextResolver
+from parser.xbrl_parser import TagFilter
+from normalizer.fact_normalizer import FactNormalizer, MappingPlan
+from financial.financial_master import FactKeyRules, FinancialMaster
+
+logging.basicConfig(level=logging.WARNING)
+
+BASELINE_NAME = "current"
+MAX_DIFF_EXAMPLES = 5
+
+
+class MappingVariant:
+    """比較対象のマッピング候補（MappingPlan + FactKeyRules）。"""
+
+    def __init__(
+        self,
+        name: str,
+        mapping_file: str | Path = "taxonomy_mapping.yaml",
+        canonical_keys_file: str | Path = "canonical_keys.yaml",
+    ) -> None:
+        self.name = name
+        self.plan = MappingPlan.load(mapping_file)
+        self.rules = FactKeyRules(canonical_keys_file)
+
+    @classmethod
+    def from_spec(cls, spec: str) -> "MappingVariant":
+        """MAPPING[,CANONICAL_KEYS] 形式の指定から構築する（パスは実行ディレクトリ基準）。"""
+        mapping_file, _, canonical_keys_file = spec.partition(",")
+        mapping_path = Path(mapping_file).resolve()
+        if canonical_keys_file:
+            return cls(mapping_path.stem, mapping_path, Path(canonical_keys_file).resolve())
+        return cls(mapping_path.stem, mapping_path)
+
+
+def union_tag_filter(variants: list[MappingVariant]) -> TagFilter:
+    """全候補の参照タグを含むパース用フィルタを返す。"""
+    local_names: frozenset[str] = frozenset()
+    keywords: tuple[str, ...] = ()
+    for variant in variants:
+        local_names |= variant.plan.tag_filter.local_names
+        keywords += tuple(k for k in variant.plan.tag_filter.keywords if k not in keywords)
+    return TagFilter(local_names, keywords)
+
+
+def evaluate_documents(
+    documents: Iterable[tuple[dict[str, Any], dict[str, dict[str, Any]]]],
+    variants: list[MappingVariant],
+) -> dict[str, Any]:
+    """
+    パース済み文書を全候補で正規化し、NULL 率と基準候補（variants[0]）との差分を集計する。
+
+    Returns:
+        {
+            "documents": 文書数,
+            "null_counts": {候補名: {fact_key: NULL 件数}},
+            "diffs": {候補名: {fact_key: 差分件数}},
+            "examples": {候補名: {fact_key: [{"doc_id", "security_code", "baseline", "value"}]}},
+        }
+    """
+    null_counts: dict[str, Counter] = {v.name: Counter() for v in variants}
+    diffs: dict[str, Counter] = {v.name: Counter() for v in variants[1:]}
+    examples: dict[str, dict[str, list[dict[str, Any]]]] = {
+        v.name: defaultdict(list) for v in variants[1:]
+    }
+    document_count = 0
+    for parsed, context_map in documents:
+        document_count += 1
+        metrics_by_variant: list[dict[str, Any]] = []
+        meta: dict[str, Any] = {}
+        for variant in variants:
+            normalized = FactNormalizer(parsed, context_map, plan=variant.plan).normalize()
+            result = FinancialMaster(normalized, rules=variant.rules).compute()
+            metrics = (result.get("current_year") or {}).get("metrics") or {}
+            for key in variant.rules.fact_keys:
+                if metrics.get(key) is None:
+                    null_counts[variant.name][key] += 1
+            metrics_by_variant.append(metrics)
+            meta = meta or {
+                "doc_id": normalized.get("doc_id"),
+                "security_code": normalize_code(normalized.get("security_code") or ""),
+            }
+
+        baseline = metrics_by_variant[0]
+        for variant, metrics in zip(variants[1:], metrics_by_variant[1:]):
+            for key in sorted(set(baseline) | set(metrics)):
+                if baseline.get(key) == metrics.get(key):
+                    continue
+                diffs[variant.name][key] += 1
+                if len(examples[variant.name][key]) < MAX_DIFF_EXAMPLES:
+                    examples[variant.name][key].append({
+                        **meta, "baseline": baseline.get(key), "value": metrics.get(key),
+                    })
+
+    return {
+        "documents": document_count,
+        "null_counts": {name: dict(c) for name, c in null_counts.items()},
+        "diffs": {name: dict(c) for name, c in diffs.items()},
+        "examples": {name: dict(e) for name, e in examples.items()},
+    }
+
+
+def _parse_documents(
+    xbrl_files: list[Path],
+    tag_filter: TagFilter,
+) -> Iterable[tuple[dict[str, Any], dict[str, dict[str, Any]]]]:
+    for xbrl_path in xbrl_files:
+        try:
+            parsed = PARSE_CACHE.parse(xbrl_path, tag_filter=tag_filter)
+        except Exception as e:
+            print(f"  [ERROR] {xbrl_path.name}: {e}")
+            continue
+        yield parsed, ContextResolver.from_parsed(parsed).build_context_map()
+
+
+def print_report(report: dict[str, Any], variants: list[MappingVariant]) -> None:
+    total = report["documents"]
+    baseline = variants[0].name
+
+    print(f"\n{'=' * 80}")
+    print(f"  1. fact_key 別 NULL 率 (current_year, {total} 件)")
+    print(f"{'=' * 80}")
+    keys = sorted(set().union(*(v.rules.fact_keys for v in variants)))
+    names = [v.name for v in variants]
+    print(f"  {'fact_key':<45}" + "".join(f"{name:>14}" for name in names))
+    for key in keys:
+        row = ""
+        for name in names:
+            rate = report["null_counts"][name].get(key, 0) / total if total else 0
+            row += f"{rate:>14.1%}"
+        print(f"  {key:<45}{row}")
+
+    print(f"\n{'=' * 80}")
+    print(f"  2. 基準 ({baseline}) との値の差分")
+    print(f"{'=' * 80}")
+    for name in names[1:]:
+        diffs = report["diffs"][name]
+        print(f"\n--- {name}: 差分 {sum(diffs.values())} 件 ---")
+        if not diffs:
+            print("  (差分なし)")
+        for key, count in sorted(diffs.items(), key=lambda kv: (-kv[1], kv[0])):
+            print(f"  {key}: {count}/{total} 件")
+            for ex in report["examples"][name].get(key, []):
+                print(f"    {ex['security_code']} ({ex['doc_id']}): {ex['baseline']} -> {ex['value']}")
+
+
+def main(argv: list[str] | None = None) -> dict[str, Any]:
+    arg_parser = argparse.ArgumentParser(description="マッピング候補比較")
+    arg_parser.add_argument(
+        "--variant", action="append", required=True, metavar="MAPPING[,CANONICAL_KEYS]",
+        help="比較するマッピング候補（複数指定可）。基準は現行の config/ 設定",
+    )
+    arg_parser.add_argument("--codes", nargs="+", metavar="CODE", help="対象の証券コード")
+    arg_parser.add_argument("--json", type=Path, metavar="PATH", help="集計結果を JSON で保存する")
+    args = arg_parser.parse_args(argv)
+
+    variants = [MappingVariant(BASELINE_NAME)] + [MappingVariant.from_spec(s) for s in args.variant]
+    xbrl_files = collect_xbrl_files_for_codes(args.codes) if args.codes else collect_xbrl_files()
+
+    print("=" * 80)
+    print("  マッピング候補比較レポート")
+    print("=" * 80)
+    print(f"\n対象XBRLファイル数: {len(xbrl_files)}")
+    print(f"候補: {', '.join(v.name for v in variants)}")
+
+    documents = _parse_documents(xbrl_files, union_tag_filter(variants))
+    report = evaluate_documents(documents, variants)
+    print_report(report, variants)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n保存: {args.json}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
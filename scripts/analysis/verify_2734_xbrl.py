@@ -141,7 +141,7 @@ def main() -> None:
     print("=" * 90)
     print(f"\nXBRL: {xbrl_path}")
 
-    parsed, ctx_map, normalizer, normalized, result = run_pipeline(xbrl_path)
+    parsed, ctx_map, normalizer, normalized, result = run_pipeline(xbrl_path, provenance=True)
     facts = parsed.get("facts", [])
     current_year_end = normalizer._current_year_end
     prior_year_end = normalizer._prior_year_end
@@ -297,9 +297,18 @@ def main() -> None:
     print("=" * 90)
 
     bs = normalized.get("current_year", {}).get("bs", {})
+    bs_provenance = normalized.get("provenance", {}).get("current_year", {}).get("bs", {})
     for k in ["short_term_borrowings", "current_portion_of_long_term_borrowings", "long_term_borrowings",
               "short_term_lease_obligations", "long_term_lease_obligations", "lease_obligations"]:
         print(f"  {k}: {bs.get(k)}")
+        record = bs_provenance.get(k)
+        if not record:
+            continue
+        chosen = record["chosen"]
+        if chosen:
+            print(f"    <- {chosen['tag']} (contextRef={chosen['contextRef']}, source={chosen['source']})")
+        for rejected in record["rejected"]:
+            print(f"    x  {rejected['tag']} (contextRef={rejected['contextRef']}, reason={rejected['reason']})")
 
     # --- 結論 ---
     print("\n" + "=" * 90)
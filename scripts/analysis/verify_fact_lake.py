@@ -14,6 +14,7 @@ from pathlib import Path
 from _pipeline import (
     PROJECT_ROOT,
     FACT_KEYS,
+    MAPPED_TAG_FILTER,
     DERIVED_KEYS,
     collect_xbrl_files,
     normalize_code,
@@ -49,7 +50,7 @@ TARGET_LABELS = {
 def process_xbrl(xbrl_path: Path) -> dict:
     """1ファイルを処理し検証に必要な情報を返す。"""
     try:
-        parsed, _ctx_map, _normalizer, normalized, result = run_pipeline(xbrl_path)
+        parsed, _ctx_map, _normalizer, normalized, result = run_pipeline(xbrl_path, MAPPED_TAG_FILTER)
         return {
             "xbrl_path": str(xbrl_path),
             "xbrl_filename": xbrl_path.name,
@@ -12,7 +12,8 @@ from pathlib import Path
 from _pipeline import (
     PROJECT_ROOT,
     FACT_KEYS,
-    collect_xbrl_files,
+    MAPPED_TAG_FILTER,
+    collect_xbrl_files_for_codes,
     normalize_code,
     check_form_code,
     run_pipeline,
@@ -39,7 +40,7 @@ TARGET_LABELS = {
 def process_xbrl(xbrl_path: Path) -> dict:
     """1ファイルを処理し詳細検証に必要な情報を返す。"""
     try:
-        parsed, _ctx_map, _normalizer, _normalized, result = run_pipeline(xbrl_path)
+        parsed, _ctx_map, _normalizer, _normalized, result = run_pipeline(xbrl_path, MAPPED_TAG_FILTER)
         return {
             "xbrl_path": str(xbrl_path),
             "xbrl_filename": xbrl_path.name,
@@ -106,8 +107,8 @@ def _print_company_report(r: dict, index: int) -> None:
 
 
 def main() -> None:
-    xbrl_files = collect_xbrl_files()
     target_codes = set(TARGET_LABELS.keys())
+    xbrl_files = collect_xbrl_files_for_codes(target_codes)
     found: dict[str, list[dict]] = {}
 
     for xf in xbrl_files:
@@ -4,7 +4,16 @@ XBRLファイルをパースしてJSON出力まで実行する。
 
 使用例:
     python scripts/process_all.py
+    python scripts/process_all.py --codes 7203 6758   # DEIインデックスで対象銘柄のXBRLのみ処理
+    python scripts/process_all.py --history            # 主要な経営指標等の推移から過年度も出力
+    python scripts/process_all.py --provenance data/provenance  # 出力値の由来を doc_id ごとに保存
+    python scripts/process_all.py --keys net_sales equity --output subset.jsonl  # 指定 fact_key のみ算出
+    python scripts/process_all.py --null-reasons       # NULL 分類サイドカーと manifest 集計も出力
+    python scripts/process_all.py --rebuild-manifest   # manifest・銘柄インデックスを全件スキャンで再生成（修復用）
+    python scripts/process_all.py --format gzip        # 銘柄別ファイルを gzip 圧縮 JSON（.json.gz）で出力
 """
+import argparse
+import json
 import logging
 import os
 import sys
@@ -24,11 +33,17 @@ if "DATASET_PATH" not in os.environ:
     sys.stderr.write("ERROR: DATASET_PATH 環境変数が設定されていません。\n")
     sys.exit(1)
 
-from parser.xbrl_parser import XBRLParser
+from parser.parse_cache import ParseCache
+from parser.xbrl_parser import TagFilter
 from parser.context_resolver import ContextResolver
-from normalizer.fact_normalizer import FactNormalizer
-from financial.financial_master import FinancialMaster
-from output.json_exporter import JSONExporter
+from normalizer.dei_index import DeiIndex
+from normalizer.fact_normalizer import FactNormalizer, MappingPlan, build_tag_filter
+from normalizer.null_classifier import get_null_classifier
+from financial.financial_master import FactKeyRules, FinancialMaster
+from output.company_index import CompanyIndex
+from output.json_exporter import ExportSession, JSONExporter
+from output.manifest_generator import DatasetManifestGenerator
+from output.serializer import SERIALIZERS
 from constants import SKIP_FILENAME_PATTERNS
 
 logging.basicConfig(
@@ -39,14 +54,98 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def main() -> None:
+def _save_provenance(
+    output_dir: Path,
+    normalized_data: dict,
+    financial_data: dict,
+) -> None:
+    """normalizer / FinancialMaster の provenance を {doc_id}.json に保存する。"""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "doc_id": normalized_data.get("doc_id"),
+        "security_code": normalized_data.get("security_code"),
+        "fiscal_year_end": normalized_data.get("fiscal_year_end"),
+        "normalizer": normalized_data.get("provenance"),
+        "financial": financial_data.get("provenance"),
+    }
+    path = output_dir / f"{normalized_data.get('doc_id') or 'unknown'}.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=1)
+
+
+def _build_projection(keys: list[str]) -> tuple[FactKeyRules, MappingPlan]:
+    """
+    指定 fact_key の算出に必要な規則と決定表を返す。
+
+    resolution 候補・normalizer_key 別名から必要な normalizer キーを求め、
+    決定表（とパース用の tag_filter）をそのキーのタグに縮小する。
+    """
+    rules = FactKeyRules().project(keys)
+    plan = MappingPlan.load().project(rules.normalizer_keys())
+    return rules, plan
+
+
+def main(argv: list[str] | None = None) -> None:
+    arg_parser = argparse.ArgumentParser(description="全XBRL一括処理パイプライン")
+    arg_parser.add_argument(
+        "--codes", nargs="+", metavar="CODE",
+        help="処理対象の証券コード（DEIインデックスで対象XBRLを特定する）",
+    )
+    arg_parser.add_argument(
+        "--history", action="store_true",
+        help="主要な経営指標等の推移（4期前まで）から過年度分も出力する（既存の出力は上書きしない）",
+    )
+    arg_parser.add_argument(
+        "--provenance", type=Path, metavar="DIR",
+        help="出力値の由来（採用タグ・contextRef・BSアンカー/resolution 適用・棄却候補）を DIR/{doc_id}.json に保存する",
+    )
+    arg_parser.add_argument(
+        "--keys", nargs="+", metavar="KEY",
+        help="指定 fact_key のみを算出する（パース・正規化も必要なタグに限定）。"
+             "結果は financial-dataset ではなく --output に JSON Lines で出力する",
+    )
+    arg_parser.add_argument(
+        "--output", type=Path, metavar="PATH",
+        help="--keys 指定時の出力先（JSON Lines）。省略時は標準出力",
+    )
+    arg_parser.add_argument(
+        "--null-reasons", action="store_true",
+        help="NULL の fact_key ごとの分類（経済実態/会計基準差/空値/取得失敗）をサイドカーに保存し、"
+             "manifest に件数を集計する",
+    )
+    arg_parser.add_argument(
+        "--format", choices=sorted(SERIALIZERS), default="pretty",
+        help="銘柄別ファイルの出力形式（pretty: indent=2 の JSON（既定） / compact: 空白なし JSON / "
+             "gzip: compact を gzip 圧縮した .json.gz）",
+    )
+    arg_parser.add_argument(
+        "--rebuild-manifest", action="store_true",
+        help="処理後に dataset_manifest.json と company_index.json を全件スキャンで再生成する（差分更新の修復用）",
+    )
+    args = arg_parser.parse_args(argv)
+
+    rules, plan = None, None
+    if args.keys:
+        try:
+            rules, plan = _build_projection(args.keys)
+        except ValueError as e:
+            arg_parser.error(str(e))
+    elif args.output:
+        arg_parser.error("--output は --keys と併せて指定してください")
+
     xbrl_base_dir = project_root / "data" / "edinet" / "raw_xbrl"
 
     if not xbrl_base_dir.exists():
         logger.warning("XBRLディレクトリが存在しません: %s", xbrl_base_dir)
         return
 
-    xbrl_files = list(xbrl_base_dir.rglob("*.xbrl"))
+    if args.codes:
+        dei_index = DeiIndex(xbrl_base_dir)
+        dei_index.refresh()
+        xbrl_files = dei_index.files_for(args.codes)
+        logger.info("対象銘柄: %s", ", ".join(args.codes))
+    else:
+        xbrl_files = list(xbrl_base_dir.rglob("*.xbrl"))
     logger.info("XBRL検索ディレクトリ: %s", xbrl_base_dir)
     logger.info("XBRL ファイル数: %d", len(xbrl_files))
 
@@ -54,6 +153,51 @@ def main() -> None:
         logger.warning("XBRLファイルが見つかりません: %s", xbrl_base_dir)
         return
 
+    tag_filter = plan.tag_filter if plan else build_tag_filter()
+    if args.null_reasons:
+        tag_filter = get_null_classifier().extend_filter(tag_filter)
+    parse_cache = ParseCache.from_env()
+    exporter = JSONExporter(defer_manifest=True, serializer=args.format)
+    projection_out = None
+    if plan:
+        projection_out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        # 書き込みはバックグラウンドで行い、manifest はセッション終了時に1回だけ保存する
+        with exporter.session() as session:
+            _process_files(
+                xbrl_files, args, tag_filter, parse_cache, session,
+                rules=rules, plan=plan, projection_out=projection_out,
+            )
+    finally:
+        if projection_out is not None and projection_out is not sys.stdout:
+            projection_out.close()
+
+    if args.rebuild_manifest:
+        manifest_path = DatasetManifestGenerator(str(exporter.base_dir)).save()
+        logger.info("Dataset manifest rebuilt: %s", manifest_path)
+        index_path = CompanyIndex(exporter.base_dir).rebuild()
+        logger.info("Company index rebuilt: %s", index_path)
+
+    logger.info(
+        "Processing completed (written=%d, unchanged=%d, parse cache: hit=%d, miss=%d)",
+        exporter.written, exporter.unchanged, parse_cache.hits, parse_cache.misses,
+    )
+
+
+def _process_files(
+    xbrl_files: list[Path],
+    args: argparse.Namespace,
+    tag_filter: TagFilter,
+    parse_cache: ParseCache,
+    session: ExportSession,
+    *,
+    rules: FactKeyRules | None,
+    plan: MappingPlan | None,
+    projection_out,
+) -> None:
+    """XBRL を順に処理する。projection_out 指定時は financial-dataset に保存せず JSON Lines で書き出す。"""
+    provenance = args.provenance is not None
+    null_reasons = args.null_reasons
     for xbrl_path in xbrl_files:
         try:
             name_lower = xbrl_path.name.lower()
@@ -63,12 +207,16 @@ def main() -> None:
 
             logger.info("Processing: %s", xbrl_path.name)
 
-            parser = XBRLParser(xbrl_path)
-            parsed_data = parser.parse()
-            resolver = ContextResolver(parser.root)
+            parsed_data = parse_cache.parse(xbrl_path, tag_filter=tag_filter)
+            resolver = ContextResolver.from_parsed(parsed_data)
             context_map = resolver.build_context_map()
-            normalizer = FactNormalizer(parsed_data, context_map)
-            normalized_data = normalizer.normalize()
+            normalizer = FactNormalizer(
+                parsed_data, context_map, provenance=provenance, plan=plan, null_reasons=null_reasons,
+            )
+            if args.history:
+                normalized_data, *history = normalizer.normalize_periods()
+            else:
+                normalized_data, history = normalizer.normalize(), []
 
             security_code = normalized_data.get("security_code")
             fiscal_year_end = normalized_data.get("fiscal_year_end")
@@ -79,12 +227,37 @@ def main() -> None:
                 )
                 continue
 
-            master = FinancialMaster(normalized_data)
+            master = FinancialMaster(
+                normalized_data, provenance=provenance, rules=rules, null_reasons=null_reasons,
+            )
             financial_data = master.compute()
+            if provenance:
+                _save_provenance(args.provenance, normalized_data, financial_data)
 
-            exporter = JSONExporter()
-            json_path = exporter.export(financial_data)
-            logger.info("Saved: %s", json_path)
+            if projection_out is not None:
+                projection_out.write(json.dumps(financial_data, ensure_ascii=False) + "\n")
+                for period_data in history:
+                    period_financial = FinancialMaster(
+                        period_data, rules=rules, null_reasons=null_reasons,
+                    ).compute()
+                    if "current_year" in period_financial:
+                        projection_out.write(json.dumps(period_financial, ensure_ascii=False) + "\n")
+                continue
+
+            json_path = session.export(financial_data)
+            logger.info("Queued: %s", json_path)
+
+            for period_data in history:
+                period_financial = FinancialMaster(period_data, null_reasons=null_reasons).compute()
+                if "current_year" not in period_financial:
+                    continue
+                try:
+                    period_path = session.export(period_financial, overwrite=False)
+                except ValueError as e:
+                    logger.debug("SKIP: %s (%s) - %s", xbrl_path.name, period_data["fiscal_year_end"], e)
+                    continue
+                if period_path:
+                    logger.info("Queued (history): %s", period_path)
 
         except ValueError as e:
             error_msg = str(e).lower()
@@ -95,8 +268,6 @@ def main() -> None:
         except Exception as e:
             logger.error("Failed: %s - %s", xbrl_path.name, e, exc_info=True)
 
-    logger.info("Processing completed")
-
 
 if __name__ == "__main__":
     main()
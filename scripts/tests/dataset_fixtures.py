@@ -0,0 +1,63 @@
+"""
+financial-dataset 出力系テストの共通フィクスチャ。
+
+テストスクリプトと同じディレクトリから `from dataset_fixtures import ...` で読み込む。
+"""
+import os
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+
+def financial(
+    code: str,
+    fiscal_year_end: str = "2025-03-31",
+    net_sales: float | None = 1000.0,
+    *,
+    metrics: dict[str, Any] | None = None,
+    doc_id: str | None = None,
+    report_type: str = "annual",
+    accounting_standard: str = "Japan GAAP",
+    period: dict[str, str] | None = None,
+    null_reasons: dict[str, Any] | None = None,
+    **fields: Any,
+) -> dict[str, Any]:
+    """
+    JSONExporter に渡す FinancialMaster 出力形式の入力を返す。
+
+    metrics 未指定時の current_year は net_sales と ordinary_income（null）。
+    doc_id の既定値は "S{code}{決算年}"。null_reasons は current_year の NULL 分類。
+    fields（prior_year・source 等）はそのまま追加する。
+    """
+    current: dict[str, Any] = {
+        "metrics": metrics if metrics is not None else {"net_sales": net_sales, "ordinary_income": None},
+    }
+    if period is not None:
+        current["period"] = period
+    data: dict[str, Any] = {
+        "doc_id": doc_id if doc_id is not None else f"S{code}{fiscal_year_end[:4]}",
+        "security_code": code, "fiscal_year_end": fiscal_year_end,
+        "report_type": report_type, "consolidation_type": "consolidated",
+        "accounting_standard": accounting_standard,
+        "current_year": current,
+    }
+    if null_reasons is not None:
+        data["null_reasons"] = {"current_year": null_reasons}
+    data.update(fields)
+    return data
+
+
+@contextmanager
+def temp_dataset() -> Iterator[str]:
+    """一時ディレクトリを DATASET_PATH に設定して返す（終了時に削除し、DATASET_PATH を元に戻す）。"""
+    previous = os.environ.get("DATASET_PATH")
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATASET_PATH"] = tmp
+        try:
+            yield tmp
+        finally:
+            if previous is None:
+                os.environ.pop("DATASET_PATH", None)
+            else:
+                os.environ["DATASET_PATH"] = previous
@@ -0,0 +1,82 @@
+"""
+BatchNormalizer（複数文書の一括正規化）のテストスクリプト。
+文書ごとの FactNormalizer.normalize() と結果（キー順を含む）が一致することを確認する。
+"""
+import json
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from parser.context_resolver import ContextResolver
+from normalizer.batch_normalizer import BatchNormalizer
+from normalizer.fact_normalizer import FactNormalizer
+
+CONTEXT_MAP = {
+    "CurrentYearDuration": {"type": "duration", "start_date": "2024-04-01", "end_date": "2025-03-31"},
+    "Prior1YearDuration": {"type": "duration", "start_date": "2023-04-01", "end_date": "2024-03-31"},
+    "CurrentYearInstant": {"type": "instant", "date": "2025-03-31"},
+    "Prior1YearInstant": {"type": "instant", "date": "2024-03-31"},
+    "CurrentYearDuration_NonConsolidatedMember": {
+        "type": "duration", "start_date": "2024-04-01", "end_date": "2025-03-31",
+    },
+    "FilingDateInstant": {"type": "instant", "date": "2025-06-25"},
+}
+
+
+def _fact(tag: str, context_ref: str, value: str, is_nil: bool = False) -> dict:
+    return {"tag": tag, "contextRef": context_ref, "unitRef": "JPY", "decimals": "-6",
+            "value": value, "is_nil": is_nil}
+
+
+def _document(doc_id: str, consolidated: str, facts: list[dict]) -> tuple[dict, dict]:
+    dei = [
+        _fact("jpdei_cor:SecurityCodeDEI", "FilingDateInstant", doc_id[-5:]),
+        _fact("jpdei_cor:WhetherConsolidatedFinancialStatementsArePrepared", "FilingDateInstant", consolidated),
+        _fact("jpdei_cor:CurrentFiscalYearEndDateDEI", "FilingDateInstant", "2025-03-31"),
+    ]
+    parsed = {"doc_id": doc_id, "facts": dei + facts}
+    return parsed, ContextResolver(context_map=CONTEXT_MAP).build_context_map()
+
+
+if __name__ == "__main__":
+    documents = [
+        _document("S0000001", "true", [
+            _fact("jppfs_cor:NetSales", "CurrentYearDuration_NonConsolidatedMember", "500"),
+            _fact("jppfs_cor:NetSales", "CurrentYearDuration", "1000"),
+            _fact("jppfs_cor:NetSales", "Prior1YearDuration", "900"),
+            _fact("jppfs_cor:OperatingIncome", "CurrentYearDuration", "", is_nil=True),
+            _fact("jppfs_cor:Assets", "CurrentYearInstant", "5000"),
+        ]),
+        _document("S0000002", "false", [
+            _fact("jppfs_cor:NetSales", "CurrentYearDuration_NonConsolidatedMember", "300"),
+            _fact("jppfs_cor:NetAssets", "CurrentYearInstant", "abc"),
+            _fact("jppfs_cor:LiabilitiesAndNetAssets", "Prior1YearInstant", "2000"),
+        ]),
+        _document("S0000003", "true", []),
+    ]
+
+    expected = [FactNormalizer(parsed, ctx).normalize() for parsed, ctx in documents]
+    actual = BatchNormalizer().normalize_many(documents)
+
+    def dump(results: list[dict]) -> list[str]:
+        return [json.dumps(r, ensure_ascii=False) for r in results]
+
+    checks = [
+        ("文書数", len(actual) == len(documents)),
+        ("normalize() と完全一致（キー順を含む）", dump(actual) == dump(expected)),
+        ("連結文書は単体 fact を採用しない", actual[0]["current_year"]["pl"]["net_sales"] == 1000),
+        ("単体文書は単体 fact を採用", actual[1]["current_year"]["pl"]["net_sales"] == 300),
+        ("xsi:nil は None", actual[0]["current_year"]["pl"]["operating_income"] is None),
+        ("空リスト", BatchNormalizer().normalize_many([]) == []),
+    ]
+
+    all_ok = True
+    for name, ok in checks:
+        status = "[OK]" if ok else "[NG]"
+        print(f"{status} {name}")
+        if not ok:
+            all_ok = False
+
+    sys.exit(0 if all_ok else 1)
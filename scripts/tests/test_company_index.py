@@ -0,0 +1,90 @@
+"""
+銘柄ごとの出力履歴インデックス（CompanyIndex / metadata/company_index.json）のテストスクリプト。
+"""
+import json
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from dataset_fixtures import financial, temp_dataset
+from output.company_index import CompanyIndex
+from output.dataset_io import payload_hash
+from output.json_exporter import JSONExporter
+from output.serializer import read_dataset_json
+
+
+def _comparable(index_path: Path) -> dict:
+    return read_dataset_json(index_path)["companies"]
+
+
+if __name__ == "__main__":
+    with temp_dataset() as tmp:
+        base = Path(tmp)
+
+        exporter = JSONExporter(tmp)
+        with exporter.session() as session:
+            for year in range(2016, 2026):
+                session.export(financial("72030", f"{year}-03-31"))
+            session.export(financial("72030", "2025-06-30", report_type="quarterly"))
+            session.export(financial("67580", "2025-03-31"))
+
+        index = CompanyIndex(tmp)
+        history = index.history("7203")
+        history_paths = [entry["path"] for entry in history]
+        hashes_match = all(
+            entry["content_hash"] == payload_hash(json.loads((base / entry["path"]).read_text(encoding="utf-8")))
+            for entry in history
+        )
+        documents = index.load_history("7203", limit=3)
+        all_types = [(e["report_type"], e["data_version"]) for e in index.history("7203", report_type=None)]
+
+        # 上書き（内容変更）はエントリを差し替える
+        exporter = JSONExporter(tmp, serializer="gzip")
+        exporter.export(financial("72030", "2025-03-31", net_sales=2000.0))
+        exporter.close()
+        latest = CompanyIndex(tmp).history("7203")[0]
+        replaced = (
+            latest["path"] == "annual/2025FY/7203.json.gz"
+            and len(CompanyIndex(tmp).history("7203")) == 10
+            and latest["content_hash"] == exporter._company_index.history("7203")[0]["content_hash"]
+        )
+
+        # export ごとには保存せず、close() で他のメタデータとまとめて1回保存する
+        index_path = base / "metadata" / "company_index.json"
+        saved = index_path.read_bytes()
+        exporter = JSONExporter(tmp)
+        for i in range(50):
+            exporter.export(financial(f"{2000 + i}0", "2025-03-31"))
+        coalesced = index_path.read_bytes() == saved
+        exporter.close()
+        coalesced = coalesced and len(CompanyIndex(tmp).history("2049")) == 1
+
+        # インデックスが無い場合は全銘柄別ファイルから再構築する
+        incremental = _comparable(index_path)
+        index_path.unlink()
+        rebuilt = _comparable(Path(CompanyIndex(tmp).rebuild()))
+
+    checks = [
+        ("1回の索引参照で10期分", len(history) == 10),
+        ("data_version の降順", [e["data_version"] for e in history] == [f"{y}FY" for y in range(2025, 2015, -1)]),
+        ("相対パス・doc_id", history_paths[0] == "annual/2025FY/7203.json" and history[-1]["doc_id"] == "S720302016"),
+        ("content_hash = 内容ハッシュ", hashes_match),
+        ("load_history は新しい順に直接読み込み", [d["data_version"] for d in documents] == ["2025FY", "2024FY", "2023FY"]),
+        ("report_type=None は annual → quarterly", all_types[0] == ("annual", "2025FY")
+            and all_types[-1] == ("quarterly", "2025Q2")),
+        ("上書き・出力形式変更でエントリを差し替え", replaced),
+        ("export ごとには保存しない（close() で1回）", coalesced),
+        ("差分更新 = 全件再構築", incremental == rebuilt),
+    ]
+
+    all_ok = True
+    for name, ok in checks:
+        status = "[OK]" if ok else "[NG]"
+        print(f"{status} {name}")
+        if not ok:
+            all_ok = False
+
+    sys.exit(0 if all_ok else 1)
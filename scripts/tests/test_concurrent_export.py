@@ -0,0 +1,151 @@
+"""
+複数プロセスからの同時出力（dataset_lock.py / doc_id・過年度分の印による出力先の衝突解決）のテストスクリプト。
+"""
+import hashlib
+import json
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from dataset_fixtures import financial, temp_dataset
+from output.company_index import CompanyIndex
+from output.json_exporter import JSONExporter
+from output.manifest_generator import DatasetManifestGenerator
+from output.period_snapshot import PeriodSnapshot, load_period_snapshot
+
+WORKERS = 4
+CODES = [f"{1000 + i}0" for i in range(40)]
+YEARS = ("2025-03-31", "2024-03-31")
+REASONS = {"ordinary_income": {"category": "accounting_standard", "reason": "IFRSに経常利益概念なし"}}
+
+
+def _financial(worker: int, code: str, fiscal_year_end: str) -> dict:
+    return financial(
+        code, fiscal_year_end, 1000.0 * (worker + 1), doc_id=f"S100{worker}{code[:4]}",
+        null_reasons=REASONS if worker % 2 else {},
+    )
+
+
+def _export(base_dir: str, worker: int) -> int:
+    """全銘柄・全決算期を worker ごとの doc_id で出力する（出力順は worker ごとに異なる）。"""
+    inputs = [(code, year) for code in CODES for year in YEARS]
+    random.Random(worker).shuffle(inputs)
+    exporter = JSONExporter(base_dir, serializer="gzip" if worker == 1 else None)
+    with exporter.session(max_workers=2) as session:
+        for i, (code, year) in enumerate(inputs):
+            session.export(_financial(worker, code, year))
+            if i % 25 == 24:
+                exporter.flush()
+    return exporter.written
+
+
+def _comparable(manifest: dict) -> dict:
+    return {k: v for k, v in manifest.items() if k != "generated_at"}
+
+
+def _digests_match(base: Path, period: str) -> bool:
+    index = DatasetManifestGenerator(str(base)).load_file_index("annual", period)
+    on_disk = sorted(p.name for p in (base / "annual" / period).iterdir())
+    if index is None or sorted(index["files"]) != on_disk:
+        return False
+    for name, entry in index["files"].items():
+        raw = (base / "annual" / period / name).read_bytes()
+        if entry["size"] != len(raw) or entry["sha256"] != hashlib.sha256(raw).hexdigest():
+            return False
+    return True
+
+
+def _snapshot_matches(base: Path, period: str) -> bool:
+    saved = load_period_snapshot("annual", period, base)
+    period_dir = base / "annual" / period
+    rebuilt = PeriodSnapshot(period_dir / "rebuilt.npz", tuple(saved["fact_keys"].tolist()))
+    rebuilt._scan(period_dir)
+    arrays = rebuilt.to_arrays()
+    return all(np.array_equal(saved[name], arrays[name], equal_nan=name == "values") for name in arrays)
+
+
+if __name__ == "__main__":
+    with temp_dataset() as tmp:
+        base = Path(tmp)
+
+        with ProcessPoolExecutor(max_workers=WORKERS) as pool:
+            written = list(pool.map(_export, [tmp] * WORKERS, range(WORKERS)))
+
+        winner = WORKERS - 1
+        outputs = [
+            json.loads((base / "annual" / f"{year[:4]}FY" / f"{code[:4]}.json").read_text(encoding="utf-8"))
+            for code in CODES for year in YEARS
+        ]
+        stray = [p.name for p in base.rglob("*") if p.is_file() and p.name.endswith(".json.gz")]
+        temp_files = [p.name for p in base.rglob("*.tmp")]
+        digests_match = all(_digests_match(base, p) for p in ("2025FY", "2024FY"))
+        snapshots_match = all(_snapshot_matches(base, p) for p in ("2025FY", "2024FY"))
+
+        generator = DatasetManifestGenerator(tmp)
+        manifest = generator.load()
+        manifest_matches = _comparable(manifest) == _comparable(generator.generate())
+
+        index_path = base / "metadata" / "company_index.json"
+        incremental_index = json.loads(index_path.read_text(encoding="utf-8"))["companies"]
+        index_path.unlink()
+        CompanyIndex(tmp).rebuild()
+        rebuilt_index = json.loads(index_path.read_text(encoding="utf-8"))["companies"]
+
+        # 同じ出力を再実行しても doc_id の古い文書は既存を上書きしない
+        with JSONExporter(tmp) as exporter:
+            exporter.export(_financial(0, CODES[0], YEARS[0]))
+        kept = exporter.kept == 1 and exporter.written == 0
+
+        # 過年度分（新しい書類の source: history）より当該期の有価証券報告書を優先する（出力順・doc_id に依らない）
+        report = financial(CODES[1], "2023-03-31", 50.0, doc_id="S1000REPORT")
+        history = financial(CODES[1], "2023-03-31", doc_id="S2000NEWER", source="history")
+        history_path = base / "annual" / "2023FY" / f"{CODES[1][:4]}.json"
+        history_results = []
+        for order in ((history, report), (report, history)):
+            for variant in history_path.parent.glob(f"{CODES[1][:4]}.json*"):
+                variant.unlink()
+            for data in order:
+                serializer = "gzip" if data is history and order[0] is report else None
+                with JSONExporter(tmp, serializer=serializer) as exporter:
+                    exporter.export(data)
+            saved = json.loads(history_path.read_text(encoding="utf-8"))
+            history_results.append(
+                saved["doc_id"] == "S1000REPORT" and "source" not in saved
+                and saved["current_year"]["metrics"]["net_sales"] == 50.0
+                and not history_path.with_suffix(".json.gz").exists()
+            )
+        with JSONExporter(tmp) as history_first:
+            history_first.export(history)
+        history_kept = history_first.kept == 1
+
+    checks = [
+        ("全プロセスが書き込み", all(n > 0 for n in written)),
+        ("doc_id の大きい文書が優先（処理順に依らない）",
+            all(o["doc_id"].startswith(f"S100{winner}") for o in outputs)),
+        ("旧形式・一時ファイルが残らない", not stray and not temp_files),
+        ("件数の二重計上なし", manifest["record_counts"]["annual"] == {"2025FY": 40, "2024FY": 40}),
+        ("manifest = 全件スキャン", manifest_matches),
+        ("NULL 分類の件数", manifest["null_reason_counts"]["annual"]["2025FY"]
+            == {"accounting_standard": {"ordinary_income": 40}}),
+        ("ファイル一覧 = ディスク上のファイル", digests_match),
+        ("スナップショット = 全件再構築", snapshots_match),
+        ("銘柄インデックス = 全件再構築", incremental_index == rebuilt_index),
+        ("古い doc_id は上書きしない", kept),
+        ("当該期の報告書は過年度分に優先（両方の出力順）", all(history_results) and history_kept),
+    ]
+
+    all_ok = True
+    for name, ok in checks:
+        status = "[OK]" if ok else "[NG]"
+        print(f"{status} {name}")
+        if not ok:
+            all_ok = False
+
+    sys.exit(0 if all_ok else 1)
@@ -24,7 +24,7 @@ if __name__ == "__main__":
     parser = XBRLParser(xbrl_path)
     data = parser.parse()
 
-    resolver = ContextResolver(parser.root)
+    resolver = ContextResolver.from_parsed(data)
     context_map = resolver.build_context_map()
 
     print("=" * 60)
@@ -0,0 +1,66 @@
+"""
+ContextResolver の context 属性事前計算（dimension / 連結区分 / 当期・前期）のテストスクリプト。
+contextRef の命名規則に依存せず、explicitMember から判定できることを確認する。
+"""
+import sys
+from pathlib import Path
+
+from lxml import etree
+
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from parser.context_resolver import ContextResolver
+
+XBRL = b"""<?xml version="1.0" encoding="UTF-8"?>
+<xbrli:xbrl xmlns:xbrli="http://www.xbrl.org/2003/instance"
+            xmlns:xbrldi="http://xbrl.org/2006/xbrldi"
+            xmlns:jppfs_cor="http://disclosure.edinet-fsa.go.jp/taxonomy/jppfs/2024-11-01/jppfs_cor"
+            xmlns:jpcrp_cor="http://disclosure.edinet-fsa.go.jp/taxonomy/jpcrp/2024-11-01/jpcrp_cor">
+  <xbrli:context id="C1">
+    <xbrli:entity><xbrli:identifier scheme="x">E00001-000</xbrli:identifier></xbrli:entity>
+    <xbrli:period><xbrli:startDate>2024-04-01</xbrli:startDate><xbrli:endDate>2025-03-31</xbrli:endDate></xbrli:period>
+  </xbrli:context>
+  <xbrli:context id="C2">
+    <xbrli:entity><xbrli:identifier scheme="x">E00001-000</xbrli:identifier>
+      <xbrli:segment><xbrldi:explicitMember dimension="jppfs_cor:ConsolidatedOrNonConsolidatedAxis">jppfs_cor:NonConsolidatedMember</xbrldi:explicitMember></xbrli:segment>
+    </xbrli:entity>
+    <xbrli:period><xbrli:startDate>2023-04-01</xbrli:startDate><xbrli:endDate>2024-03-31</xbrli:endDate></xbrli:period>
+  </xbrli:context>
+  <xbrli:context id="C3">
+    <xbrli:entity><xbrli:identifier scheme="x">E00001-000</xbrli:identifier></xbrli:entity>
+    <xbrli:period><xbrli:instant>2025-03-31</xbrli:instant></xbrli:period>
+    <xbrli:scenario><xbrldi:explicitMember dimension="jpcrp_cor:OperatingSegmentsAxis">jpcrp_cor:ReportableSegmentsMember</xbrldi:explicitMember></xbrli:scenario>
+  </xbrli:context>
+</xbrli:xbrl>
+"""
+
+if __name__ == "__main__":
+    resolver = ContextResolver(etree.fromstring(XBRL))
+    context_map = resolver.build_context_map()
+    c1, c2, c3 = context_map["C1"], context_map["C2"], context_map["C3"]
+
+    checks = [
+        ("C1: 連結・当期", c1["is_consolidated"] and c1["is_current_year"] and not c1["is_prior_year"]),
+        ("C1: dimension なし", c1["dimensions"] == {} and not c1["has_segment_dimension"]),
+        ("C2: segment の NonConsolidatedMember で単体判定", not c2["is_consolidated"]),
+        ("C2: 連結/単体区分はセグメント扱いしない", not c2["has_segment_dimension"]),
+        ("C2: 前期", c2["is_prior_year"] and not c2["is_current_year"]),
+        ("C3: scenario のメンバーでセグメント判定", c3["has_segment_dimension"] and c3["is_consolidated"]),
+        ("C3: instant 当期", c3["is_current_year"]),
+        ("date_ordinal", c1["date_ordinal"] == c3["date_ordinal"] > c2["date_ordinal"]),
+        ("旧形式 context_map は contextRef 名で判定", not ContextResolver(context_map={
+            "Prior1YearDuration_NonConsolidatedMember": {
+                "type": "duration", "start_date": "2023-04-01", "end_date": "2024-03-31",
+            },
+        }).build_context_map()["Prior1YearDuration_NonConsolidatedMember"]["is_consolidated"]),
+    ]
+
+    all_ok = True
+    for name, ok in checks:
+        status = "[OK]" if ok else "[NG]"
+        print(f"{status} {name}")
+        if not ok:
+            all_ok = False
+
+    sys.exit(0 if all_ok else 1)
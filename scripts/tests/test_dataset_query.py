@@ -0,0 +1,168 @@
+"""
+決算期スナップショットに対するスクリーニングクエリ（DatasetQuery）のテストスクリプト。
+"""
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from config_loader import get_fact_key_order
+from dataset_fixtures import financial, temp_dataset
+from output.dataset_query import DatasetQuery
+from output.dataset_reader import DatasetReader
+from output.json_exporter import JSONExporter
+from output.period_snapshot import SNAPSHOT_FILENAME, STRING_COLUMNS
+
+UNIVERSE = 4000
+
+
+def _metrics(rng: random.Random) -> dict:
+    def value(scale: float) -> float | None:
+        return None if rng.random() < 0.15 else float(round(rng.uniform(-0.2, 1.0) * scale))
+    return {"equity": value(2e10), "operating_income": value(1e9), "net_sales": value(1e10)}
+
+
+def _reference(documents: dict[str, dict], predicate) -> list[str]:
+    return sorted(code for code, d in documents.items() if predicate(d["current_year"]["metrics"], d))
+
+
+def _write_universe(base: Path, data_version: str) -> dict[str, dict[str, float | None]]:
+    """約4,000社分の決算期スナップショットを直接書き込み、security_code → metrics（NaN は None）を返す。"""
+    fact_keys = get_fact_key_order()
+    rng = np.random.default_rng(0)
+    values = np.asfortranarray(rng.normal(1e10, 1e10, (UNIVERSE, len(fact_keys))))
+    values[rng.random(values.shape) < 0.2] = np.nan
+    arrays = {"fact_keys": np.asarray(fact_keys, dtype=str), "values": values, "null_mask": np.isnan(values)}
+    for column in STRING_COLUMNS:
+        arrays[column] = np.asarray([f"{1300 + i}" if column == "security_code" else "" for i in range(UNIVERSE)])
+    period_dir = base / "annual" / data_version
+    period_dir.mkdir(parents=True)
+    with open(period_dir / SNAPSHOT_FILENAME, "wb") as f:
+        np.savez(f, **arrays)
+    return {
+        code: {key: None if np.isnan(v) else float(v) for key, v in zip(fact_keys, row)}
+        for code, row in zip(arrays["security_code"].tolist(), values)
+    }
+
+
+if __name__ == "__main__":
+    rng = random.Random(0)
+    documents = {
+        f"{1000 + i}": financial(
+            f"{1000 + i}0", metrics=_metrics(rng), accounting_standard=("JGAAP", "IFRS", "US-GAAP")[i % 3],
+        )
+        for i in range(300)
+    }
+    with temp_dataset() as tmp:
+        exporter = JSONExporter(tmp)
+        with exporter.session() as session:
+            for data in documents.values():
+                session.export(data)
+
+        query = DatasetQuery(DatasetReader(tmp))
+        screened = query.screen("equity > 1e10 and operating_income > 0")
+        filter_ok = screened.security_codes == _reference(
+            documents, lambda m, d: m["equity"] is not None and m["equity"] > 1e10
+            and m["operating_income"] is not None and m["operating_income"] > 0,
+        ) and screened.data_version == "2025FY" and screened.total == 300
+
+        # 3値論理: null との比較は不明（not でも真にならない）
+        negated = query.screen("not (equity > 1e10)").security_codes
+        explicit = query.screen("equity is None or not (equity > 1e10)").security_codes
+        null_ok = (
+            negated == _reference(documents, lambda m, d: m["equity"] is not None and not m["equity"] > 1e10)
+            and explicit == _reference(documents, lambda m, d: m["equity"] is None or not m["equity"] > 1e10)
+            and query.screen("equity is None").matched == sum(
+                d["current_year"]["metrics"]["equity"] is None for d in documents.values())
+        )
+
+        ratio = query.screen(
+            "0 < operating_income / net_sales < 0.5 and accounting_standard in ('IFRS', 'US-GAAP')",
+        ).security_codes
+        ratio_ok = ratio == _reference(
+            documents, lambda m, d: m["operating_income"] is not None and m["net_sales"] not in (None, 0.0)
+            and 0 < m["operating_income"] / m["net_sales"] < 0.5 and d["accounting_standard"] in ("IFRS", "US-GAAP"),
+        )
+
+        # 並び替え: 部分選択の上位 N 件 = 全件整列の先頭 N 件（null は末尾、同値は security_code 順）
+        full = query.screen(order_by="operating_income", columns=["operating_income", "accounting_standard"])
+        top = query.screen(order_by="operating_income", limit=10, columns=["operating_income"])
+        bottom = query.screen("equity > 0", order_by="net_sales", descending=False, limit=5)
+        expected_order = sorted(
+            documents, key=lambda c: (documents[c]["current_year"]["metrics"]["operating_income"] is None,
+                                      -(documents[c]["current_year"]["metrics"]["operating_income"] or 0), c),
+        )
+        records = top.to_records()
+        sort_ok = (
+            full.security_codes == expected_order
+            and top.security_codes == expected_order[:10]
+            and records[0]["operating_income"] == max(
+                d["current_year"]["metrics"]["operating_income"] or -np.inf for d in documents.values())
+            and full.to_records()[-1]["operating_income"] is None
+            and bottom.security_codes == sorted(
+                query.screen("equity > 0 and net_sales is not None").security_codes,
+                key=lambda c: (documents[c]["current_year"]["metrics"]["net_sales"], c),
+            )[:5]
+        )
+
+        errors = 0
+        for expression in ("equity >", "equity", "unknown_key > 0", "equity + 'x' > 0", "__import__('os')",
+                           "equity.real > 0", "equity is 0"):
+            try:
+                query.screen(expression)
+            except ValueError:
+                errors += 1
+
+        # 全銘柄規模: 結果を Python の参照実装と比較し、応答時間は表示のみ（環境依存のため判定しない）
+        universe_metrics = _write_universe(Path(tmp), "2030FY")
+        query.screen("equity > 1e10", data_version="2030FY")  # 初回のメモリマップを除いて計測する
+        screens = [
+            query.screen(
+                "equity > 1e10 and operating_income > 0 and operating_income / net_sales > 0.05",
+                data_version="2030FY", order_by="operating_income / net_sales", limit=50,
+            )
+            for _ in range(20)
+        ]
+        universe = query.screen(data_version="2030FY", order_by="equity", limit=50)
+        print(f"全銘柄（{universe.total}社）スクリーニング: 中央値 {np.median([r.elapsed_ms for r in screens]):.2f} ms")
+
+        def ratio(m: dict) -> float:
+            return m["operating_income"] / m["net_sales"]
+
+        matched = [
+            code for code, m in universe_metrics.items()
+            if None not in (m["equity"], m["operating_income"], m["net_sales"])
+            and m["equity"] > 1e10 and m["operating_income"] > 0 and m["net_sales"] != 0 and ratio(m) > 0.05
+        ]
+        universe_ok = (
+            universe.total == UNIVERSE
+            and all(r.matched == len(matched) for r in screens)
+            and screens[-1].security_codes == sorted(matched, key=lambda c: (-ratio(universe_metrics[c]), c))[:50]
+            and universe.security_codes == sorted(
+                (c for c, m in universe_metrics.items() if m["equity"] is not None),
+                key=lambda c: (-universe_metrics[c]["equity"], c),
+            )[:50]
+        )
+
+    checks = [
+        ("条件式（and）", filter_ok),
+        ("null の3値論理", null_ok),
+        ("算術・連鎖比較・in", ratio_ok),
+        ("並び替え・上位 N 件（部分選択）", sort_ok),
+        ("不正な式は ValueError", errors == 7),
+        ("全銘柄規模の絞り込み・上位 N 件 = 参照実装", universe_ok),
+    ]
+
+    all_ok = True
+    for name, ok in checks:
+        status = "[OK]" if ok else "[NG]"
+        print(f"{status} {name}")
+        if not ok:
+            all_ok = False
+
+    sys.exit(0 if all_ok else 1)
@@ -0,0 +1,140 @@
+"""
+financial-dataset の読み取り API（DatasetReader / map_snapshot）のテストスクリプト。
+"""
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from dataset_fixtures import financial, temp_dataset
+from output.dataset_reader import DatasetReader
+from output.json_exporter import JSONExporter
+from output.manifest_generator import DatasetManifestGenerator
+from output.period_snapshot import SNAPSHOT_FILENAME, load_snapshot, map_snapshot
+
+
+if __name__ == "__main__":
+    codes = [f"{1000 + i}0" for i in range(20)]
+    with temp_dataset() as tmp:
+        base = Path(tmp)
+
+        exporter = JSONExporter(tmp)
+        with exporter.session() as session:
+            for year in (2023, 2024, 2025):
+                for code in codes:
+                    session.export(financial(code, f"{year}-03-31", net_sales=float(year)))
+        with JSONExporter(tmp, serializer="gzip") as exporter:
+            exporter.export(financial("10000", "2025-03-31", net_sales=2025.0))
+
+        reader = DatasetReader(tmp)
+        document = reader.get("1000", "2025FY")  # gzip
+        missing = reader.get("9999", "2025FY")
+        history = reader.history("1001")
+        periods = reader.periods()
+        latest = reader.latest_period()
+
+        arrays = reader.load_period("2025FY")
+        saved = load_snapshot(base / "annual" / "2025FY" / SNAPSHOT_FILENAME)
+        mapped = all(isinstance(arrays[name], np.memmap) for name in ("values", "null_mask", "security_code"))
+        same_as_saved = all(
+            np.array_equal(arrays[name], saved[name], equal_nan=name == "values") for name in saved
+        )
+        read_only = not arrays["values"].flags.writeable
+        cached = reader.load_period("2025FY") is arrays
+
+        # スナップショットが無い決算期は JSON から構築する
+        (base / "annual" / "2023FY" / SNAPSHOT_FILENAME).unlink()
+        rebuilt = reader.load_period("2023FY")
+        rebuilt_ok = rebuilt is not None and rebuilt["security_code"].tolist() == [c[:4] for c in codes]
+
+        # manifest の revision が変わった決算期のみ破棄する
+        before = reader.cache_info()
+        kept_document = reader.get("1002", "2024FY")
+        with JSONExporter(tmp) as exporter:
+            exporter.export(financial("10020", "2025-03-31", net_sales=1.0))
+        updated = reader.get("1002", "2025FY")
+        invalidated = (
+            reader.invalidations == 1
+            and reader.get("1002", "2024FY") is kept_document
+            and reader.load_period("2025FY") is not arrays
+        )
+        net_sales = reader.load_period("2025FY")
+        column = list(net_sales["fact_keys"]).index("net_sales")
+        row = net_sales["security_code"].tolist().index("1002")
+
+        # manifest の再生成（--rebuild-manifest）はファイル一覧を照合し、直接修正された決算期の revision を進める
+        stale = reader.get("1003", "2024FY")
+        kept_latest = reader.get("1003", "2025FY")
+        generator = DatasetManifestGenerator(tmp)
+        revision = generator.load()["dataset_revision"]
+        path = base / "annual" / "2024FY" / "1003.json"
+        repaired = json.loads(path.read_text(encoding="utf-8"))
+        repaired["current_year"]["metrics"]["net_sales"] = 2.0
+        path.write_text(json.dumps(repaired, ensure_ascii=False), encoding="utf-8")
+        generator.save()
+        rescanned = generator.load()
+        rebuilt_manifest = (
+            stale["current_year"]["metrics"]["net_sales"] == 2024.0
+            and reader.get("1003", "2024FY")["current_year"]["metrics"]["net_sales"] == 2.0
+            and reader.get("1003", "2025FY") is kept_latest
+            and rescanned["dataset_revision"] == revision + 1
+            and rescanned["period_revisions"]["annual"]["2024FY"] == revision + 1
+            and generator.load_file_index("annual", "2024FY")["files"]["1003.json"]["revision"] == revision + 1
+            and generator.load_file_index("annual", "2024FY")["files"]["1004.json"]["revision"] < revision + 1
+        )
+        generator.save()
+        rescan_stable = generator.load()["dataset_revision"] == revision + 1
+
+        # バイト数上限で古いものから追い出す
+        small = DatasetReader(tmp, cache_bytes=3 * reader.cache_info()["bytes"] // reader.cache_info()["entries"])
+        for code in codes:
+            small.get(code[:4], "2024FY")
+        info = small.cache_info()
+        evicted = info["bytes"] <= info["max_bytes"] and info["evictions"] > 0 and info["entries"] < len(codes)
+        small.get(codes[-1][:4], "2024FY")
+        lru_hit = small.cache_info()["hits"] == 1
+
+        uncached = DatasetReader(tmp, cache_bytes=0, mmap=False)
+        uncached_arrays = uncached.load_period("2025FY")
+        not_mapped = not isinstance(uncached_arrays["values"], np.memmap) and uncached.cache_info()["entries"] == 0
+
+        # 空配列・0次元配列を含む npz もマップできる
+        npz_path = base / "arrays.npz"
+        with open(npz_path, "wb") as f:
+            np.savez(f, values=np.asfortranarray(np.arange(6.0).reshape(3, 2)), empty=np.empty((0, 2)), scalar=np.array(1.0))
+        mapped_npz = map_snapshot(npz_path)
+        npz_ok = (
+            mapped_npz["values"].flags.f_contiguous
+            and all(np.array_equal(mapped_npz[k], v) for k, v in load_snapshot(npz_path).items())
+        )
+
+    checks = [
+        ("銘柄・決算期の読み込み（gzip 判別）", document["current_year"]["metrics"]["net_sales"] == 2025.0
+            and missing is None),
+        ("過年度履歴（新しい順）", [d["data_version"] for d in history] == ["2025FY", "2024FY", "2023FY"]),
+        ("manifest の決算期一覧", periods == ["2025FY", "2024FY", "2023FY"] and latest == "2025FY"),
+        ("スナップショットをメモリマップ", mapped and same_as_saved and read_only),
+        ("決算期配列のキャッシュ", cached and before["hits"] >= 1),
+        ("スナップショットが無い決算期は JSON から構築", rebuilt_ok),
+        ("revision が変わった決算期のみ破棄", invalidated
+            and updated["current_year"]["metrics"]["net_sales"] == 1.0
+            and net_sales["values"][row, column] == 1.0),
+        ("manifest 再生成で直接修正した決算期の revision を進める", rebuilt_manifest and rescan_stable),
+        ("バイト数上限の LRU", evicted and lru_hit),
+        ("キャッシュなし・メモリに読み込み", not_mapped),
+        ("空配列・0次元配列のマップ", npz_ok),
+    ]
+
+    all_ok = True
+    for name, ok in checks:
+        status = "[OK]" if ok else "[NG]"
+        print(f"{status} {name}")
+        if not ok:
+            all_ok = False
+
+    sys.exit(0 if all_ok else 1)
@@ -0,0 +1,84 @@
+"""
+JSONExporter のバッチ出力セッション（ExportSession）のテストスクリプト。
+"""
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from dataset_fixtures import financial, temp_dataset
+from output.json_exporter import JSONExporter
+from output.manifest_generator import DatasetManifestGenerator
+
+
+def _read_tree(base: Path) -> dict[str, dict]:
+    """
+    出力ツリーを 相対パス → 内容（generated_at を除く）で返す。
+
+    ファイル一覧の size / sha256 / changed_at は generated_at・書き込み時刻に依存するため除く。
+    """
+    tree = {}
+    for path in sorted(base.rglob("*.json")):
+        content = {k: v for k, v in json.loads(path.read_text(encoding="utf-8")).items() if k != "generated_at"}
+        if "files" in content:
+            content["files"] = {
+                name: {k: v for k, v in entry.items() if k not in ("size", "sha256", "changed_at")}
+                for name, entry in content["files"].items()
+            }
+        tree[str(path.relative_to(base))] = content
+    return tree
+
+
+if __name__ == "__main__":
+    reasons = {"ordinary_income": {"category": "accounting_standard", "reason": "IFRSに経常利益概念なし"}}
+    inputs = [
+        (financial(f"{1000 + i}0", f"{2020 + i % 4}-03-31", null_reasons=reasons if i % 3 == 0 else None), True)
+        for i in range(40)
+    ]
+    inputs.append((financial("10050", "2021-03-31", net_sales=2.0), True))   # 同一出力先の上書き
+    inputs.append((financial("10050", "2021-03-31", net_sales=3.0), False))  # 書き込み待ちを既存として扱う
+
+    with temp_dataset() as sync_dir, tempfile.TemporaryDirectory() as batch_dir:
+        exporter = JSONExporter(sync_dir, defer_manifest=True)
+        sync_paths = [exporter.export(data, overwrite=overwrite) for data, overwrite in inputs]
+        exporter.flush()
+
+        exporter = JSONExporter(batch_dir, defer_manifest=True)
+        generator = DatasetManifestGenerator(batch_dir)
+        with exporter.session(max_workers=3, max_pending=4) as session:
+            batch_paths = [session.export(data, overwrite=overwrite) for data, overwrite in inputs]
+            manifest_deferred = generator.load()["record_counts"]["annual"] == {}
+        manifest_saved = generator.load()["record_counts"]["annual"] != {}
+
+        sync_tree = _read_tree(Path(sync_dir))
+        batch_tree = _read_tree(Path(batch_dir))
+        sales = batch_tree["annual/2021FY/1005.json"]["current_year"]["metrics"]["net_sales"]
+
+        invalid_raised = False
+        with exporter.session() as session:
+            try:
+                session.export({**financial("10060", "2025-03-31"), "report_type": "other"})
+            except ValueError:
+                invalid_raised = True
+
+    checks = [
+        ("返却パス（スキップは None）", [p and Path(p).name for p in sync_paths]
+            == [p and Path(p).name for p in batch_paths] and batch_paths[-1] is None),
+        ("出力内容 = 同期出力（manifest・サイドカー含む）", sync_tree == batch_tree and len(batch_tree) > 40),
+        ("同一出力先は呼び出し順に書き込む", sales == 2.0),
+        ("manifest はセッション終了時に保存", manifest_deferred and manifest_saved),
+        ("検証エラーは呼び出し元で送出", invalid_raised),
+    ]
+
+    all_ok = True
+    for name, ok in checks:
+        status = "[OK]" if ok else "[NG]"
+        print(f"{status} {name}")
+        if not ok:
+            all_ok = False
+
+    sys.exit(0 if all_ok else 1)
@@ -0,0 +1,50 @@
+"""
+FactTable（列指向 fact 表現）のテストスクリプト。
+"""
+import pickle
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from parser.fact_table import FactTable, ensure_fact_table
+
+if __name__ == "__main__":
+    facts = [
+        {"tag": "jppfs_cor:NetSales", "contextRef": "CurrentYearDuration", "unitRef": "JPY",
+         "decimals": "-6", "value": "1000000000", "is_nil": False},
+        {"tag": "jppfs_cor:NetSales", "contextRef": "Prior1YearDuration", "unitRef": "JPY",
+         "decimals": "-6", "value": "900000000", "is_nil": False},
+        {"tag": "jpcrp_cor:OperatingIncome", "contextRef": "CurrentYearDuration", "unitRef": "JPY",
+         "decimals": "-6", "value": "", "is_nil": True},
+    ]
+    table = FactTable.from_dicts(facts)
+
+    checks = [
+        ("行数", len(table) == 3),
+        ("文字列プールで tag を共有", len(table.tags.strings) == 2),
+        ("dict 互換アクセス", table[0]["value"] == "1000000000" and table[1].get("contextRef") == "Prior1YearDuration"),
+        ("in 演算子・キーの反復", "tag" in table[0] and "missing" not in table[0]
+            and list(table[0]) == list(facts[0]) and dict(table[0]) == facts[0]),
+        ("is_nil ビットマップ", table[2]["is_nil"] is True and table[0]["is_nil"] is False),
+        ("ローカル名索引（文書順）", table.rows_with_local_name("NetSales") == [0, 1]),
+        ("ローカル名索引（完全一致のみ）", table.rows_with_local_name("Sales") == []),
+        ("context 別バケット索引", table.bucket_rows(
+            lambda ref: ref if ref.startswith("Current") else None,
+            lambda local: local != "OperatingIncome",
+        ) == {"NetSales": {"CurrentYearDuration": [0]}}),
+        ("list[dict] への往復", table.to_dicts() == facts and table == facts),
+        ("pickle 往復", pickle.loads(pickle.dumps(table)) == table),
+        ("ensure_fact_table は FactTable をそのまま返す", ensure_fact_table(table) is table),
+        ("ensure_fact_table は list[dict] を変換", ensure_fact_table(facts) == table),
+    ]
+
+    all_ok = True
+    for name, ok in checks:
+        status = "[OK]" if ok else "[NG]"
+        print(f"{status} {name}")
+        if not ok:
+            all_ok = False
+
+    sys.exit(0 if all_ok else 1)
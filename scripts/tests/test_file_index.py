@@ -0,0 +1,107 @@
+"""
+差分同期用のファイル一覧（metadata/files/ / dataset_revision / changed_files()）のテストスクリプト。
+"""
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from dataset_fixtures import financial, temp_dataset
+from output.json_exporter import JSONExporter
+from output.manifest_generator import DatasetManifestGenerator, changed_files
+
+EXPORT_COUNT = 1200
+
+
+def _manifest(base: Path) -> dict:
+    return json.loads((base / "metadata" / "dataset_manifest.json").read_text(encoding="utf-8"))
+
+
+def _file_index(base: Path, period: str) -> dict:
+    return json.loads((base / "metadata" / "files" / "annual" / f"{period}.json").read_text(encoding="utf-8"))
+
+
+def _digest_matches(base: Path, period: str, name: str) -> bool:
+    entry = _file_index(base, period)["files"][name]
+    raw = (base / "annual" / period / name).read_bytes()
+    return entry["size"] == len(raw) and entry["sha256"] == hashlib.sha256(raw).hexdigest()
+
+
+if __name__ == "__main__":
+    with temp_dataset() as tmp:
+        base = Path(tmp)
+
+        exporter = JSONExporter(tmp)
+        with exporter.session() as session:
+            session.export(financial("72030", "2025-03-31"))
+            session.export(financial("67580", "2025-03-31"))
+            session.export(financial("72030", "2024-03-31"))
+        first = _manifest(base)
+        index_2025 = _file_index(base, "2025FY")
+        first_digest = _digest_matches(base, "2025FY", "7203.json") and _digest_matches(base, "2025FY", "snapshot.npz")
+        all_changed = changed_files(0, tmp)
+
+        # 内容が同一の再実行は revision を進めない
+        with JSONExporter(tmp) as exporter:
+            exporter.export(financial("72030", "2025-03-31"))
+        unchanged_revision = _manifest(base)["dataset_revision"]
+
+        # 1銘柄のみ変更 → 変更ファイル（とスナップショット）のみが差分
+        with JSONExporter(tmp) as exporter:
+            exporter.export(financial("67580", "2025-03-31", net_sales=2000.0))
+        second = _manifest(base)
+        delta = [e["path"] for e in changed_files(first["dataset_revision"], tmp)]
+        second_digest = _digest_matches(base, "2025FY", "6758.json")
+
+        # 出力形式の変更で旧ファイルは一覧から外れる
+        with JSONExporter(tmp, serializer="gzip") as exporter:
+            exporter.export(financial("72030", "2024-03-31", net_sales=3000.0))
+        files_2024 = sorted(_file_index(base, "2024FY")["files"])
+
+        # 全件スキャン（修復用）でも revision は引き継がれる
+        regenerated = DatasetManifestGenerator(tmp).generate()
+
+    # export ごとにはメタデータを保存せず、close() で1回だけ保存する
+    with temp_dataset() as tmp:
+        base = Path(tmp)
+        with JSONExporter(tmp) as exporter:
+            flushes = []
+            flush_snapshots = exporter._flush_snapshots
+            exporter._flush_snapshots = lambda: flushes.append(1) or flush_snapshots()
+            for i in range(EXPORT_COUNT):
+                exporter.export(financial(f"{1000 + i}0", "2025-03-31", net_sales=float(i)))
+            pending = not (base / "metadata" / "files").exists() and _manifest(base)["dataset_revision"] == 0
+        coalesced = pending and len(flushes) == 1 and _manifest(base)["dataset_revision"] == 1
+        listed = len(_file_index(base, "2025FY")["files"]) == EXPORT_COUNT + 1
+
+    checks = [
+        ("初回出力で dataset_revision=1", first["dataset_revision"] == 1),
+        ("period_revisions", first["period_revisions"]["annual"] == {"2025FY": 1, "2024FY": 1}),
+        ("ファイル一覧に銘柄別ファイルとスナップショット",
+            sorted(index_2025["files"]) == ["6758.json", "7203.json", "snapshot.npz"]),
+        ("size / sha256 は書き込んだバイト列", first_digest),
+        ("changed_at は UTC", index_2025["files"]["7203.json"]["changed_at"].endswith("Z")),
+        ("revision 0 以降は全ファイル", len(all_changed) == 5),
+        ("同一内容の再実行で revision 不変", unchanged_revision == 1),
+        ("変更時に revision を1つ進める", second["dataset_revision"] == 2
+            and second["period_revisions"]["annual"] == {"2025FY": 2, "2024FY": 1}),
+        ("差分は変更ファイルのみ", delta == ["annual/2025FY/6758.json", "annual/2025FY/snapshot.npz"]),
+        ("変更後の size / sha256", second_digest),
+        ("旧形式のファイルを一覧から除く", files_2024 == ["7203.json.gz", "snapshot.npz"]),
+        ("全件スキャンで revision を引き継ぐ", regenerated["dataset_revision"] == 3
+            and regenerated["period_revisions"]["annual"]["2024FY"] == 3),
+        ("メタデータは close() で1回だけ保存", coalesced and listed),
+    ]
+
+    all_ok = True
+    for name, ok in checks:
+        status = "[OK]" if ok else "[NG]"
+        print(f"{status} {name}")
+        if not ok:
+            all_ok = False
+
+    sys.exit(0 if all_ok else 1)
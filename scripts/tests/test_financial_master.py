@@ -30,7 +30,7 @@ if __name__ == "__main__":
 
     parser = XBRLParser(xbrl_path)
     parsed_data = parser.parse()
-    resolver = ContextResolver(parser.root)
+    resolver = ContextResolver.from_parsed(parsed_data)
     context_map = resolver.build_context_map()
     normalizer = FactNormalizer(parsed_data, context_map)
     normalized_data = normalizer.normalize()
@@ -0,0 +1,71 @@
+"""
+dataset_manifest.json の差分更新（IncrementalManifest / JSONExporter(defer_manifest=True)）のテストスクリプト。
+"""
+import json
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from dataset_fixtures import financial, temp_dataset
+from output.json_exporter import JSONExporter
+from output.manifest_generator import DatasetManifestGenerator
+
+METRICS = {"net_sales": 1000.0, "ordinary_income": None, "bonds_payable": None}
+
+
+def _comparable(manifest: dict) -> dict:
+    return {k: v for k, v in manifest.items() if k != "generated_at"}
+
+
+if __name__ == "__main__":
+    reasons = {
+        "ordinary_income": {"category": "accounting_standard", "reason": "IFRSに経常利益概念なし"},
+        "bonds_payable": {"category": "economic", "reason": "raw XBRLに該当タグなし"},
+    }
+    changed = {**reasons, "bonds_payable": {"category": "extraction_failure", "reason": "x"}}
+
+    with temp_dataset() as tmp:
+        generator = DatasetManifestGenerator(tmp)
+
+        exporter = JSONExporter(tmp, defer_manifest=True)
+        exporter.export(financial("10010", "2025-03-31", metrics=METRICS, null_reasons=reasons))
+        exporter.export(financial("10020", "2025-03-31", metrics=METRICS, null_reasons=reasons))
+        exporter.export(financial("10010", "2024-03-31", metrics=METRICS))
+        exporter.export(financial("10020", "2025-03-31", metrics=METRICS, null_reasons=changed))  # 上書き（件数は増えない）
+        deferred = generator.load()["record_counts"]["annual"] == {}
+        exporter.flush_manifest()
+        first = json.loads(generator.manifest_path.read_text(encoding="utf-8"))
+        first_matches = _comparable(first) == _comparable(generator.generate())
+
+        # 保存済み manifest を読み込んで差分更新する（全件スキャンしない）
+        exporter = JSONExporter(tmp)
+        exporter.export(financial("10030", "2023-03-31", metrics=METRICS, null_reasons=reasons))
+        exporter.export(financial("10010", "2025-03-31", metrics=METRICS))  # サイドカー削除
+        exporter.close()
+        second = json.loads(generator.manifest_path.read_text(encoding="utf-8"))
+        second_matches = _comparable(second) == _comparable(generator.generate())
+        no_change = exporter.flush_manifest() is None
+
+    checks = [
+        ("flush まで manifest を更新しない", deferred),
+        ("決算期と件数", first["annual_periods"] == ["2025FY", "2024FY"]
+            and first["record_counts"]["annual"] == {"2025FY": 2, "2024FY": 1}),
+        ("NULL 分類の差し替え", first["null_reason_counts"]["annual"]["2025FY"]["extraction_failure"]
+            == {"bonds_payable": 1}),
+        ("差分更新 = 全件スキャン", first_matches),
+        ("保存済み manifest からの差分更新 = 全件スキャン", second_matches),
+        ("latest_annual", second["latest_annual"] == "2025FY" and "2023FY" in second["annual_periods"]),
+        ("変更が無ければ保存しない", no_change),
+    ]
+
+    all_ok = True
+    for name, ok in checks:
+        status = "[OK]" if ok else "[NG]"
+        print(f"{status} {name}")
+        if not ok:
+            all_ok = False
+
+    sys.exit(0 if all_ok else 1)
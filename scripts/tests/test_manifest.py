@@ -2,24 +2,15 @@
 DatasetManifestGenerator 動作確認用スクリプト。
 """
 import json
-import os
+import shutil
 import sys
 from pathlib import Path
-from dotenv import load_dotenv
 
 project_root = Path(__file__).resolve().parent.parent.parent
 sys.path.insert(0, str(project_root))
 sys.path.insert(0, str(project_root / "src"))
 
-# .env ファイルを読み込む（DATASET_PATH用）
-env_path = project_root / ".env"
-if env_path.exists():
-    load_dotenv(env_path)
-else:
-    # .env が存在しない場合はデフォルト値を設定
-    if "DATASET_PATH" not in os.environ:
-        os.environ["DATASET_PATH"] = "./financial-dataset"
-
+from dataset_fixtures import temp_dataset
 from output.manifest_generator import DatasetManifestGenerator
 
 if __name__ == "__main__":
@@ -27,22 +18,25 @@ if __name__ == "__main__":
     print("DatasetManifestGenerator テスト（型安全・拡張可能設計）")
     print("=" * 60)
 
-    generator = DatasetManifestGenerator("financial-dataset")
-    manifest_path = generator.save()
-
-    print(f"\n保存パス: {manifest_path}")
-
-    # ファイル存在確認
-    path_obj = Path(manifest_path)
-    if path_obj.exists():
-        print("[OK] ファイルが存在します")
-    else:
-        print("[NG] ファイルが存在しません")
-        sys.exit(1)
-
-    # JSON 読み込み確認
-    with open(path_obj, "r", encoding="utf-8") as f:
-        manifest = json.load(f)
+    # リポジトリのサンプル出力の複製から生成する（financial-dataset/ には書き込まない）
+    with temp_dataset() as tmp:
+        shutil.copytree(project_root / "financial-dataset" / "annual", Path(tmp) / "annual")
+        generator = DatasetManifestGenerator(tmp)
+        manifest_path = generator.save()
+
+        print(f"\n保存パス: {manifest_path}")
+
+        # ファイル存在確認
+        path_obj = Path(manifest_path)
+        if path_obj.exists():
+            print("[OK] ファイルが存在します")
+        else:
+            print("[NG] ファイルが存在しません")
+            sys.exit(1)
+
+        # JSON 読み込み確認
+        with open(path_obj, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
 
     print("\n--- Manifest 構造確認 ---")
     print(f"schema_version: {manifest.get('schema_version')}")
@@ -0,0 +1,83 @@
+"""
+マッピングの注入（MappingPlan / FactKeyRules）と候補比較（evaluate_mappings）のテストスクリプト。
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+import yaml
+
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+sys.path.insert(0, str(project_root / "scripts" / "analysis"))
+
+from parser.context_resolver import ContextResolver
+from normalizer.fact_normalizer import FactNormalizer, MappingPlan
+from financial.financial_master import FactKeyRules, FinancialMaster
+from evaluate_mappings import MappingVariant, evaluate_documents
+
+CONTEXT_MAP = {
+    "CurrentYearDuration": {"type": "duration", "start_date": "2024-04-01", "end_date": "2025-03-31"},
+    "CurrentYearInstant": {"type": "instant", "date": "2025-03-31"},
+    "FilingDateInstant": {"type": "instant", "date": "2025-06-25"},
+}
+
+
+def _fact(tag: str, context_ref: str, value: str) -> dict:
+    return {"tag": tag, "contextRef": context_ref, "unitRef": "JPY", "decimals": "-6",
+            "value": value, "is_nil": False}
+
+
+if __name__ == "__main__":
+    parsed = {"doc_id": "S0000001", "facts": [
+        _fact("jpdei_cor:SecurityCodeDEI", "FilingDateInstant", "10010"),
+        _fact("jpcrp_cor:NetSalesSummaryOfBusinessResults", "CurrentYearDuration", "1000"),
+        _fact("jppfs_cor:NetSales", "CurrentYearDuration", "990"),
+        _fact("jppfs_cor:NetAssets", "CurrentYearInstant", "3000"),
+        _fact("jppfs_cor:ShareholdersEquity", "CurrentYearInstant", "2500"),
+    ]}
+    context_map = ContextResolver(context_map=CONTEXT_MAP).build_context_map()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # 候補: 経営指標等の売上高タグを除外 / equity は net_assets を最優先
+        mapping = yaml.safe_load((project_root / "config" / "taxonomy_mapping.yaml").read_text(encoding="utf-8"))
+        mapping["pl"] = [e for e in mapping["pl"] if e["tag"] != "NetSalesSummaryOfBusinessResults"]
+        mapping_path = Path(tmp) / "candidate.yaml"
+        mapping_path.write_text(yaml.safe_dump(mapping, allow_unicode=True), encoding="utf-8")
+
+        keys = yaml.safe_load((project_root / "config" / "canonical_keys.yaml").read_text(encoding="utf-8"))
+        keys["fact_keys"]["equity"]["resolution"] = ["net_assets", "shareholders_equity"]
+        keys_path = Path(tmp) / "candidate_keys.yaml"
+        keys_path.write_text(yaml.safe_dump(keys, allow_unicode=True), encoding="utf-8")
+
+        plan = MappingPlan.load(mapping_path)
+        rules = FactKeyRules(keys_path)
+        default = FactNormalizer(parsed, context_map).normalize()
+        injected = FactNormalizer(parsed, context_map, plan=plan).normalize()
+        default_master = FinancialMaster(default).compute()["current_year"]["metrics"]
+        injected_master = FinancialMaster(default, rules=rules).compute()["current_year"]["metrics"]
+
+        variants = [MappingVariant("current"), MappingVariant.from_spec(f"{mapping_path},{keys_path}")]
+        report = evaluate_documents([(parsed, context_map)], variants)
+
+    checks = [
+        ("既定マッピング", default["current_year"]["pl"]["net_sales"] == 1000),
+        ("注入した MappingPlan", injected["current_year"]["pl"]["net_sales"] == 990),
+        ("既定の resolution", default_master["equity"] == 2500.0),
+        ("注入した FactKeyRules", injected_master["equity"] == 3000.0),
+        ("候補名はファイル名", variants[1].name == "candidate"),
+        ("文書数", report["documents"] == 1),
+        ("値の差分を検出", report["diffs"]["candidate"] == {"equity": 1, "net_sales": 1}),
+        ("差分例", report["examples"]["candidate"]["net_sales"][0]["baseline"] == 1000.0
+            and report["examples"]["candidate"]["net_sales"][0]["value"] == 990.0),
+        ("NULL 件数", report["null_counts"]["current"].get("net_sales", 0) == 0),
+    ]
+
+    all_ok = True
+    for name, ok in checks:
+        status = "[OK]" if ok else "[NG]"
+        print(f"{status} {name}")
+        if not ok:
+            all_ok = False
+
+    sys.exit(0 if all_ok else 1)
@@ -0,0 +1,71 @@
+"""
+FactNormalizer.normalize_periods()（主要な経営指標等の推移からの過年度抽出）のテストスクリプト。
+"""
+import json
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from parser.context_resolver import ContextResolver, resolve_period_ends
+from normalizer.fact_normalizer import FactNormalizer
+
+CONTEXT_MAP = {"FilingDateInstant": {"type": "instant", "date": "2025-06-25"}}
+for k, year in enumerate(range(2025, 2020, -1)):
+    name = "CurrentYear" if k == 0 else f"Prior{k}Year"
+    CONTEXT_MAP[f"{name}Duration"] = {
+        "type": "duration", "start_date": f"{year - 1}-04-01", "end_date": f"{year}-03-31",
+    }
+    CONTEXT_MAP[f"{name}Instant"] = {"type": "instant", "date": f"{year}-03-31"}
+
+
+def _fact(tag: str, context_ref: str, value: str) -> dict:
+    return {"tag": tag, "contextRef": context_ref, "unitRef": "JPY", "decimals": "-6",
+            "value": value, "is_nil": False}
+
+
+if __name__ == "__main__":
+    facts = [
+        _fact("jpdei_cor:SecurityCodeDEI", "FilingDateInstant", "10010"),
+        _fact("jpdei_cor:CurrentFiscalYearEndDateDEI", "FilingDateInstant", "2025-03-31"),
+        _fact("jppfs_cor:NetSales", "CurrentYearDuration", "1000"),
+        _fact("jppfs_cor:NetSales", "Prior1YearDuration", "900"),
+    ]
+    for k, sales in enumerate(["1000", "900", "800", "700", "600"]):
+        name = "CurrentYear" if k == 0 else f"Prior{k}Year"
+        facts.append(_fact("jpcrp_cor:NetSalesSummaryOfBusinessResults", f"{name}Duration", sales))
+        facts.append(_fact("jpcrp_cor:TotalAssetsSummaryOfBusinessResults", f"{name}Instant", str(5000 + k)))
+    parsed = {"doc_id": "S0000001", "facts": facts}
+    context_map = ContextResolver(context_map=CONTEXT_MAP).build_context_map()
+
+    normalizer = FactNormalizer(parsed, context_map)
+    results = normalizer.normalize_periods()
+
+    checks = [
+        ("resolve_period_ends", resolve_period_ends(CONTEXT_MAP, 6) == [
+            "2025-03-31", "2024-03-31", "2023-03-31", "2022-03-31", "2021-03-31", None,
+        ]),
+        ("5期分を新しい順に出力", [r["fiscal_year_end"] for r in results] == [
+            "2025-03-31", "2024-03-31", "2023-03-31", "2022-03-31", "2021-03-31",
+        ]),
+        ("先頭は normalize() と同一", json.dumps(results[0]) == json.dumps(normalizer.normalize())),
+        ("過年度分のみ source: history", "source" not in results[0]
+            and all(r["source"] == "history" for r in results[1:])),
+        ("過年度の current / prior", results[2]["current_year"]["pl"]["net_sales"] == 800
+            and results[2]["prior_year"]["pl"]["net_sales"] == 700),
+        ("過年度の BS", results[4]["current_year"]["bs"]["total_assets"] == 5004),
+        ("過年度の period", results[3]["current_year"]["period"] == {"start": "2021-04-01", "end": "2022-03-31"}),
+        ("最古期の前期は空", "period" not in results[4]["prior_year"]
+            and results[4]["prior_year"]["pl"]["net_sales"] is None),
+        ("max_years で期数を制限", len(normalizer.normalize_periods(max_years=2)) == 2),
+    ]
+
+    all_ok = True
+    for name, ok in checks:
+        status = "[OK]" if ok else "[NG]"
+        print(f"{status} {name}")
+        if not ok:
+            all_ok = False
+
+    sys.exit(0 if all_ok else 1)
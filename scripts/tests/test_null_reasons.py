@@ -0,0 +1,96 @@
+"""
+インライン NULL 分類（FactNormalizer / FinancialMaster の null_reasons）と
+サイドカー・manifest 集計のテストスクリプト。
+"""
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from parser.context_resolver import ContextResolver
+from normalizer.fact_normalizer import FactNormalizer
+from financial.financial_master import FinancialMaster
+from output.json_exporter import JSONExporter
+from output.manifest_generator import DatasetManifestGenerator
+
+NON_CONSOLIDATED = {"jppfs_cor:ConsolidatedOrNonConsolidatedAxis": "jppfs_cor:NonConsolidatedMember"}
+CONTEXT_MAP = {
+    "CurrentYearDuration": {"type": "duration", "start_date": "2024-04-01", "end_date": "2025-03-31",
+                            "dimensions": {}},
+    "CurrentYearInstant": {"type": "instant", "date": "2025-03-31", "dimensions": {}},
+    "CurrentYearInstant_NonConsolidatedMember": {"type": "instant", "date": "2025-03-31",
+                                                 "dimensions": NON_CONSOLIDATED},
+    "Prior1YearDuration": {"type": "duration", "start_date": "2023-04-01", "end_date": "2024-03-31",
+                           "dimensions": {}},
+    "FilingDateInstant": {"type": "instant", "date": "2025-06-25", "dimensions": {}},
+}
+
+
+def _fact(tag: str, context_ref: str, value: str, is_nil: bool = False) -> dict:
+    return {"tag": tag, "contextRef": context_ref, "unitRef": "JPY", "decimals": "-6",
+            "value": value, "is_nil": is_nil}
+
+
+if __name__ == "__main__":
+    parsed = {"doc_id": "S0000001", "facts": [
+        _fact("jpdei_cor:SecurityCodeDEI", "FilingDateInstant", "10010"),
+        _fact("jpdei_cor:AccountingStandardsDEI", "FilingDateInstant", "IFRS"),
+        _fact("jpdei_cor:WhetherConsolidatedFinancialStatementsArePreparedDEI", "FilingDateInstant", "true"),
+        _fact("jpdei_cor:CurrentFiscalYearEndDateDEI", "FilingDateInstant", "2025-03-31"),
+        _fact("jppfs_cor:NetSales", "CurrentYearDuration", "1000"),
+        _fact("jppfs_cor:TotalAssets", "CurrentYearInstant", "5000"),
+        _fact("jppfs_cor:DepreciationOfPropertyForRent", "CurrentYearDuration", "30"),
+        _fact("jpcrp_cor:DividendPaidPerShareSummaryOfBusinessResults", "CurrentYearDuration", "", True),
+        _fact("jppfs_cor:ShortTermLoansPayable", "CurrentYearInstant_NonConsolidatedMember", "200"),
+        _fact("jppfs_cor:OperatingIncome", "Prior1YearDuration", "90"),
+    ]}
+    context_map = ContextResolver(context_map=CONTEXT_MAP).build_context_map()
+
+    plain = FinancialMaster(FactNormalizer(parsed, context_map).normalize()).compute()
+    normalized = FactNormalizer(parsed, context_map, null_reasons=True).normalize()
+    result = FinancialMaster(normalized, null_reasons=True).compute()
+    reasons = result["null_reasons"]["current_year"]
+    metrics = result["current_year"]["metrics"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATASET_PATH"] = tmp  # export 時の manifest 再生成先
+        with JSONExporter(tmp) as exporter:
+            exporter.export(result)
+        sidecar_path = Path(tmp) / "metadata" / "null_reasons" / "annual" / "2025FY" / "1001.json"
+        sidecar = json.loads(sidecar_path.read_text(encoding="utf-8"))
+        manifest = DatasetManifestGenerator(tmp).generate()
+        with JSONExporter(tmp) as exporter:
+            exporter.export(plain)
+        stale_removed = not sidecar_path.exists()
+
+    counts = manifest["null_reason_counts"]["annual"]["2025FY"]
+
+    checks = [
+        ("無効時は null_reasons を出力しない", "null_reasons" not in plain),
+        ("有効時も値は同一", result["current_year"] == plain["current_year"]),
+        ("NULL の fact_key のみ分類", set(reasons) == {k for k, v in metrics.items() if v is None}),
+        ("会計基準差", reasons["ordinary_income"]["category"] == "accounting_standard"),
+        ("取得失敗", reasons["depreciation"]["category"] == "extraction_failure"),
+        ("空値", reasons["dividends_per_share"]["category"] == "nil"),
+        ("単体のみは経済実態", reasons["short_term_borrowings"]["reason"] == "連結BSに該当タグなし (個別BSのみ存在)"),
+        ("日付認識（前期のみのタグ）", reasons["operating_income"]["category"] == "economic"),
+        ("前期も分類", "operating_income" not in result["null_reasons"]["prior_year"]),
+        ("サイドカー", sidecar["current_year"] == reasons and sidecar["data_version"] == "2025FY"),
+        ("manifest 集計", counts["nil"] == {"dividends_per_share": 1}
+            and counts["extraction_failure"] == {"depreciation": 1}),
+        ("分類なしで上書きするとサイドカーを削除", stale_removed),
+    ]
+
+    all_ok = True
+    for name, ok in checks:
+        status = "[OK]" if ok else "[NG]"
+        print(f"{status} {name}")
+        if not ok:
+            all_ok = False
+
+    sys.exit(0 if all_ok else 1)
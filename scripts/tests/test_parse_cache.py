@@ -0,0 +1,65 @@
+"""
+パース結果キャッシュ（ParseCache）のテストスクリプト。
+タグフィルタが異なってもキャッシュを共有し、フィルタ付きパースと同じ結果を返すことを確認する。
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from parser.parse_cache import ParseCache
+from parser.xbrl_parser import TagFilter, XBRLParser
+
+XBRL = b"""<?xml version="1.0" encoding="UTF-8"?>
+<xbrli:xbrl xmlns:xbrli="http://www.xbrl.org/2003/instance"
+            xmlns:jppfs_cor="http://disclosure.edinet-fsa.go.jp/taxonomy/jppfs/2024-11-01/jppfs_cor"
+            xmlns:jpdei_cor="http://disclosure.edinet-fsa.go.jp/taxonomy/jpdei/2013-08-31/jpdei_cor">
+  <xbrli:context id="CurrentYearDuration">
+    <xbrli:entity><xbrli:identifier scheme="x">E00001-000</xbrli:identifier></xbrli:entity>
+    <xbrli:period><xbrli:startDate>2024-04-01</xbrli:startDate><xbrli:endDate>2025-03-31</xbrli:endDate></xbrli:period>
+  </xbrli:context>
+  <xbrli:unit id="JPY"><xbrli:measure>iso4217:JPY</xbrli:measure></xbrli:unit>
+  <jpdei_cor:SecurityCodeDEI contextRef="CurrentYearDuration">72030</jpdei_cor:SecurityCodeDEI>
+  <jppfs_cor:NetSales contextRef="CurrentYearDuration" unitRef="JPY" decimals="-6">1000000000</jppfs_cor:NetSales>
+  <jppfs_cor:OperatingIncome contextRef="CurrentYearDuration" unitRef="JPY" decimals="-6">100000000</jppfs_cor:OperatingIncome>
+  <jppfs_cor:OrdinaryIncome contextRef="CurrentYearDuration" unitRef="JPY" decimals="-6">90000000</jppfs_cor:OrdinaryIncome>
+</xbrli:xbrl>
+"""
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        xbrl_path = Path(tmp) / "S100TEST" / "instance.xbrl"
+        xbrl_path.parent.mkdir()
+        xbrl_path.write_bytes(XBRL)
+        cache = ParseCache(Path(tmp) / "cache")
+
+        sales_filter = TagFilter({"NetSales", "SecurityCodeDEI"})
+        income_filter = TagFilter({"OperatingIncome"}, keywords=("Ordinary",))
+        by_sales = cache.parse(xbrl_path, tag_filter=sales_filter)
+        by_income = cache.parse(xbrl_path, tag_filter=income_filter)
+        unfiltered = cache.parse(xbrl_path)
+        cache_files = list((Path(tmp) / "cache").glob("*.pkl"))
+
+        direct = XBRLParser(xbrl_path, streaming=True, tag_filter=income_filter).parse()
+
+    checks = [
+        ("フィルタが異なってもキャッシュを共有", cache.misses == 1 and cache.hits == 2 and len(cache_files) == 1),
+        ("読み込み後にフィルタを適用", [f["tag"] for f in by_sales["facts"]]
+            == ["jpdei_cor:SecurityCodeDEI", "jppfs_cor:NetSales"]),
+        ("フィルタ付きパースと同じ facts・除外件数", by_income["facts"] == direct["facts"]
+            and by_income["discarded_fact_count"] == direct["discarded_fact_count"] == 2),
+        ("フィルタなしは全件", len(unfiltered["facts"]) == 4 and unfiltered["discarded_fact_count"] == 0),
+        ("doc_id はパスから設定", by_sales["doc_id"] == "S100TEST"),
+    ]
+
+    all_ok = True
+    for name, ok in checks:
+        status = "[OK]" if ok else "[NG]"
+        print(f"{status} {name}")
+        if not ok:
+            all_ok = False
+
+    sys.exit(0 if all_ok else 1)
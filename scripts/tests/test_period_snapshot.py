@@ -0,0 +1,103 @@
+"""
+決算期ごとの列指向スナップショット（snapshot.npz）のテストスクリプト。
+"""
+import json
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from config_loader import get_fact_key_order
+from dataset_fixtures import financial, temp_dataset
+from output.json_exporter import JSONExporter
+from output.manifest_generator import DatasetManifestGenerator
+from output.period_snapshot import SNAPSHOT_FILENAME, load_period_snapshot
+
+
+def _financial(code: str, net_sales: float | None, shares: int = 1_000_000) -> dict:
+    return financial(
+        code, doc_id=f"S{code}", period={"start": "2024-04-01", "end": "2025-03-31"},
+        metrics={"net_sales": net_sales, "total_number_of_issued_shares": shares, "ordinary_income": None},
+    )
+
+
+def _from_json(period_dir: Path) -> dict[str, dict]:
+    return {
+        p.stem: json.loads(p.read_text(encoding="utf-8"))["current_year"]["metrics"]
+        for p in period_dir.glob("*.json")
+    }
+
+
+def _matches_json(arrays: dict, period_dir: Path) -> bool:
+    expected = _from_json(period_dir)
+    keys = arrays["fact_keys"].tolist()
+    if arrays["security_code"].tolist() != sorted(expected):
+        return False
+    for i, code in enumerate(arrays["security_code"].tolist()):
+        for j, key in enumerate(keys):
+            value = expected[code].get(key)
+            if arrays["null_mask"][i, j] != (value is None):
+                return False
+            if value is not None and arrays["values"][i, j] != value:
+                return False
+    return True
+
+
+if __name__ == "__main__":
+    with temp_dataset() as tmp:
+        period_dir = Path(tmp) / "annual" / "2025FY"
+
+        exporter = JSONExporter(tmp)
+        with exporter.session() as session:
+            session.export(_financial("10020", 2000.0))
+            session.export(_financial("10010", None, shares=123_456_789))
+            session.export(_financial("130A0", 3000.0))
+        first = load_period_snapshot("annual", "2025FY")
+        first_ok = _matches_json(first, period_dir)
+
+        # 上書きは行を差し替える（行数は増えない）。保存は close() の1回のみ
+        saved_stat = os.stat(period_dir / SNAPSHOT_FILENAME)
+        for net_sales in (2100.0, 2200.0, 2300.0, 2500.0):
+            exporter.export(_financial("10020", net_sales))
+        pending_stat = os.stat(period_dir / SNAPSHOT_FILENAME)
+        saved_once = (pending_stat.st_ino, pending_stat.st_mtime_ns) == (saved_stat.st_ino, saved_stat.st_mtime_ns)
+        exporter.close()
+        second = load_period_snapshot("annual", "2025FY")
+        replaced = _matches_json(second, period_dir) and len(second["security_code"]) == 3
+
+        # スナップショットが無い決算期は JSON から再構築する
+        (period_dir / SNAPSHOT_FILENAME).unlink()
+        with JSONExporter(tmp) as exporter:
+            exporter.export(_financial("10030", 4000.0))
+        rebuilt = load_period_snapshot("annual", "2025FY")
+        rebuilt_ok = _matches_json(rebuilt, period_dir) and len(rebuilt["security_code"]) == 4
+
+        record_count = DatasetManifestGenerator(tmp).generate()["record_counts"]["annual"]["2025FY"]
+
+    checks = [
+        ("列順 = canonical_keys.yaml の定義順", tuple(first["fact_keys"].tolist()) == get_fact_key_order()),
+        ("スナップショット = 銘柄別 JSON", first_ok),
+        ("null マスク・NaN", bool(first["null_mask"][0, list(first["fact_keys"]).index("net_sales")])
+            and bool(np.isnan(first["values"][0, list(first["fact_keys"]).index("net_sales")]))),
+        ("文字列列", first["doc_id"].tolist() == ["S10010", "S10020", "S130A0"]
+            and set(first["period_end"].tolist()) == {"2025-03-31"}),
+        ("値は列ごとに連続（Fortran 順）", first["values"].flags["F_CONTIGUOUS"]),
+        ("上書きで行を差し替え", replaced),
+        ("export ごとには保存しない（close() で1回）", saved_once),
+        ("スナップショット欠損時に再構築", rebuilt_ok),
+        ("manifest の件数に含めない", record_count == 4),
+    ]
+
+    all_ok = True
+    for name, ok in checks:
+        status = "[OK]" if ok else "[NG]"
+        print(f"{status} {name}")
+        if not ok:
+            all_ok = False
+
+    sys.exit(0 if all_ok else 1)
@@ -0,0 +1,74 @@
+"""
+fact_key の projection（FactKeyRules.project / MappingPlan.project）のテストスクリプト。
+"""
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from parser.context_resolver import ContextResolver
+from normalizer.fact_normalizer import FactNormalizer, MappingPlan
+from financial.financial_master import FactKeyRules, FinancialMaster
+
+CONTEXT_MAP = {
+    "CurrentYearDuration": {"type": "duration", "start_date": "2024-04-01", "end_date": "2025-03-31"},
+    "CurrentYearInstant": {"type": "instant", "date": "2025-03-31"},
+    "AnchorInstant": {"type": "instant", "date": "2025-02-28"},
+    "FilingDateInstant": {"type": "instant", "date": "2025-06-25"},
+}
+
+
+def _fact(tag: str, context_ref: str, value: str) -> dict:
+    return {"tag": tag, "contextRef": context_ref, "unitRef": "JPY", "decimals": "-6",
+            "value": value, "is_nil": False}
+
+
+if __name__ == "__main__":
+    parsed = {"doc_id": "S0000001", "facts": [
+        _fact("jpdei_cor:SecurityCodeDEI", "FilingDateInstant", "10010"),
+        _fact("jppfs_cor:NetSales", "CurrentYearDuration", "1000"),
+        _fact("jppfs_cor:OperatingIncome", "CurrentYearDuration", "100"),
+        _fact("jppfs_cor:TotalAssets", "AnchorInstant", "5000"),
+        _fact("jppfs_cor:NetAssets", "AnchorInstant", "3000"),
+        _fact("jppfs_cor:ShareholdersEquity", "AnchorInstant", "2500"),
+    ]}
+    context_map = ContextResolver(context_map=CONTEXT_MAP).build_context_map()
+
+    full_rules, full_plan = FactKeyRules(), MappingPlan.load()
+    full = FinancialMaster(FactNormalizer(parsed, context_map).normalize()).compute()
+
+    keys = ["net_sales", "equity"]
+    rules = full_rules.project(keys)
+    plan = full_plan.project(rules.normalizer_keys())
+    projected = FinancialMaster(
+        FactNormalizer(parsed, context_map, plan=plan).normalize(), rules=rules,
+    ).compute()
+    metrics = projected["current_year"]["metrics"]
+    full_metrics = full["current_year"]["metrics"]
+
+    try:
+        full_rules.project(["no_such_key"])
+        unknown_rejected = False
+    except ValueError:
+        unknown_rejected = True
+
+    checks = [
+        ("指定 key のみ出力", set(metrics) == set(keys)),
+        ("全 key 算出時と同じ値", all(metrics[k] == full_metrics[k] for k in keys)),
+        ("BS アンカー補完も同一", metrics["equity"] == 2500.0),
+        ("resolution 候補を含む", {"shareholders_equity", "net_assets"} <= rules.normalizer_keys()),
+        ("パース対象タグを縮小", plan.tag_filter.local_names < full_plan.tag_filter.local_names
+            and "OperatingIncome" not in plan.tag_filter.local_names),
+        ("DEI タグは保持", "SecurityCodeDEI" in plan.tag_filter.local_names),
+        ("未定義の key はエラー", unknown_rejected),
+    ]
+
+    all_ok = True
+    for name, ok in checks:
+        status = "[OK]" if ok else "[NG]"
+        print(f"{status} {name}")
+        if not ok:
+            all_ok = False
+
+    sys.exit(0 if all_ok else 1)
@@ -0,0 +1,76 @@
+"""
+FactNormalizer / FinancialMaster の provenance（出力値の由来記録）のテストスクリプト。
+"""
+import json
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from parser.context_resolver import ContextResolver
+from normalizer.fact_normalizer import FactNormalizer
+from financial.financial_master import FinancialMaster
+
+CONTEXT_MAP = {
+    "CurrentYearDuration": {"type": "duration", "start_date": "2024-04-01", "end_date": "2025-03-31"},
+    "CurrentYearInstant": {"type": "instant", "date": "2025-03-31"},
+    "AnchorInstant": {"type": "instant", "date": "2025-02-28"},
+    "FilingDateInstant": {"type": "instant", "date": "2025-06-25"},
+}
+
+
+def _fact(tag: str, context_ref: str, value: str) -> dict:
+    return {"tag": tag, "contextRef": context_ref, "unitRef": "JPY", "decimals": "-6",
+            "value": value, "is_nil": False}
+
+
+if __name__ == "__main__":
+    parsed = {"doc_id": "S0000001", "facts": [
+        _fact("jpdei_cor:SecurityCodeDEI", "FilingDateInstant", "10010"),
+        _fact("jpcrp_cor:NetSalesSummaryOfBusinessResults", "CurrentYearDuration", "abc"),
+        _fact("jppfs_cor:NetSales", "CurrentYearDuration", "1000"),
+        _fact("jppfs_cor:RevenueIFRS", "CurrentYearDuration", "2000"),
+        _fact("jppfs_cor:TotalAssets", "AnchorInstant", "5000"),
+        _fact("jppfs_cor:NetAssets", "CurrentYearInstant", "3000"),
+    ]}
+    context_map = ContextResolver(context_map=CONTEXT_MAP).build_context_map()
+
+    plain = FactNormalizer(parsed, context_map).normalize()
+    traced = FactNormalizer(parsed, context_map, provenance=True).normalize()
+    provenance = traced.pop("provenance")
+    net_sales = provenance["current_year"]["pl"]["net_sales"]
+    total_assets = provenance["current_year"]["bs"]["total_assets"]
+
+    master_plain = FinancialMaster(plain).compute()
+    master_traced = FinancialMaster({**traced, "provenance": provenance}, provenance=True).compute()
+    equity = master_traced["provenance"]["current_year"]["equity"]
+
+    checks = [
+        ("無効時は provenance を出力しない", "provenance" not in plain and "provenance" not in master_plain),
+        ("有効時も値は同一", json.dumps(plain) == json.dumps(traced)),
+        ("採用タグと contextRef", net_sales["chosen"]["tag"] == "jppfs_cor:NetSales"
+            and net_sales["chosen"]["contextRef"] == "CurrentYearDuration"
+            and net_sales["chosen"]["source"] == "mapping"),
+        ("解析不能な候補を棄却", any(
+            r["tag"] == "jpcrp_cor:NetSalesSummaryOfBusinessResults" and r["reason"] == "unparsable"
+            for r in net_sales["rejected"])),
+        ("低優先の候補を棄却", any(
+            r["tag"] == "jppfs_cor:RevenueIFRS" and r["reason"] == "lower_priority"
+            for r in net_sales["rejected"])),
+        ("BS アンカー補完", total_assets["chosen"]["source"] == "bs_anchor"
+            and total_assets["chosen"]["anchor_date"] == "2025-02-28"),
+        ("resolution ルールの候補", equity["normalizer_key"] == "net_assets"
+            and equity["resolution"][-1] == "net_assets"),
+        ("FinancialMaster から normalizer の由来を参照", equity["source"]["chosen"]["tag"] == "jppfs_cor:NetAssets"),
+        ("FinancialMaster の値は同一", master_traced["current_year"] == master_plain["current_year"]),
+    ]
+
+    all_ok = True
+    for name, ok in checks:
+        status = "[OK]" if ok else "[NG]"
+        print(f"{status} {name}")
+        if not ok:
+            all_ok = False
+
+    sys.exit(0 if all_ok else 1)
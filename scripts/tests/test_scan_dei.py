@@ -0,0 +1,60 @@
+"""
+XBRLParser.scan_dei()（DEI ブロックのみの高速スキャン）のテストスクリプト。
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from parser.xbrl_parser import XBRLParser
+
+XBRL = b"""<?xml version="1.0" encoding="UTF-8"?>
+<xbrli:xbrl xmlns:xbrli="http://www.xbrl.org/2003/instance"
+            xmlns:jppfs_cor="http://disclosure.edinet-fsa.go.jp/taxonomy/jppfs/2024-11-01/jppfs_cor"
+            xmlns:jpdei_cor="http://disclosure.edinet-fsa.go.jp/taxonomy/jpdei/2013-08-31/jpdei_cor">
+  <xbrli:context id="FilingDateInstant">
+    <xbrli:entity><xbrli:identifier scheme="x">E00001-000</xbrli:identifier></xbrli:entity>
+    <xbrli:period><xbrli:instant>2025-06-20</xbrli:instant></xbrli:period>
+  </xbrli:context>
+  <jpdei_cor:SecurityCodeDEI contextRef="FilingDateInstant">72030</jpdei_cor:SecurityCodeDEI>
+  <jpdei_cor:AccountingStandardsDEI contextRef="FilingDateInstant">Japan GAAP</jpdei_cor:AccountingStandardsDEI>
+  <jpdei_cor:CurrentFiscalYearEndDateDEI contextRef="FilingDateInstant">2025-03-31</jpdei_cor:CurrentFiscalYearEndDateDEI>
+  <jppfs_cor:NetSales contextRef="FilingDateInstant">1000</jppfs_cor:NetSales>
+  <jppfs_cor:OperatingIncome contextRef="FilingDateInstant">100</jppfs_cor:OperatingIncome>
+</xbrli:xbrl>
+"""
+
+DEI_LOCAL_NAMES = ["SecurityCodeDEI", "AccountingStandardsDEI", "CurrentFiscalYearEndDateDEI"]
+
+
+def _tags(parsed: dict) -> list[str]:
+    return [f["tag"].rpartition(":")[2] for f in parsed["facts"]]
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        xbrl_path = Path(tmp) / "S100TEST" / "instance.xbrl"
+        xbrl_path.parent.mkdir()
+        xbrl_path.write_bytes(XBRL)
+
+        default_scan = XBRLParser(xbrl_path).scan_dei()
+        named_scan = XBRLParser(xbrl_path).scan_dei(DEI_LOCAL_NAMES)
+        partial_scan = XBRLParser(xbrl_path).scan_dei(["SecurityCodeDEI"])
+
+    checks = [
+        ("既定は DEI ブロックの終わりまで読む", _tags(default_scan) == DEI_LOCAL_NAMES + ["NetSales"]),
+        ("指定タグが揃えば打ち切る", _tags(named_scan) == DEI_LOCAL_NAMES),
+        ("指定タグ1件で打ち切る", _tags(partial_scan) == ["SecurityCodeDEI"]),
+        ("context も取得", "FilingDateInstant" in default_scan["context_map"]),
+    ]
+
+    all_ok = True
+    for name, ok in checks:
+        status = "[OK]" if ok else "[NG]"
+        print(f"{status} {name}")
+        if not ok:
+            all_ok = False
+
+    sys.exit(0 if all_ok else 1)
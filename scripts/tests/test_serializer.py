@@ -0,0 +1,86 @@
+"""
+出力形式（pretty / compact / gzip）と read_dataset_json のテストスクリプト。
+"""
+import json
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from dataset_fixtures import financial, temp_dataset
+from output.json_exporter import JSONExporter
+from output.manifest_generator import DatasetManifestGenerator
+from output.period_snapshot import load_period_snapshot
+from output.serializer import decode_dataset_bytes, get_serializer, read_dataset_json
+
+
+def _financial(code: str, net_sales: float = 251533000000.0) -> dict:
+    return financial(code, metrics={
+        "net_sales": net_sales, "total_assets": 218345000000.0, "dividends_per_share": 50.0,
+        "total_number_of_issued_shares": 64200000, "ordinary_income": None,
+    }, prior_year={"metrics": {"net_sales": 1.5}})
+
+
+if __name__ == "__main__":
+    sample = {"current_year": {"metrics": {"net_sales": 1e16, "dividends_per_share": 12.5, "bonds_payable": None}}}
+    pretty = get_serializer("pretty").encode(sample)
+    compact = get_serializer("compact").encode(sample)
+    gzipped = get_serializer("gzip").encode(sample)
+
+    try:
+        get_serializer("xml")
+        unknown_raised = False
+    except ValueError:
+        unknown_raised = True
+
+    with temp_dataset() as tmp:
+        period_dir = Path(tmp) / "annual" / "2025FY"
+
+        with JSONExporter(tmp) as exporter:
+            exporter.export(_financial("10010"))
+        pretty_file = json.loads((period_dir / "1001.json").read_text(encoding="utf-8"))
+
+        # 出力形式の変更: 旧形式のファイルを置き換える（件数は増えない）
+        exporter = JSONExporter(tmp, serializer="gzip")
+        gz_path = Path(exporter.export(_financial("10010")))
+        exporter.export(_financial("10020"))
+        exporter.close()
+        gz_file = read_dataset_json(gz_path)
+        replaced = gz_path.name == "1001.json.gz" and not (period_dir / "1001.json").exists()
+        record_count = DatasetManifestGenerator(tmp).generate()["record_counts"]["annual"]["2025FY"]
+        snapshot_codes = load_period_snapshot("annual", "2025FY")["security_code"].tolist()
+
+        rerun = JSONExporter(tmp, serializer="gzip")
+        rerun.export(_financial("10010"))
+        rerun.export(_financial("10020", 3.0e11))
+        rerun.close()
+
+    checks = [
+        ("pretty は従来出力とバイト互換", pretty == json.dumps(sample, indent=2, ensure_ascii=False).encode("utf-8")),
+        ("compact: 円金額の整数値は整数", b'"net_sales":10000000000000000' in compact and b"e+16" not in compact),
+        ("compact: 円金額以外・非整数はそのまま", b'"dividends_per_share":12.5' in compact),
+        ("gzip は compact の圧縮・同一内容は同一バイト列",
+            gzipped == get_serializer("gzip").encode(sample)
+            and decode_dataset_bytes(gzipped) == decode_dataset_bytes(compact)),
+        ("未定義の形式は ValueError", unknown_raised),
+        ("gzip 出力の読み込み", gz_file["current_year"]["metrics"]["net_sales"] == 251533000000
+            and isinstance(gz_file["current_year"]["metrics"]["net_sales"], int)
+            and gz_file["current_year"]["metrics"]["dividends_per_share"] == 50.0
+            and gz_file["prior_year"]["metrics"]["net_sales"] == 1.5),
+        ("pretty と同じ値", {k: v for k, v in gz_file.items() if k != "generated_at"}
+            == {k: v for k, v in pretty_file.items() if k != "generated_at"}),
+        ("旧形式のファイルを置き換え", replaced and record_count == 2),
+        ("スナップショットに .json.gz を含む", snapshot_codes == ["1001", "1002"]),
+        ("gzip でも変更時のみ書き込み", (rerun.written, rerun.unchanged) == (1, 1)),
+    ]
+
+    all_ok = True
+    for name, ok in checks:
+        status = "[OK]" if ok else "[NG]"
+        print(f"{status} {name}")
+        if not ok:
+            all_ok = False
+
+    sys.exit(0 if all_ok else 1)
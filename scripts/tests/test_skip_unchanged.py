@@ -0,0 +1,91 @@
+"""
+financial-dataset の内容ハッシュによる書き込みスキップ・一時ファイル + rename 書き込みのテストスクリプト。
+"""
+import json
+import os
+import stat
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from dataset_fixtures import financial, temp_dataset
+from output.dataset_io import TEMP_SUFFIX, payload_hash, write_json_atomic, write_json_if_changed
+from output.json_exporter import JSONExporter
+from output.manifest_generator import DatasetManifestGenerator
+
+
+def _snapshot(base: Path) -> dict[str, tuple[int, bytes]]:
+    return {
+        str(p.relative_to(base)): (p.stat().st_mtime_ns, p.read_bytes())
+        for p in sorted(base.rglob("*")) if p.is_file()
+    }
+
+
+if __name__ == "__main__":
+    reasons = {"ordinary_income": {"category": "accounting_standard", "reason": "IFRSに経常利益概念なし"}}
+    inputs = [financial("10010", net_sales=1000.0, null_reasons=reasons), financial("10020", net_sales=2000.0)]
+
+    with temp_dataset() as tmp:
+        base = Path(tmp)
+
+        with JSONExporter(tmp) as exporter:
+            for data in inputs:
+                exporter.export(data)
+        first = _snapshot(base)
+        first_counts = (exporter.written, exporter.unchanged)
+
+        # 再実行: generated_at 以外が同一のため1ファイルも書き換えない
+        exporter = JSONExporter(tmp)
+        with exporter.session() as session:
+            for data in inputs:
+                session.export(data)
+        DatasetManifestGenerator(tmp).save()
+        rerun_unchanged = _snapshot(base) == first
+        rerun_counts = (exporter.written, exporter.unchanged)
+
+        # 値の変更は書き込む
+        path = Path(exporter.export(financial("10020", net_sales=2500.0)))
+        exporter.close()
+        changed = json.loads(path.read_text(encoding="utf-8"))["current_year"]["metrics"]["net_sales"]
+        other_unchanged = _snapshot(base)["annual/2025FY/1001.json"] == first["annual/2025FY/1001.json"]
+
+        leftover = [p for p in base.rglob(f"*{TEMP_SUFFIX}")]
+
+        plain = base / "plain.json"
+        write_json_if_changed(plain, {"a": 1, "b": [1, 2], "generated_at": "x"})
+        skipped = not write_json_if_changed(plain, {"b": [1, 2], "a": 1, "generated_at": "y"})
+
+        # パーミッション: 新規は open() と同じ（0o666 & ~umask）、既存はそのモードを保つ
+        umask = os.umask(0)
+        os.umask(umask)
+        created = base / "created.json"
+        write_json_atomic(created, {"a": 1})
+        new_mode = stat.S_IMODE(created.stat().st_mode)
+        os.chmod(created, 0o640)
+        write_json_atomic(created, {"a": 2})
+        kept_mode = stat.S_IMODE(created.stat().st_mode)
+        dataset_modes = {stat.S_IMODE(p.stat().st_mode) for p in (base / "annual" / "2025FY").iterdir()}
+
+    checks = [
+        ("初回は全件書き込み", first_counts == (2, 0)),
+        ("再実行で出力・サイドカー・manifest を書き換えない", rerun_unchanged),
+        ("再実行の件数", rerun_counts == (0, 2)),
+        ("変更のあるファイルのみ書き込む", changed == 2500.0 and other_unchanged),
+        ("一時ファイルが残らない", not leftover),
+        ("パーミッション（新規は open() と同じ・既存のモードを維持）", new_mode == 0o666 & ~umask
+            and kept_mode == 0o640 and dataset_modes == {0o666 & ~umask}),
+        ("ハッシュはキー順・generated_at に依存しない", skipped
+            and payload_hash({"a": 1, "generated_at": "x"}) == payload_hash({"a": 1})),
+    ]
+
+    all_ok = True
+    for name, ok in checks:
+        status = "[OK]" if ok else "[NG]"
+        print(f"{status} {name}")
+        if not ok:
+            all_ok = False
+
+    sys.exit(0 if all_ok else 1)
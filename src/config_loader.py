@@ -15,8 +15,8 @@ logger = logging.getLogger(__name__)
 _CONFIG_DIR = Path(__file__).resolve().parent.parent / "config"
 
 
-def _load_yaml(filename: str) -> dict[str, Any]:
-    """config/ 配下の YAML ファイルをロードする。"""
+def _load_yaml(filename: str | Path) -> dict[str, Any]:
+    """config/ 配下の YAML ファイルをロードする。絶対パスはそのまま使用する。"""
     path = _CONFIG_DIR / filename
     if not path.exists():
         raise FileNotFoundError(f"設定ファイルが見つかりません: {path}")
@@ -27,10 +27,12 @@ def _load_yaml(filename: str) -> dict[str, Any]:
     return data
 
 
-@lru_cache(maxsize=1)
-def load_taxonomy_mapping() -> dict[str, list[tuple[str, str]]]:
+@lru_cache(maxsize=8)
+def load_taxonomy_mapping(
+    filename: str | Path = "taxonomy_mapping.yaml",
+) -> dict[str, list[tuple[str, str]]]:
     """
-    taxonomy_mapping.yaml をロードし、カテゴリ別のタグリストを返す。
+    taxonomy_mapping.yaml（または同形式の候補ファイル）をロードし、カテゴリ別のタグリストを返す。
 
     Returns:
         {
@@ -41,7 +43,7 @@ def load_taxonomy_mapping() -> dict[str, list[tuple[str, str]]]:
             "dei": [(tag, key), ...],
         }
     """
-    raw = _load_yaml("taxonomy_mapping.yaml")
+    raw = _load_yaml(filename)
     result: dict[str, list[tuple[str, str]]] = {}
     for category in ("pl", "bs", "cf", "dividend", "shares", "dei"):
         entries = raw.get(category, [])
@@ -57,23 +59,47 @@ def load_taxonomy_mapping() -> dict[str, list[tuple[str, str]]]:
 
 
 @lru_cache(maxsize=1)
-def load_canonical_keys() -> dict[str, Any]:
+def get_mapped_local_names() -> frozenset[str]:
+    """taxonomy_mapping.yaml の全カテゴリに定義されたタグ（ローカル名）の集合を返す。"""
+    mapping = load_taxonomy_mapping()
+    return frozenset(tag for entries in mapping.values() for tag, _ in entries)
+
+
+@lru_cache(maxsize=8)
+def load_canonical_keys(filename: str | Path = "canonical_keys.yaml") -> dict[str, Any]:
     """
-    canonical_keys.yaml をロードする。
+    canonical_keys.yaml（または同形式の候補ファイル）をロードする。
 
     Returns:
         全設定データ（fact_keys, derived_keys, accounting_standard_mapping 等）
     """
-    return _load_yaml("canonical_keys.yaml")
+    return _load_yaml(filename)
 
 
-@lru_cache(maxsize=1)
-def get_fact_keys() -> frozenset[str]:
+@lru_cache(maxsize=8)
+def get_fact_keys(filename: str | Path = "canonical_keys.yaml") -> frozenset[str]:
     """financial-dataset に保存する Fact キーの集合を返す。"""
-    config = load_canonical_keys()
+    config = load_canonical_keys(filename)
     return frozenset(config.get("fact_keys", {}).keys())
 
 
+@lru_cache(maxsize=8)
+def get_fact_key_order(filename: str | Path = "canonical_keys.yaml") -> tuple[str, ...]:
+    """Fact キーを canonical_keys.yaml の定義順で返す（列指向スナップショットの列順）。"""
+    config = load_canonical_keys(filename)
+    return tuple(config.get("fact_keys", {}).keys())
+
+
+@lru_cache(maxsize=8)
+def get_monetary_fact_keys(filename: str | Path = "canonical_keys.yaml") -> frozenset[str]:
+    """data_type が monetary（円金額）の Fact キーの集合を返す。"""
+    config = load_canonical_keys(filename)
+    return frozenset(
+        key for key, props in config.get("fact_keys", {}).items()
+        if isinstance(props, dict) and props.get("data_type") == "monetary"
+    )
+
+
 @lru_cache(maxsize=1)
 def get_derived_keys() -> frozenset[str]:
     """再計算可能（保存しない）キーの集合を返す。"""
@@ -81,15 +107,15 @@ def get_derived_keys() -> frozenset[str]:
     return frozenset(config.get("derived_keys", []))
 
 
-@lru_cache(maxsize=1)
-def get_resolution_rules() -> dict[str, list[str]]:
+@lru_cache(maxsize=8)
+def get_resolution_rules(filename: str | Path = "canonical_keys.yaml") -> dict[str, list[str]]:
     """
     同一概念の優先順位解決ルールを返す。
 
     Returns:
         {"equity": ["shareholders_equity", "equity_attributable_to_owners", ...], ...}
     """
-    config = load_canonical_keys()
+    config = load_canonical_keys(filename)
     rules: dict[str, list[str]] = {}
     for key, props in config.get("fact_keys", {}).items():
         if isinstance(props, dict) and "resolution" in props:
@@ -97,8 +123,8 @@ def get_resolution_rules() -> dict[str, list[str]]:
     return rules
 
 
-@lru_cache(maxsize=1)
-def get_normalizer_key_mapping() -> dict[str, str]:
+@lru_cache(maxsize=8)
+def get_normalizer_key_mapping(filename: str | Path = "canonical_keys.yaml") -> dict[str, str]:
     """
     normalizer の出力キーと canonical キーのマッピングを返す。
     normalizer_key が定義されている場合のみ含む。
@@ -106,7 +132,7 @@ def get_normalizer_key_mapping() -> dict[str, str]:
     Returns:
         {"profit_loss": "net_income_attributable_to_parent", ...}
     """
-    config = load_canonical_keys()
+    config = load_canonical_keys(filename)
     mapping: dict[str, str] = {}
     for key, props in config.get("fact_keys", {}).items():
         if isinstance(props, dict) and "normalizer_key" in props:
@@ -126,3 +152,14 @@ def get_valid_accounting_standards() -> frozenset[str]:
     """有効な会計基準名の集合を返す。"""
     config = load_canonical_keys()
     return frozenset(config.get("valid_accounting_standards", []))
+
+
+@lru_cache(maxsize=8)
+def load_null_classification(filename: str | Path = "null_classification.yaml") -> dict[str, Any]:
+    """
+    null_classification.yaml（NULL理由分類ルール）をロードする。
+
+    Returns:
+        全設定データ（categories, document_traits, accounting_standard_rules, tag_hints 等）
+    """
+    return _load_yaml(filename)
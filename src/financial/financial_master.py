@@ -11,19 +11,73 @@ EPSは再計算可能なためFactレイクに含めない。
 
 優先順位解決ルールは config/canonical_keys.yaml から読み込む。
 """
+import copy
 import logging
+from collections.abc import Iterable
+from pathlib import Path
 from typing import Any
 
 try:
     from src.config_loader import get_fact_keys, get_normalizer_key_mapping, get_resolution_rules
+    from src.normalizer.null_classifier import get_null_classifier
 except ModuleNotFoundError:
     from config_loader import get_fact_keys, get_normalizer_key_mapping, get_resolution_rules
+    from normalizer.null_classifier import get_null_classifier
 
 logger = logging.getLogger(__name__)
 
-_RESOLUTION_RULES = get_resolution_rules()
-_NORMALIZER_KEY_MAP = get_normalizer_key_mapping()
-_FACT_KEYS = get_fact_keys()
+
+class FactKeyRules:
+    """
+    canonical_keys.yaml から構築した Fact 抽出規則。
+
+    fact_keys: 出力する Fact キー
+    resolution_rules: fact_key → 優先順位付きの normalizer キー候補
+    source_keys: fact_key → normalizer 出力キー（normalizer_key マッピング。無ければ同名）
+    """
+
+    def __init__(self, filename: str | Path = "canonical_keys.yaml") -> None:
+        """
+        Args:
+            filename: canonical_keys.yaml 形式のファイル（相対パスは config/ 基準）
+        """
+        self.fact_keys = get_fact_keys(filename)
+        self.resolution_rules = get_resolution_rules(filename)
+        first_source: dict[str, str] = {}
+        for nk, ck in get_normalizer_key_mapping(filename).items():
+            first_source.setdefault(ck, nk)
+        self.source_keys = {k: first_source.get(k, k) for k in self.fact_keys}
+
+    def project(self, fact_keys: Iterable[str]) -> "FactKeyRules":
+        """指定 fact_key のみを出力する規則を返す（projection）。
+
+        Raises:
+            ValueError: 未定義の fact_key が含まれる場合
+        """
+        wanted = frozenset(fact_keys)
+        unknown = wanted - self.fact_keys
+        if unknown:
+            raise ValueError(f"未定義の fact_key: {', '.join(sorted(unknown))}")
+        projected = copy.copy(self)
+        projected.fact_keys = wanted
+        projected.resolution_rules = {
+            k: v for k, v in self.resolution_rules.items() if k in wanted
+        }
+        projected.source_keys = {k: v for k, v in self.source_keys.items() if k in wanted}
+        return projected
+
+    def normalizer_keys(self) -> set[str]:
+        """fact_keys の解決に必要な normalizer 出力キー（resolution 候補・normalizer_key を含む）。"""
+        keys: set[str] = set()
+        for fact_key in self.fact_keys:
+            if fact_key in self.resolution_rules:
+                keys.update(self.resolution_rules[fact_key])
+            else:
+                keys.add(self.source_keys[fact_key])
+        return keys
+
+
+_DEFAULT_RULES = FactKeyRules()
 
 
 def _resolve_by_priority(bs: dict[str, Any], candidates: list[str]) -> float | None:
@@ -60,6 +114,7 @@ def _extract_facts(
     bs: dict[str, Any],
     cf: dict[str, Any],
     dividend: dict[str, Any],
+    rules: FactKeyRules = _DEFAULT_RULES,
 ) -> dict[str, float | int | None]:
     """
     単年分のPL/BS/CF/配当から財務Factのみを抽出する。
@@ -71,18 +126,12 @@ def _extract_facts(
     all_sources = {**pl, **bs, **cf, **dividend}
 
     result: dict[str, float | int | None] = {}
-    for fact_key in _FACT_KEYS:
-        if fact_key in _RESOLUTION_RULES:
-            result[fact_key] = _resolve_by_priority(all_sources, _RESOLUTION_RULES[fact_key])
+    for fact_key in rules.fact_keys:
+        if fact_key in rules.resolution_rules:
+            result[fact_key] = _resolve_by_priority(all_sources, rules.resolution_rules[fact_key])
             continue
 
-        source_key = fact_key
-        for nk, ck in _NORMALIZER_KEY_MAP.items():
-            if ck == fact_key:
-                source_key = nk
-                break
-
-        raw_value = all_sources.get(source_key)
+        raw_value = all_sources.get(rules.source_keys[fact_key])
         if fact_key == "total_number_of_issued_shares":
             result[fact_key] = _safe_int(raw_value)
         elif fact_key == "dividends_per_share":
@@ -93,31 +142,98 @@ def _extract_facts(
     return result
 
 
+def _trace_facts(
+    year_data: dict[str, Any],
+    rules: FactKeyRules = _DEFAULT_RULES,
+) -> dict[str, dict[str, Any]]:
+    """
+    _extract_facts() と同じ解決規則で、fact_key ごとの由来を返す。
+
+    normalizer_key: 採用した normalizer 出力キー（resolution ルールで有効値が無ければ None）
+    resolution: resolution ルール適用時の候補キー（優先順）
+    source: normalizer provenance の該当エントリ（FactNormalizer(provenance=True) の出力時のみ）
+    """
+    categories = ("pl", "bs", "cf", "dividend")
+    # {**pl, **bs, **cf, **dividend} と同じく、後のカテゴリのキーが優先される
+    origin: dict[str, str] = {}
+    values: dict[str, Any] = {}
+    for category in categories:
+        for key, value in (year_data.get(category) or {}).items():
+            origin[key] = category
+            values[key] = value
+    provenance = year_data.get("provenance") or {}
+
+    def source_of(key: str | None) -> dict[str, Any] | None:
+        if key is None or key not in origin:
+            return None
+        return (provenance.get(origin[key]) or {}).get(key)
+
+    result: dict[str, dict[str, Any]] = {}
+    for fact_key in rules.fact_keys:
+        if fact_key in rules.resolution_rules:
+            candidates = rules.resolution_rules[fact_key]
+            chosen = next(
+                (k for k in candidates if isinstance(values.get(k), (int, float))), None,
+            )
+            result[fact_key] = {
+                "normalizer_key": chosen,
+                "resolution": list(candidates),
+                "source": source_of(chosen),
+            }
+        else:
+            source_key = rules.source_keys[fact_key]
+            result[fact_key] = {
+                "normalizer_key": source_key,
+                "resolution": None,
+                "source": source_of(source_key),
+            }
+    return result
+
+
 class FinancialMaster:
     """
     Normalizer出力を受け取り、BS/PL/CFの生Factを統合する。
     Derived指標は算出しない。Normalizerには影響しない。
     """
 
-    def __init__(self, normalized_data: dict[str, Any]) -> None:
+    def __init__(
+        self,
+        normalized_data: dict[str, Any],
+        *,
+        provenance: bool = False,
+        rules: FactKeyRules | None = None,
+        null_reasons: bool = False,
+    ) -> None:
+        """
+        Args:
+            provenance: True の場合、fact_key ごとの由来（normalizer キー・resolution 候補・
+                normalizer provenance）を結果の "provenance" に記録する。
+            rules: 使用する Fact 抽出規則。未指定時は config/canonical_keys.yaml。
+            null_reasons: True の場合、NULL の fact_key ごとの分類（category / reason）を結果の
+                "null_reasons" に記録する。判定材料として FactNormalizer(null_reasons=True) の
+                "null_evidence" が必要（無い場合は記録しない）。
+        """
         self._data = normalized_data
+        self._provenance = provenance
+        self._rules = rules or _DEFAULT_RULES
+        self._null_reasons = null_reasons
 
     def compute(self) -> dict[str, Any]:
         """
         current_year / prior_year それぞれの Fact を抽出して返す。
         有効なFactが存在しない年度はキー自体を出力しない。
-        メタデータ（accounting_standard, consolidation_type）をパススルーする。
+        メタデータ（accounting_standard, consolidation_type, 過年度分の source）をパススルーする。
         """
         current = self._data.get("current_year") or {}
         prior = self._data.get("prior_year") or {}
 
         current_facts = _extract_facts(
             current.get("pl") or {}, current.get("bs") or {},
-            current.get("cf") or {}, current.get("dividend") or {},
+            current.get("cf") or {}, current.get("dividend") or {}, self._rules,
         )
         prior_facts = _extract_facts(
             prior.get("pl") or {}, prior.get("bs") or {},
-            prior.get("cf") or {}, prior.get("dividend") or {},
+            prior.get("cf") or {}, prior.get("dividend") or {}, self._rules,
         )
 
         result: dict[str, Any] = {
@@ -129,6 +245,9 @@ class FinancialMaster:
             "accounting_standard": self._data.get("accounting_standard"),
         }
 
+        if self._data.get("source"):
+            result["source"] = self._data["source"]
+
         current_has_data = any(v is not None for v in current_facts.values())
         prior_has_data = any(v is not None for v in prior_facts.values())
 
@@ -146,6 +265,29 @@ class FinancialMaster:
                 year_block["period"] = prior_period
             result["prior_year"] = year_block
 
+        if self._provenance:
+            normalizer_provenance = self._data.get("provenance") or {}
+            result["provenance"] = {
+                year: _trace_facts({
+                    **(self._data.get(year) or {}),
+                    "provenance": normalizer_provenance.get(year),
+                }, self._rules)
+                for year in ("current_year", "prior_year")
+            }
+
+        null_evidence = self._data.get("null_evidence")
+        if self._null_reasons and null_evidence is not None:
+            classifier = get_null_classifier()
+            result["null_reasons"] = {
+                year: classifier.classify(
+                    result[year]["metrics"], null_evidence.get(year) or {},
+                    traits=null_evidence.get("traits") or (),
+                    accounting_standard=result["accounting_standard"],
+                    consolidation_type=result["consolidation_type"],
+                )
+                for year in ("current_year", "prior_year") if year in result
+            }
+
         current_count = sum(1 for v in current_facts.values() if v is not None)
         prior_count = sum(1 for v in prior_facts.values() if v is not None)
         logger.info("FinancialMaster compute: doc_id=%s, current=%d facts, prior=%d facts",
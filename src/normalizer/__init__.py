@@ -1,6 +1,7 @@
 """
 正規化モジュール
 """
-from .fact_normalizer import FactNormalizer
+from .dei_index import DeiIndex
+from .fact_normalizer import FactNormalizer, build_tag_filter
 
-__all__ = ["FactNormalizer"]
+__all__ = ["DeiIndex", "FactNormalizer", "build_tag_filter"]
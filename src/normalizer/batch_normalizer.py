@@ -0,0 +1,239 @@
+"""
+BatchNormalizer
+多数の文書の fact を1つの列指向テーブル（NumPy 配列）にまとめて正規化する。
+
+FactNormalizer.normalize() と完全に同じ結果を返す。スロット解決
+（先頭マッチ優先・連結優先・当期/前期・xsi:nil によるフォールバック抑止）は
+文書横断の配列演算（マスク + lexsort によるグループ内最小値）で行い、
+Python ループは DEI 抽出・選ばれた fact の値変換・結果の組み立てのみに限定する。
+
+使用例:
+    normalizer = BatchNormalizer()
+    results = normalizer.normalize_many([(parsed, context_map), ...])
+"""
+import logging
+from collections.abc import Iterable
+from typing import Any
+
+import numpy as np
+
+try:
+    from src.parser.fact_table import FactTable, ensure_fact_table
+except ModuleNotFoundError:
+    from parser.fact_table import FactTable, ensure_fact_table
+
+from .fact_normalizer import _CATEGORY_RULES, _MAPPING_PLAN, _YEARS, FactNormalizer, MappingPlan
+
+logger = logging.getLogger(__name__)
+
+_PERIOD_TYPE_CODES = {"duration": 0, "instant": 1}
+
+
+class _CompiledPlan:
+    """MappingPlan を配列化したもの（ローカル名ID → エントリの CSR 表現）。"""
+
+    def __init__(self, plan: MappingPlan) -> None:
+        self.plan = plan
+        self.categories = list(_CATEGORY_RULES)
+        category_ids = {category: i for i, category in enumerate(self.categories)}
+        self.slots: list[tuple[str, str]] = [
+            (category, key) for category in self.categories for key in plan.keys[category]
+        ]
+        slot_ids = {slot: i for i, slot in enumerate(self.slots)}
+
+        self.local_ids: dict[str, int] = {}
+        ptr = [0]
+        entry_slot: list[int] = []
+        entry_priority: list[int] = []
+        entry_category: list[int] = []
+        for local_name, entries in plan.by_local_name.items():
+            self.local_ids[local_name] = len(self.local_ids)
+            for category, key, priority in entries:
+                entry_slot.append(slot_ids[(category, key)])
+                entry_priority.append(priority)
+                entry_category.append(category_ids[category])
+            ptr.append(len(entry_slot))
+
+        self.entry_ptr = np.asarray(ptr, dtype=np.int64)
+        self.entry_slot = np.asarray(entry_slot, dtype=np.int64)
+        self.entry_priority = np.asarray(entry_priority, dtype=np.int64)
+        self.entry_category = np.asarray(entry_category, dtype=np.int64)
+        self.priority_span = int(self.entry_priority.max()) + 1 if entry_priority else 1
+        self.category_period_type = np.asarray(
+            [_PERIOD_TYPE_CODES[_CATEGORY_RULES[c][0]] for c in self.categories], dtype=np.int8,
+        )
+        self.category_follows_dei = np.asarray(
+            [_CATEGORY_RULES[c][2] for c in self.categories], dtype=bool,
+        )
+        self.category_parsers = [_CATEGORY_RULES[c][1] for c in self.categories]
+
+
+class BatchNormalizer:
+    """複数文書をまとめて正規化する。結果は文書ごとの FactNormalizer.normalize() と一致する。"""
+
+    def __init__(self, plan: MappingPlan | None = None) -> None:
+        self._compiled = _CompiledPlan(plan or _MAPPING_PLAN)
+
+    def normalize_many(
+        self,
+        documents: Iterable[tuple[dict[str, Any], dict[str, dict[str, Any]]]],
+    ) -> list[dict[str, Any]]:
+        """
+        Args:
+            documents: (XBRLParser.parse() の結果, context_map) の列
+
+        Returns:
+            入力順の正規化結果リスト
+        """
+        normalizers: list[FactNormalizer] = []
+        fact_tables: list[FactTable] = []
+        deis: list[dict[str, Any]] = []
+        columns: list[tuple[np.ndarray, ...]] = []
+        for doc_index, (parsed, context_map) in enumerate(documents):
+            normalizer = FactNormalizer(parsed, context_map, plan=self._compiled.plan)
+            facts = ensure_fact_table(parsed.get("facts"))
+            dei = normalizer._pick_dei(facts)
+            normalizers.append(normalizer)
+            fact_tables.append(facts)
+            deis.append(dei)
+            columns.append(self._document_columns(doc_index, facts, normalizer._context_map))
+
+        slots = self._resolve(columns, fact_tables, deis)
+        return [
+            normalizer._build_result(dei, doc_slots)
+            for normalizer, dei, doc_slots in zip(normalizers, deis, slots)
+        ]
+
+    # ------------------------------------------------------------------
+    # 列指向テーブル構築
+    # ------------------------------------------------------------------
+
+    def _document_columns(
+        self,
+        doc_index: int,
+        facts: FactTable,
+        context_map: dict[str, dict[str, Any]],
+    ) -> tuple[np.ndarray, ...]:
+        """1文書分の候補行を (doc, row, local_id, year, period_type, consolidated) 配列で返す。
+
+        マッピング対象外タグ・セグメント dimension・当期/前期以外の context の行は除外する。
+        タグ・context の属性は種類ごとに1回だけ計算し、行へは配列参照で展開する。
+        """
+        local_ids = self._compiled.local_ids
+        tag_local = np.asarray(
+            [local_ids.get(tag.rpartition(":")[2], -1) for tag in facts.tags.strings] or [-1],
+            dtype=np.int64,
+        )
+        context_year = []
+        context_period_type = []
+        context_consolidated = []
+        for context_ref in facts.contexts.strings:
+            ctx = context_map.get(context_ref)
+            year = -1
+            period_type = _PERIOD_TYPE_CODES.get(ctx["type"], -1) if ctx else -1
+            if ctx is not None and not ctx["has_segment_dimension"] and period_type >= 0:
+                if ctx["is_current_year"]:
+                    year = 0
+                elif ctx["is_prior_year"]:
+                    year = 1
+            context_year.append(year)
+            context_period_type.append(period_type)
+            context_consolidated.append(bool(ctx and ctx["is_consolidated"]))
+        context_year_arr = np.asarray(context_year or [-1], dtype=np.int64)
+        context_period_arr = np.asarray(context_period_type or [-1], dtype=np.int8)
+        context_consolidated_arr = np.asarray(context_consolidated or [False], dtype=bool)
+
+        tag_ids = np.asarray(facts.tag_ids, dtype=np.int64)
+        context_ids = np.asarray(facts.context_ids, dtype=np.int64)
+        local = tag_local[tag_ids]
+        year = context_year_arr[context_ids]
+        rows = np.flatnonzero((local >= 0) & (year >= 0))
+        context_rows = context_ids[rows]
+        return (
+            np.full(len(rows), doc_index, dtype=np.int64),
+            rows.astype(np.int64),
+            local[rows],
+            year[rows],
+            context_period_arr[context_rows],
+            context_consolidated_arr[context_rows],
+        )
+
+    # ------------------------------------------------------------------
+    # スロット解決
+    # ------------------------------------------------------------------
+
+    def _resolve(
+        self,
+        columns: list[tuple[np.ndarray, ...]],
+        fact_tables: list[FactTable],
+        deis: list[dict[str, Any]],
+    ) -> list[dict[str, dict[str, dict[str, Any]]]]:
+        compiled = self._compiled
+        slot_count = len(compiled.slots)
+        out = [
+            {
+                year: {c: dict.fromkeys(keys) for c, keys in compiled.plan.keys.items()}
+                for year in _YEARS
+            }
+            for _ in fact_tables
+        ]
+        if not columns:
+            return out
+
+        doc, row, local, year, period_type, consolidated = (
+            np.concatenate([c[i] for c in columns]) for i in range(6)
+        )
+        if len(row) == 0:
+            return out
+
+        # 行 × マッピングエントリに展開（1つのローカル名が複数スロットに対応しうる）
+        starts = compiled.entry_ptr[local]
+        counts = compiled.entry_ptr[local + 1] - starts
+        source = np.repeat(np.arange(len(row)), counts)
+        offsets = np.arange(len(source)) - np.repeat(np.cumsum(counts) - counts, counts)
+        entry = starts[source] + offsets
+        slot = compiled.entry_slot[entry]
+        priority = compiled.entry_priority[entry]
+        category = compiled.entry_category[entry]
+        doc, row, year, consolidated = doc[source], row[source], year[source], consolidated[source]
+
+        # カテゴリの期間種別と一致し、連結のみ指定なら連結 fact に限る
+        consolidated_only = np.asarray([bool(d["is_consolidated"]) for d in deis], dtype=bool)
+        valid = compiled.category_period_type[category] == period_type[source]
+        valid &= ~(consolidated_only[doc] & compiled.category_follows_dei[category]) | consolidated
+        doc, row, year, consolidated = doc[valid], row[valid], year[valid], consolidated[valid]
+        slot, priority, category = slot[valid], priority[valid], category[valid]
+        if len(row) == 0:
+            return out
+
+        # keyword（= スロット内 priority）ごとに「連結優先・文書順で先頭」の fact を選ぶ
+        slot_group = (doc * len(_YEARS) + year) * slot_count + slot
+        keyword_group = slot_group * compiled.priority_span + priority
+        order = np.lexsort((row, ~consolidated, keyword_group))
+        sorted_groups = keyword_group[order]
+        first = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+        chosen = order[first]
+
+        # 選ばれた fact の値変換（値が解析できず nil でもない keyword はスロットを解決しない）
+        parsers = compiled.category_parsers
+        values: list[Any] = []
+        resolved = np.zeros(len(chosen), dtype=bool)
+        for i, idx in enumerate(chosen.tolist()):
+            facts = fact_tables[doc[idx]]
+            r = int(row[idx])
+            value = parsers[category[idx]](facts.values[r])
+            values.append(value)
+            resolved[i] = value is not None or facts.is_nil(r)
+
+        # スロットごとに解決済み keyword の最小 priority を採用
+        candidates = chosen[resolved]
+        candidate_values = [v for v, ok in zip(values, resolved.tolist()) if ok]
+        order = np.lexsort((priority[candidates], slot_group[candidates]))
+        sorted_slots = slot_group[candidates][order]
+        first = np.flatnonzero(np.r_[True, sorted_slots[1:] != sorted_slots[:-1]])
+        for pos in first.tolist():
+            winner = order[pos]
+            idx = candidates[winner]
+            category_name, key = compiled.slots[slot[idx]]
+            out[doc[idx]][_YEARS[year[idx]]][category_name][key] = candidate_values[winner]
+        return out
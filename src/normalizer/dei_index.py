@@ -0,0 +1,153 @@
+"""
+DeiIndex
+XBRLファイル → DEI 情報（security_code 等）の永続インデックス。
+
+XBRLParser.scan_dei() で DEI ブロックのみを読み、FactNormalizer と同じ規則で DEI を解釈する。
+ファイルのサイズ・更新時刻が変わらない限り再スキャンしないため、
+特定銘柄の XBRL をコーパス全体のパースなしで特定できる。
+"""
+import json
+import logging
+import os
+import tempfile
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+try:
+    from src.constants import SKIP_FILENAME_PATTERNS
+    from src.parser.context_resolver import ContextResolver
+    from src.parser.xbrl_parser import XBRLParser
+except ModuleNotFoundError:
+    from constants import SKIP_FILENAME_PATTERNS
+    from parser.context_resolver import ContextResolver
+    from parser.xbrl_parser import XBRLParser
+
+from .fact_normalizer import DEI_TAGS, FactNormalizer
+
+logger = logging.getLogger(__name__)
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_INDEX_PATH = _PROJECT_ROOT / "data" / "cache" / "dei_index.json"
+
+INDEX_VERSION = 1
+
+
+def _normalize_code(raw: Any) -> str:
+    """EDINET 証券コードを4桁に正規化する。5桁末尾0なら削除。"""
+    s = str(raw).strip()
+    if len(s) == 5 and s.endswith("0"):
+        return s[:4]
+    return s
+
+
+def scan_dei(xbrl_path: Path) -> dict[str, Any]:
+    """XBRL の DEI ブロックのみを読み、FactNormalizer と同じ規則で解釈した DEI 情報を返す。"""
+    scanned = XBRLParser(xbrl_path).scan_dei(tag for tag, _ in DEI_TAGS)
+    context_map = ContextResolver.from_parsed(scanned).build_context_map()
+    dei = FactNormalizer(scanned, context_map).extract_dei()
+    dei["doc_id"] = scanned["doc_id"]
+    return dei
+
+
+class DeiIndex:
+    """
+    XBRLファイルの DEI 情報インデックス。
+
+    エントリは base_dir からの相対パスをキーとし、size / mtime_ns と DEI 情報を保持する。
+
+    使用例:
+        index = DeiIndex(xbrl_base_dir)
+        index.refresh()
+        files = index.files_for(["7203", "6758"])
+    """
+
+    def __init__(self, base_dir: Path, index_path: Path | None = None) -> None:
+        self._base_dir = Path(base_dir)
+        self._index_path = Path(index_path) if index_path else DEFAULT_INDEX_PATH
+        self._entries: dict[str, dict[str, Any]] = self._load()
+
+    @property
+    def entries(self) -> dict[str, dict[str, Any]]:
+        """相対パス -> エントリ のマップ。"""
+        return self._entries
+
+    def refresh(self, xbrl_files: Iterable[Path] | None = None, *, save: bool = True) -> int:
+        """
+        新規・変更ファイルのみスキャンし、消えたファイルのエントリを削除する。
+
+        Args:
+            xbrl_files: 対象ファイル。未指定時は base_dir 以下の *.xbrl（スキップ対象を除く）。
+            save: 変更があればインデックスファイルに保存する。
+
+        Returns:
+            スキャンしたファイル数
+        """
+        if xbrl_files is None:
+            xbrl_files = (
+                f for f in self._base_dir.rglob("*.xbrl")
+                if not any(pat in f.name.lower() for pat in SKIP_FILENAME_PATTERNS)
+            )
+        current: dict[str, dict[str, Any]] = {}
+        scanned = 0
+        for xbrl_path in xbrl_files:
+            rel = self._relative(xbrl_path)
+            stat = xbrl_path.stat()
+            entry = self._entries.get(rel)
+            if entry is None or entry["size"] != stat.st_size or entry["mtime_ns"] != stat.st_mtime_ns:
+                try:
+                    dei = scan_dei(xbrl_path)
+                except Exception as e:
+                    logger.warning("DEIスキャン失敗: %s - %s", xbrl_path.name, e)
+                    continue
+                entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, **dei}
+                scanned += 1
+            current[rel] = entry
+
+        changed = scanned > 0 or current.keys() != self._entries.keys()
+        self._entries = current
+        if changed and save:
+            self.save()
+        logger.info("DEIインデックス更新: %d件（スキャン %d件）", len(current), scanned)
+        return scanned
+
+    def files_for(self, codes: Iterable[str]) -> list[Path]:
+        """証券コード（4桁/5桁いずれも可）に一致するXBRLファイルを返す。"""
+        targets = {_normalize_code(c) for c in codes}
+        return sorted(
+            self._base_dir / rel
+            for rel, entry in self._entries.items()
+            if entry.get("security_code") and _normalize_code(entry["security_code"]) in targets
+        )
+
+    def save(self) -> None:
+        """インデックスを一時ファイル経由で原子的に保存する。"""
+        self._index_path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"version": INDEX_VERSION, "files": self._entries}
+        fd, tmp_name = tempfile.mkstemp(dir=self._index_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False, indent=1, sort_keys=True)
+            os.replace(tmp_name, self._index_path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning("DEIインデックス読み込み失敗のため再構築: %s", e)
+            return {}
+        if payload.get("version") != INDEX_VERSION:
+            return {}
+        return payload.get("files", {})
+
+    def _relative(self, xbrl_path: Path) -> str:
+        try:
+            return Path(xbrl_path).resolve().relative_to(self._base_dir.resolve()).as_posix()
+        except ValueError:
+            return Path(xbrl_path).resolve().as_posix()
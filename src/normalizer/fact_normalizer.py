@@ -7,93 +7,54 @@ FactNormalizer
 """
 import logging
 from collections import Counter
-from datetime import datetime
+from collections.abc import Callable, Iterable
+from pathlib import Path
 from typing import Any
 
 try:
-    from src.config_loader import load_taxonomy_mapping
+    from src.config_loader import get_mapped_local_names, load_taxonomy_mapping
+    from src.parser.context_resolver import (
+        _is_consolidated_context_id,
+        annotate_context_map,
+        context_date,
+        is_annotated,
+        resolve_period_ends,
+        resolve_year_ends,
+    )
+    from src.parser.fact_table import Fact, FactTable, ensure_fact_table
+    from src.parser.xbrl_parser import TagFilter
+    from src.normalizer.null_classifier import get_null_classifier
 except ModuleNotFoundError:
-    from config_loader import load_taxonomy_mapping
+    from config_loader import get_mapped_local_names, load_taxonomy_mapping
+    from parser.context_resolver import (
+        _is_consolidated_context_id,
+        annotate_context_map,
+        context_date,
+        is_annotated,
+        resolve_period_ends,
+        resolve_year_ends,
+    )
+    from parser.fact_table import Fact, FactTable, ensure_fact_table
+    from parser.xbrl_parser import TagFilter
+    from normalizer.null_classifier import get_null_classifier
 
 logger = logging.getLogger(__name__)
 
-_mapping = load_taxonomy_mapping()
-
-PL_TAGS: list[tuple[str, str]] = _mapping["pl"]
-BS_TAGS: list[tuple[str, str]] = _mapping["bs"]
-CF_TAGS: list[tuple[str, str]] = _mapping["cf"]
-DIVIDEND_TAGS: list[tuple[str, str]] = _mapping["dividend"]
-SHARES_TAGS: list[tuple[str, str]] = _mapping["shares"]
-DEI_TAGS: list[tuple[str, str]] = _mapping["dei"]
-
 _BS_ANCHOR_KEYWORDS = ("TotalAssets", "LiabilitiesAndNetAssets", "NetAssets")
+# BS アンカー補完の要否を判定する bs キー（projection でも常に解決する）
+_BS_ANCHOR_TRIGGER_KEY = "total_assets"
 
 
 # ---------------------------------------------------------------------------
 # ユーティリティ関数
 # ---------------------------------------------------------------------------
 
-def _current_and_prior_year_ends(
-    context_map: dict[str, dict[str, Any]],
-) -> tuple[str | None, str | None]:
-    """context_map の duration end_date から current_year_end / prior_year_end を算出する。"""
-    end_dates: list[str] = []
-    for ctx in context_map.values():
-        if ctx.get("type") == "duration" and ctx.get("end_date"):
-            end_dates.append(ctx["end_date"])
-    if not end_dates:
-        return None, None
-
-    sorted_dates = sorted(set(end_dates), reverse=True)
-    current_year_end = sorted_dates[0]
-    prior_year_end: str | None = None
-    try:
-        current_dt = datetime.strptime(current_year_end, "%Y-%m-%d")
-        prior_year = current_dt.year - 1
-        for d in sorted_dates:
-            try:
-                if datetime.strptime(d, "%Y-%m-%d").year == prior_year:
-                    prior_year_end = d
-                    break
-            except ValueError:
-                continue
-    except ValueError:
-        logger.warning("日付解析失敗: %s", current_year_end)
-    return current_year_end, prior_year_end
-
+def build_tag_filter() -> TagFilter:
+    """FactNormalizer が参照するタグのみを収集する XBRLParser 用フィルタを返す。
 
-def _tag_local_name(tag: str) -> str:
-    """タグからローカル名を取得する（prefix:local → local）。"""
-    return tag.split(":")[-1] if ":" in tag else tag
-
-
-def _tag_matches(tag: str, keyword: str) -> bool:
-    """タグのローカル名が keyword と完全一致するか判定する。
-
-    部分一致は誤爆リスクが高いため禁止。正確性を優先する。
+    taxonomy_mapping.yaml の全タグ（完全一致）と BS アンカーキーワード（部分一致）を含む。
     """
-    return _tag_local_name(tag) == keyword
-
-
-def _is_consolidated_context(context_ref: str) -> bool:
-    """contextRef が連結コンテキストか判定する。NonConsolidated を含む場合は単体。"""
-    return "NonConsolidated" not in context_ref
-
-
-def _has_member_dimension(context_ref: str) -> bool:
-    """contextRef にセグメント/メンバー dimension が含まれるか判定する。
-
-    セグメント情報（ReportableSegmentsMember 等）を除外するために使用。
-    NonConsolidatedMember は連結/単体区分なので除外対象外。
-    """
-    if "Member" not in context_ref:
-        return False
-    if context_ref.endswith("_NonConsolidatedMember"):
-        return False
-    for part in context_ref.split("_")[1:]:
-        if "Member" in part and part != "NonConsolidatedMember":
-            return True
-    return False
+    return TagFilter(get_mapped_local_names(), _BS_ANCHOR_KEYWORDS)
 
 
 def _parse_numeric_value(value: str | None) -> int | None:
@@ -128,6 +89,199 @@ def _parse_consolidated_dei(value: str | None) -> bool:
     return v in ("true", "1", "yes", "有")
 
 
+# ---------------------------------------------------------------------------
+# マッピング決定表
+# ---------------------------------------------------------------------------
+
+# category → (period_type, 値変換, DEI の連結有無に従い連結のみとするか)
+# False のカテゴリは連結で見つからなければ個別からも取得する
+_CATEGORY_RULES: dict[str, tuple[str, Callable[[str | None], Any], bool]] = {
+    "pl": ("duration", _parse_numeric_value, True),
+    "bs": ("instant", _parse_numeric_value, True),
+    "cf": ("duration", _parse_numeric_value, True),
+    "dividend": ("duration", _parse_float_value, False),
+    "shares": ("instant", _parse_numeric_value, False),
+}
+
+_YEARS = ("current_year", "prior_year")
+
+# 有価証券報告書「主要な経営指標等の推移」の期数（当期 + 4期前まで）
+HISTORY_YEARS = 5
+
+
+class MappingPlan:
+    """
+    taxonomy_mapping を1回だけコンパイルした決定表。
+
+    by_local_name: ローカル名 → [(category, output key, priority)]
+        priority は同一 (category, key) 内での記載順（0 が最優先）
+    keys: category → output key のリスト（初出順 = 出力辞書のキー順）
+    key_count: 1期あたりのスロット数
+    mapping: 元のカテゴリ別 (tag, key) リスト（BS アンカー補完・DEI 抽出で参照）
+    tag_filter: _FactIndex が索引化するタグ（マッピング対象 + BS アンカー）
+    """
+
+    def __init__(self, mapping: dict[str, list[tuple[str, str]]]) -> None:
+        self.mapping = mapping
+        self.tag_filter = TagFilter(
+            frozenset(tag for entries in mapping.values() for tag, _ in entries),
+            _BS_ANCHOR_KEYWORDS,
+        )
+        self.by_local_name: dict[str, list[tuple[str, str, int]]] = {}
+        self.keys: dict[str, list[str]] = {}
+        for category in _CATEGORY_RULES:
+            priorities: dict[str, int] = {}
+            for tag, key in mapping.get(category, []):
+                priority = priorities.get(key, -1) + 1
+                priorities[key] = priority
+                self.by_local_name.setdefault(tag, []).append((category, key, priority))
+            self.keys[category] = list(priorities)
+        self.key_count = sum(len(keys) for keys in self.keys.values())
+
+    @classmethod
+    def load(cls, filename: str | Path = "taxonomy_mapping.yaml") -> "MappingPlan":
+        """taxonomy_mapping.yaml 形式のファイル（相対パスは config/ 基準）から構築する。"""
+        return cls(load_taxonomy_mapping(filename))
+
+    def project(self, keys: Iterable[str]) -> "MappingPlan":
+        """指定 output key のスロットのみを持つ決定表を返す（projection）。
+
+        DEI は常に含む。BS アンカー補完の判定に使う total_assets も常に含むため、
+        射影後も指定 key の値は全 key 解決時と一致する。tag_filter も対象タグのみに縮小される。
+        """
+        wanted = set(keys) | {_BS_ANCHOR_TRIGGER_KEY}
+        return MappingPlan({
+            category: [
+                (tag, key) for tag, key in entries if category == "dei" or key in wanted
+            ]
+            for category, entries in self.mapping.items()
+        })
+
+
+# FactNormalizer の既定の決定表（plan 未指定時）
+_MAPPING_PLAN = MappingPlan.load()
+# 既定の決定表の DEI タグ（DeiIndex のスキャン打ち切り判定用）
+DEI_TAGS: list[tuple[str, str]] = _MAPPING_PLAN.mapping["dei"]
+
+
+# ---------------------------------------------------------------------------
+# provenance（採用 fact の追跡）
+# ---------------------------------------------------------------------------
+
+def _fact_source(fact: Fact, priority: int | None) -> dict[str, Any]:
+    return {
+        "tag": fact.get("tag"),
+        "contextRef": fact.get("contextRef"),
+        "value": fact.get("value"),
+        "is_nil": fact.get("is_nil", False),
+        "priority": priority,
+    }
+
+
+def _trace_chosen(
+    trace: dict,
+    slot: tuple[str, str, str],
+    fact: Fact,
+    priority: int | None,
+    source: str,
+    **extra: Any,
+) -> None:
+    """採用 fact を記録する。既存の採用 fact は lower_priority として棄却候補へ移す。
+
+    source: "mapping"（taxonomy_mapping の優先順位）/ "bs_anchor"（BS アンカー補完）
+    記録は (fact, priority, ...) のタプルで保持し、辞書化は結果の組み立て時に行う。
+    """
+    record = trace.get(slot)
+    if record is None:
+        trace[slot] = [(fact, priority, source, extra), []]
+        return
+    previous = record[0]
+    if previous is not None:
+        record[1].append((previous[0], previous[1], "lower_priority"))
+    record[0] = (fact, priority, source, extra)
+
+
+def _trace_rejected(
+    trace: dict,
+    slot: tuple[str, str, str],
+    fact: Fact | None,
+    priority: int,
+    reason: str,
+) -> None:
+    """棄却候補を記録する。reason: "unparsable"（値が解析不能）/ "lower_priority"（優先度で劣後）"""
+    if fact is None:
+        return
+    record = trace.get(slot)
+    if record is None:
+        record = trace[slot] = [None, []]
+    record[1].append((fact, priority, reason))
+
+
+def _trace_entry(record: list) -> dict[str, Any]:
+    """trace の記録を {"chosen": ..., "rejected": [...]} に変換する。"""
+    chosen = record[0]
+    if chosen is not None:
+        fact, priority, source, extra = chosen
+        chosen = {**_fact_source(fact, priority), "source": source, **extra}
+    return {
+        "chosen": chosen,
+        "rejected": [
+            {**_fact_source(fact, priority), "reason": reason}
+            for fact, priority, reason in record[1]
+        ],
+    }
+
+
+# ---------------------------------------------------------------------------
+# 文書単位の fact 索引
+# ---------------------------------------------------------------------------
+
+class _FactIndex:
+    """
+    文書ごとに1回だけ構築する fact 索引。
+
+    ローカル名 → (period_type, 基準日, 連結フラグ) → 行番号リスト（文書順）。
+    基準日は instant が date、duration が end_date。
+    tag_filter（MappingPlan.tag_filter）対象外のタグ、セグメント dimension を持つ fact、context_map に無い fact は
+    構築時に除外する。
+    """
+
+    def __init__(
+        self,
+        facts: FactTable,
+        context_map: dict[str, dict[str, Any]],
+        tag_filter: TagFilter,
+    ) -> None:
+        self.facts = facts
+
+        def bucket_key(context_ref: str) -> tuple[str, str, bool] | None:
+            ctx = context_map.get(context_ref)
+            if ctx is None or ctx["has_segment_dimension"]:
+                return None
+            if ctx["type"] not in ("duration", "instant"):
+                return None
+            return ctx["type"], context_date(ctx), ctx["is_consolidated"]
+
+        self.buckets = facts.bucket_rows(bucket_key, tag_filter.accepts)
+
+    def choose(
+        self,
+        local_name: str,
+        period_type: str,
+        date: str | None,
+        *,
+        consolidated_only: bool,
+    ) -> Fact | None:
+        """文書順で最初の連結 fact を返す。無ければ（consolidated_only でなければ）最初の単体 fact。"""
+        buckets = self.buckets.get(local_name)
+        if not buckets or not date:
+            return None
+        rows = buckets.get((period_type, date, True))
+        if not rows and not consolidated_only:
+            rows = buckets.get((period_type, date, False))
+        return self.facts[rows[0]] if rows else None
+
+
 # ---------------------------------------------------------------------------
 # FactNormalizer 本体
 # ---------------------------------------------------------------------------
@@ -139,9 +293,31 @@ class FactNormalizer:
         self,
         parsed_data: dict[str, Any],
         context_map: dict[str, dict[str, Any]],
+        *,
+        provenance: bool = False,
+        plan: MappingPlan | None = None,
+        null_reasons: bool = False,
     ) -> None:
+        """
+        Args:
+            provenance: True の場合、出力キーごとの採用 fact・棄却候補を結果の "provenance" に記録する。
+            plan: 使用するマッピング決定表。未指定時は config/taxonomy_mapping.yaml。
+            null_reasons: True の場合、NULL 分類の判定材料（書類特性・期ごとのタグ有無と値の状態）を
+                結果の "null_evidence" に記録する（分類は FinancialMaster で行う）。
+        """
         self._parsed = parsed_data
-        self._context_map = context_map
+        self._plan = plan or _MAPPING_PLAN
+        self._provenance = provenance
+        # (期間ラベル, category, key) → [採用, [棄却候補]]。provenance 無効時は None
+        self._trace: dict[tuple[str, str, str], list] | None = None
+        self._null_classifier = get_null_classifier() if null_reasons else None
+        # 期末日 → NULL 分類の判定材料。null_reasons 無効時は None
+        self._null_evidence: dict[str | None, dict[str, dict[str, str]]] | None = None
+        self._null_traits: list[str] = []
+        # ContextResolver.build_context_map() 済みなら派生属性をそのまま使う
+        self._context_map = (
+            context_map if is_annotated(context_map) else annotate_context_map(context_map)
+        )
         self._current_year_end: str | None = None
         self._prior_year_end: str | None = None
         self._compute_year_ends()
@@ -152,9 +328,7 @@ class FactNormalizer:
 
     def _compute_year_ends(self) -> None:
         """context_map から当期・前期の基準日を算出する。"""
-        self._current_year_end, self._prior_year_end = _current_and_prior_year_ends(
-            self._context_map,
-        )
+        self._current_year_end, self._prior_year_end = resolve_year_ends(self._context_map)
         if self._current_year_end:
             logger.debug("current_year_end: %s", self._current_year_end)
         if self._prior_year_end:
@@ -164,300 +338,201 @@ class FactNormalizer:
     # fact ピッカー共通
     # ------------------------------------------------------------------
 
-    def _fact_context_info(self, context_ref: str) -> dict[str, Any]:
-        """contextRef から type / is_current_year / is_prior_year を返す。"""
-        ctx = self._context_map.get(context_ref, {})
-        ctx_type = ctx.get("type", "")
-        is_current = False
-        is_prior = False
-        if ctx_type == "duration":
-            end = ctx.get("end_date", "")
-            is_current = (end == self._current_year_end) if self._current_year_end else False
-            is_prior = (end == self._prior_year_end) if self._prior_year_end else False
-        elif ctx_type == "instant":
-            date = ctx.get("date", "")
-            is_current = (date == self._current_year_end) if self._current_year_end else False
-            is_prior = (date == self._prior_year_end) if self._prior_year_end else False
-        return {"type": ctx_type, "is_current_year": is_current, "is_prior_year": is_prior}
-
-    def _choose_fact(
-        self,
-        consolidated: list[dict[str, str]],
-        non_consolidated: list[dict[str, str]],
-        *,
-        consolidated_only: bool,
-    ) -> dict[str, str] | None:
-        """連結/単体候補から1つ選択する。consolidated_only 時は連結のみ。"""
-        if consolidated_only:
-            return consolidated[0] if consolidated else None
-        return consolidated[0] if consolidated else (
-            non_consolidated[0] if non_consolidated else None
-        )
-
-    # ------------------------------------------------------------------
-    # duration fact ピッカー
-    # ------------------------------------------------------------------
+    def _is_consolidated(self, context_ref: str) -> bool:
+        """contextRef が連結か。context_map に無い場合は contextRef の命名から判定する。"""
+        ctx = self._context_map.get(context_ref)
+        if ctx is None:
+            return _is_consolidated_context_id(context_ref)
+        return ctx["is_consolidated"]
 
-    def _pick_duration_facts(
+    def _pick_facts(
         self,
-        facts: list[dict[str, str]],
+        index: _FactIndex,
         tag_keywords: list[tuple[str, str]],
-        is_current: bool,
+        period_type: str,
+        target_date: str | None,
+        parse_value: Callable[[str | None], Any],
         *,
-        consolidated_only: bool = False,
-    ) -> dict[str, int | None]:
-        """duration 系 fact から PL/CF 用辞書を構築する。
+        consolidated_only: bool,
+        sources: dict[str, Fact] | None = None,
+    ) -> dict[str, Any]:
+        """period_type / target_date の fact から output key 辞書を構築する。
 
         同一 output key に複数 keyword がある場合、先頭マッチ優先。
-        consolidated_only=True で個別フォールバックを抑止し IFRS 値混入を防止。
         xsi:nil fact は None を返すが同一キーへの後続フォールバックを抑止する。
+        sources 指定時は解決した key の採用 fact を格納する。
         """
-        out: dict[str, int | None] = {}
+        out: dict[str, Any] = {}
         resolved: set[str] = set()
         for keyword, key in tag_keywords:
             if key in resolved:
                 continue
-            consolidated_candidates: list[dict[str, str]] = []
-            non_consolidated_candidates: list[dict[str, str]] = []
-            for f in facts:
-                if not _tag_matches(f.get("tag", ""), keyword):
-                    continue
-                ctx_ref = f.get("contextRef", "")
-                if _has_member_dimension(ctx_ref):
-                    continue
-                info = self._fact_context_info(ctx_ref)
-                if info["type"] != "duration":
-                    continue
-                if is_current and not info["is_current_year"]:
-                    continue
-                if not is_current and not info["is_prior_year"]:
-                    continue
-                if _is_consolidated_context(ctx_ref):
-                    consolidated_candidates.append(f)
-                else:
-                    non_consolidated_candidates.append(f)
-            chosen = self._choose_fact(
-                consolidated_candidates, non_consolidated_candidates,
-                consolidated_only=consolidated_only,
+            chosen = index.choose(
+                keyword, period_type, target_date, consolidated_only=consolidated_only,
             )
             if chosen is not None:
-                parsed = _parse_numeric_value(chosen.get("value"))
+                parsed = parse_value(chosen.get("value"))
                 out[key] = parsed
                 if parsed is not None or chosen.get("is_nil", False):
                     resolved.add(key)
+                    if sources is not None:
+                        sources[key] = chosen
             elif key not in out:
                 out[key] = None
         return out
 
-    def _pick_duration_facts_allow_non_consolidated(
-        self,
-        facts: list[dict[str, str]],
-        tag_keywords: list[tuple[str, str]],
-        is_current: bool,
-    ) -> dict[str, float | None]:
-        """配当等の個別ベース項目用。連結で見つからなければ個別からも取得する。値は float。"""
-        out: dict[str, float | None] = {}
-        resolved: set[str] = set()
-        for keyword, key in tag_keywords:
-            if key in resolved:
-                continue
-            consolidated_candidates: list[dict[str, str]] = []
-            non_consolidated_candidates: list[dict[str, str]] = []
-            for f in facts:
-                if not _tag_matches(f.get("tag", ""), keyword):
-                    continue
-                ctx_ref = f.get("contextRef", "")
-                if _has_member_dimension(ctx_ref):
-                    continue
-                info = self._fact_context_info(ctx_ref)
-                if info["type"] != "duration":
-                    continue
-                if is_current and not info["is_current_year"]:
-                    continue
-                if not is_current and not info["is_prior_year"]:
-                    continue
-                if _is_consolidated_context(ctx_ref):
-                    consolidated_candidates.append(f)
-                else:
-                    non_consolidated_candidates.append(f)
-            chosen = self._choose_fact(
-                consolidated_candidates, non_consolidated_candidates,
-                consolidated_only=False,
-            )
-            if chosen is not None:
-                parsed = _parse_float_value(chosen.get("value"))
-                out[key] = parsed
-                if parsed is not None or chosen.get("is_nil", False):
-                    resolved.add(key)
-            elif key not in out:
-                out[key] = None
-        return out
+    def _year_end(self, year: str) -> str | None:
+        return self._current_year_end if year == "current_year" else self._prior_year_end
 
     # ------------------------------------------------------------------
-    # instant fact ピッカー
+    # 決定表による一括解決
     # ------------------------------------------------------------------
 
-    def _pick_instant_facts(
+    def _resolve_plan(
         self,
-        facts: list[dict[str, str]],
-        tag_keywords: list[tuple[str, str]],
-        is_current: bool,
-        *,
-        consolidated_only: bool = False,
-    ) -> dict[str, int | None]:
-        """instant 系 fact から BS 用辞書を構築する。
+        index: _FactIndex,
+        plan: MappingPlan,
+        consolidated_only: bool,
+        targets: list[tuple[str, str | None]] | None = None,
+    ) -> dict[str, dict[str, dict[str, Any]]]:
+        """文書中のマッピング対象タグを1回走査し、全期間の全カテゴリを同時に埋める。
 
-        対象日付は current_year_end / prior_year_end。
-        xsi:nil fact は None を返すが同一キーへの後続フォールバックを抑止する。
-        """
-        target_date = self._current_year_end if is_current else self._prior_year_end
-        return self._pick_instant_facts_by_date(
-            facts, tag_keywords, target_date, consolidated_only=consolidated_only,
-        )
+        各スロット (year, category, key) は priority の最も小さい解決済み fact を採用する
+        （先頭マッチ優先）。値が解析できない fact は解決扱いにしないが、xsi:nil fact は
+        None で解決し後続 priority へのフォールバックを抑止する。
+        全スロットが priority 0 で解決した時点で走査を打ち切る。
 
-    def _pick_instant_facts_by_date(
-        self,
-        facts: list[dict[str, str]],
-        tag_keywords: list[tuple[str, str]],
-        target_date: str | None,
-        *,
-        consolidated_only: bool = False,
-    ) -> dict[str, int | None]:
-        """指定日付の instant fact を取得する共通実装。"""
-        out: dict[str, int | None] = {}
-        if not target_date:
-            for _, key in tag_keywords:
-                if key not in out:
-                    out[key] = None
-            return out
+        Args:
+            targets: [(期間ラベル, 基準日)]。未指定時は当期/前期。
 
-        resolved: set[str] = set()
-        for keyword, key in tag_keywords:
-            if key in resolved:
+        Returns:
+            {year: {category: {key: value}}}
+        """
+        if targets is None:
+            targets = [(year, self._year_end(year)) for year in _YEARS]
+        out = {
+            year: {category: dict.fromkeys(keys) for category, keys in plan.keys.items()}
+            for year, _ in targets
+        }
+        best: dict[tuple[str, str, str], int] = {}
+        unsettled = len(targets) * plan.key_count
+        trace = self._trace
+        for local_name in index.buckets:
+            entries = plan.by_local_name.get(local_name)
+            if not entries:
                 continue
-            consolidated_candidates: list[dict[str, str]] = []
-            non_consolidated_candidates: list[dict[str, str]] = []
-            for f in facts:
-                if not _tag_matches(f.get("tag", ""), keyword):
-                    continue
-                ctx_ref = f.get("contextRef", "")
-                if _has_member_dimension(ctx_ref):
-                    continue
-                ctx = self._context_map.get(ctx_ref, {})
-                if ctx.get("type") != "instant":
-                    continue
-                if ctx.get("date") != target_date:
-                    continue
-                if _is_consolidated_context(ctx_ref):
-                    consolidated_candidates.append(f)
-                else:
-                    non_consolidated_candidates.append(f)
-            chosen = self._choose_fact(
-                consolidated_candidates, non_consolidated_candidates,
-                consolidated_only=consolidated_only,
-            )
-            if chosen is not None:
-                parsed = _parse_numeric_value(chosen.get("value"))
-                out[key] = parsed
-                if parsed is not None or chosen.get("is_nil", False):
-                    resolved.add(key)
-            elif key not in out:
-                out[key] = None
+            for category, key, priority in entries:
+                period_type, parse_value, follows_dei = _CATEGORY_RULES[category]
+                for year, target_date in targets:
+                    slot = (year, category, key)
+                    if best.get(slot, priority + 1) <= priority:
+                        if trace is not None:
+                            _trace_rejected(trace, slot, index.choose(
+                                local_name, period_type, target_date,
+                                consolidated_only=consolidated_only and follows_dei,
+                            ), priority, "lower_priority")
+                        continue
+                    chosen = index.choose(
+                        local_name, period_type, target_date,
+                        consolidated_only=consolidated_only and follows_dei,
+                    )
+                    if chosen is None:
+                        continue
+                    parsed = parse_value(chosen.get("value"))
+                    if parsed is None and not chosen.get("is_nil", False):
+                        if trace is not None:
+                            _trace_rejected(trace, slot, chosen, priority, "unparsable")
+                        continue
+                    out[year][category][key] = parsed
+                    best[slot] = priority
+                    if trace is not None:
+                        _trace_chosen(trace, slot, chosen, priority, "mapping")
+                    if priority == 0:
+                        unsettled -= 1
+                        if unsettled == 0:
+                            return out
         return out
 
     # ------------------------------------------------------------------
-    # BS 抽出 + アンカー方式
+    # BS アンカー方式
     # ------------------------------------------------------------------
 
-    def _extract_bs(
+    def _apply_bs_anchor(
         self,
-        facts: list[dict[str, str]],
-        is_current: bool,
+        index: _FactIndex,
+        bs: dict[str, int | None],
+        year: str,
         *,
-        consolidated_only: bool = False,
-    ) -> dict[str, int | None]:
-        """BS 抽出。
+        consolidated_only: bool,
+    ) -> None:
+        """BS本表アンカー方式（bs を直接補完する）。
 
-        BS本表アンカー方式: duration 由来の target_date で total_assets が取れない場合、
+        duration 由来の target_date で total_assets が取れない場合、
         アンカータグ (TotalAssets 等) の実際の instant 日付を検出して再試行する。
         変則決算期や投資法人等で duration end_date と BS instant 日付がずれるケースに対応。
         """
-        out = self._pick_instant_facts(
-            facts, BS_TAGS, is_current=is_current, consolidated_only=consolidated_only,
-        )
-        if out.get("total_assets") is not None:
-            return out
+        if bs.get(_BS_ANCHOR_TRIGGER_KEY) is not None:
+            return
 
-        target_date = self._current_year_end if is_current else self._prior_year_end
-        anchor_date = self._find_bs_anchor_date(facts, target_date, consolidated_only)
+        target_date = self._year_end(year)
+        anchor_date = self._find_bs_anchor_date(index, target_date, consolidated_only)
         if anchor_date and anchor_date != target_date:
             logger.info(
                 "BS anchor fallback: target=%s -> anchor=%s (is_current=%s)",
-                target_date, anchor_date, is_current,
+                target_date, anchor_date, year == "current_year",
             )
-            fallback = self._pick_instant_facts_by_date(
-                facts, BS_TAGS, anchor_date, consolidated_only=consolidated_only,
+            trace = self._trace
+            sources: dict[str, Fact] | None = {} if trace is not None else None
+            fallback = self._pick_facts(
+                index, self._plan.mapping["bs"], "instant", anchor_date, _parse_numeric_value,
+                consolidated_only=consolidated_only, sources=sources,
             )
             for key, val in fallback.items():
-                if out.get(key) is None and val is not None:
-                    out[key] = val
-        return out
+                if bs.get(key) is None and val is not None:
+                    bs[key] = val
+                    if trace is not None:
+                        _trace_chosen(
+                            trace, (year, "bs", key), sources[key], None, "bs_anchor",
+                            anchor_date=anchor_date,
+                        )
 
     def _find_bs_anchor_date(
         self,
-        facts: list[dict[str, str]],
+        index: "_FactIndex",
         reference_date: str | None,
         consolidated_only: bool,
     ) -> str | None:
         """BS 本表の代表的タグが存在する instant 日付を検出する。
 
         reference_date と異なる日付が見つかった場合にフォールバック先として返す。
+        同数の日付は文書内で先に現れたものを優先する。
         """
-        date_counts: Counter[str] = Counter()
-        for f in facts:
-            local = _tag_local_name(f.get("tag", ""))
+        dated_rows: list[tuple[int, str]] = []
+        for local, buckets in index.buckets.items():
             if not any(kw in local for kw in _BS_ANCHOR_KEYWORDS):
                 continue
-            ctx_ref = f.get("contextRef", "")
-            if _has_member_dimension(ctx_ref):
-                continue
-            if consolidated_only and not _is_consolidated_context(ctx_ref):
-                continue
-            ctx = self._context_map.get(ctx_ref, {})
-            if ctx.get("type") != "instant":
-                continue
-            val = (f.get("value") or "").strip()
-            if not val or f.get("is_nil", False):
-                continue
-            date = ctx.get("date", "")
-            if date:
-                date_counts[date] += 1
+            for (period_type, date, is_consolidated), rows in buckets.items():
+                if period_type != "instant" or not date:
+                    continue
+                if consolidated_only and not is_consolidated:
+                    continue
+                for row in rows:
+                    f = index.facts[row]
+                    if not (f.get("value") or "").strip() or f.get("is_nil", False):
+                        continue
+                    dated_rows.append((row, date))
 
-        if not date_counts:
+        if not dated_rows:
             return None
+        dated_rows.sort()
+        date_counts: Counter[str] = Counter(date for _, date in dated_rows)
         return date_counts.most_common(1)[0][0]
 
-    # ------------------------------------------------------------------
-    # PL 抽出
-    # ------------------------------------------------------------------
-
-    def _extract_pl(
-        self,
-        facts: list[dict[str, str]],
-        is_current: bool,
-        *,
-        consolidated_only: bool = False,
-    ) -> dict[str, int | None]:
-        """PL 抽出。EPS は再計算可能なため抽出しない（valuation-engine で算出）。"""
-        return self._pick_duration_facts(
-            facts, PL_TAGS, is_current=is_current, consolidated_only=consolidated_only,
-        )
-
     # ------------------------------------------------------------------
     # DEI 抽出
     # ------------------------------------------------------------------
 
-    def _pick_dei(self, facts: list[dict[str, str]]) -> dict[str, Any]:
+    def _pick_dei(self, facts: FactTable) -> dict[str, Any]:
         """DEI タグから security_code, company_name 等のメタ情報を取得する。連結優先。"""
         result: dict[str, Any] = {
             "security_code": None,
@@ -466,13 +541,12 @@ class FactNormalizer:
             "is_consolidated": True,
             "fiscal_year_end": None,
         }
-        for keyword, key in DEI_TAGS:
-            consolidated_f: dict[str, str] | None = None
-            non_consolidated_f: dict[str, str] | None = None
-            for f in facts:
-                if not _tag_matches(f.get("tag", ""), keyword):
-                    continue
-                if _is_consolidated_context(f.get("contextRef", "")):
+        for keyword, key in self._plan.mapping["dei"]:
+            consolidated_f: Fact | None = None
+            non_consolidated_f: Fact | None = None
+            for row in facts.rows_with_local_name(keyword):
+                f = facts[row]
+                if self._is_consolidated(f.get("contextRef", "")):
                     consolidated_f = f
                     break
                 elif non_consolidated_f is None:
@@ -520,9 +594,8 @@ class FactNormalizer:
         """書類種別を判定する。現状は有価証券報告書のみ対応。"""
         return "annual"
 
-    def _build_period(self, is_current: bool) -> dict[str, str] | None:
+    def _build_period(self, target_end: str | None) -> dict[str, str] | None:
         """duration context から period (start/end) を構築する。"""
-        target_end = self._current_year_end if is_current else self._prior_year_end
         if not target_end:
             return None
         for ctx in self._context_map.values():
@@ -536,42 +609,118 @@ class FactNormalizer:
     # メインエントリーポイント
     # ------------------------------------------------------------------
 
+    def extract_dei(self) -> dict[str, Any]:
+        """DEI 情報（security_code / company_name / accounting_standard / is_consolidated /
+        fiscal_year_end）のみを返す。XBRLParser.scan_dei() の結果に対して使用する。
+        """
+        return self._pick_dei(ensure_fact_table(self._parsed.get("facts")))
+
     def normalize(self) -> dict[str, Any]:
         """正規化結果を返す。
 
         current_year / prior_year それぞれに pl, bs, cf, dividend, period を持つ構造。
         """
-        facts = self._parsed.get("facts") or []
+        self._trace = {} if self._provenance else None
+        facts = ensure_fact_table(self._parsed.get("facts"))
+        dei = self._pick_dei(facts)
+        index = _FactIndex(facts, self._context_map, self._plan.tag_filter)
+        slots = self._resolve_plan(index, self._plan, dei["is_consolidated"])
+        self._collect_null_evidence(facts, (self._current_year_end, self._prior_year_end))
+        return self._build_result(dei, slots, index)
+
+    def normalize_periods(self, max_years: int = HISTORY_YEARS) -> list[dict[str, Any]]:
+        """当期から max_years 期分の正規化結果を、決算期ごとに新しい順で返す。
+
+        先頭は normalize() と同一。以降は1期前・2期前…を current_year、その前期を
+        prior_year とした結果で、fiscal_year_end はその期の期末日、source は "history" になる
+        （出力時は当該期の有価証券報告書由来の出力より優先度が低い）。
+        前期より古い期は「主要な経営指標等の推移」（Prior2〜Prior4 context）のみが情報源のため、
+        多くの項目は None となる。期末日を特定できない期以降は出力しない。
+        全期間のスロットは1回の走査で解決する。
+        """
+        self._trace = {} if self._provenance else None
+        facts = ensure_fact_table(self._parsed.get("facts"))
         dei = self._pick_dei(facts)
+        index = _FactIndex(facts, self._context_map, self._plan.tag_filter)
+        ends = resolve_period_ends(self._context_map, max(max_years, len(_YEARS)) + 1)
+        labels = list(_YEARS) + [f"prior{k}_year" for k in range(len(_YEARS), len(ends))]
+        targets = list(zip(labels, ends))
+        slots = self._resolve_plan(index, self._plan, dei["is_consolidated"], targets)
+        self._collect_null_evidence(facts, ends)
+
+        results = [self._build_result(dei, {year: slots[year] for year in _YEARS}, index)]
+        for k in range(1, max_years):
+            if ends[k] is None:
+                break
+            period_dei = {**dei, "fiscal_year_end": ends[k]}
+            period_slots = {
+                "current_year": slots[labels[k]],
+                "prior_year": slots[labels[k + 1]],
+            }
+            results.append({
+                **self._assemble_result(
+                    period_dei, period_slots, ends[k], ends[k + 1], (labels[k], labels[k + 1]),
+                ),
+                "source": "history",
+            })
+        return results
+
+    def _collect_null_evidence(self, facts: FactTable, ends: Iterable[str | None]) -> None:
+        """null_reasons 有効時、対象期の NULL 分類の判定材料を1回の走査で収集する。"""
+        if self._null_classifier is None:
+            return
+        self._null_traits = self._null_classifier.document_traits(facts)
+        self._null_evidence = self._null_classifier.collect_evidence(
+            facts, self._context_map, ends,
+        )
+
+    def _build_result(
+        self,
+        dei: dict[str, Any],
+        slots: dict[str, dict[str, dict[str, Any]]],
+        index: _FactIndex | None = None,
+    ) -> dict[str, Any]:
+        """解決済みスロットに BS アンカー補完を適用し、正規化結果を組み立てる。
 
+        index 省略時は BS アンカー補完が必要な場合のみ構築する（BatchNormalizer 用）。
+        """
         consol_only = dei["is_consolidated"]
+        for year in _YEARS:
+            if slots[year]["bs"].get(_BS_ANCHOR_TRIGGER_KEY) is not None:
+                continue
+            if index is None:
+                facts = ensure_fact_table(self._parsed.get("facts"))
+                index = _FactIndex(facts, self._context_map, self._plan.tag_filter)
+            self._apply_bs_anchor(index, slots[year]["bs"], year, consolidated_only=consol_only)
+        return self._assemble_result(dei, slots, self._current_year_end, self._prior_year_end)
 
-        current_pl = self._extract_pl(facts, is_current=True, consolidated_only=consol_only)
-        prior_pl = self._extract_pl(facts, is_current=False, consolidated_only=consol_only)
-        current_bs = self._extract_bs(facts, is_current=True, consolidated_only=consol_only)
-        prior_bs = self._extract_bs(facts, is_current=False, consolidated_only=consol_only)
-        current_cf = self._pick_duration_facts(
-            facts, CF_TAGS, is_current=True, consolidated_only=consol_only,
-        )
-        prior_cf = self._pick_duration_facts(
-            facts, CF_TAGS, is_current=False, consolidated_only=consol_only,
-        )
-        current_dividend = self._pick_duration_facts_allow_non_consolidated(
-            facts, DIVIDEND_TAGS, is_current=True,
-        )
-        prior_dividend = self._pick_duration_facts_allow_non_consolidated(
-            facts, DIVIDEND_TAGS, is_current=False,
-        )
-        current_shares = self._pick_instant_facts(facts, SHARES_TAGS, is_current=True)
-        prior_shares = self._pick_instant_facts(facts, SHARES_TAGS, is_current=False)
-        current_period = self._build_period(is_current=True)
-        prior_period = self._build_period(is_current=False)
+    def _assemble_result(
+        self,
+        dei: dict[str, Any],
+        slots: dict[str, dict[str, dict[str, Any]]],
+        current_end: str | None,
+        prior_end: str | None,
+        labels: tuple[str, str] = _YEARS,
+    ) -> dict[str, Any]:
+        """current_year / prior_year のスロットから正規化結果の辞書を組み立てる。
+
+        labels はスロット解決時の期間ラベル（provenance の参照に使用）。
+        """
+        current_period = self._build_period(current_end)
+        prior_period = self._build_period(prior_end)
 
         report_type = self._detect_report_type()
         consolidation_type = "consolidated" if dei["is_consolidated"] else "non_consolidated"
 
-        current_bs.update(current_shares)
-        prior_bs.update(prior_shares)
+        years: dict[str, dict[str, Any]] = {}
+        for year in _YEARS:
+            year_slots = slots[year]
+            years[year] = {
+                "pl": dict(year_slots["pl"]),
+                "bs": {**year_slots["bs"], **year_slots["shares"]},
+                "cf": dict(year_slots["cf"]),
+                "dividend": dict(year_slots["dividend"]),
+            }
 
         result: dict[str, Any] = {
             "doc_id": self._parsed.get("doc_id", ""),
@@ -582,18 +731,8 @@ class FactNormalizer:
             "consolidation_type": consolidation_type,
             "fiscal_year_end": dei["fiscal_year_end"],
             "report_type": report_type,
-            "current_year": {
-                "pl": current_pl,
-                "bs": current_bs,
-                "cf": current_cf,
-                "dividend": current_dividend,
-            },
-            "prior_year": {
-                "pl": prior_pl,
-                "bs": prior_bs,
-                "cf": prior_cf,
-                "dividend": prior_dividend,
-            },
+            "current_year": years["current_year"],
+            "prior_year": years["prior_year"],
         }
 
         if current_period:
@@ -601,4 +740,26 @@ class FactNormalizer:
         if prior_period:
             result["prior_year"]["period"] = prior_period
 
+        if self._trace is not None:
+            result["provenance"] = {
+                year: self._provenance_block(label) for year, label in zip(_YEARS, labels)
+            }
+
+        if self._null_evidence is not None:
+            result["null_evidence"] = {
+                "traits": list(self._null_traits),
+                "current_year": self._null_evidence.get(current_end, {}),
+                "prior_year": self._null_evidence.get(prior_end, {}),
+            }
+
         return result
+
+    def _provenance_block(self, label: str) -> dict[str, dict[str, Any]]:
+        """期間ラベルの provenance を出力と同じ pl / bs（株式数を含む）/ cf / dividend 構造で返す。"""
+        block: dict[str, dict[str, Any]] = {"pl": {}, "bs": {}, "cf": {}, "dividend": {}}
+        for (year, category, key), record in self._trace.items():
+            if year != label:
+                continue
+            target = "bs" if category == "shares" else category
+            block[target][key] = _trace_entry(record)
+        return block
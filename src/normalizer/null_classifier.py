@@ -0,0 +1,245 @@
+"""
+NullClassifier
+出力 fact_key の NULL を4分類（経済実態 / 会計基準差 / 空値 / 取得失敗）する。
+
+分類ルールは config/null_classification.yaml から読み込む（様式・業種・会計基準の分岐をコードに持たない）。
+FactNormalizer が文書の fact 索引から期ごとの判定材料（null_evidence）を1回の走査で収集し、
+FinancialMaster が NULL となった fact_key に分類を付与する。
+
+tag_hints は分類専用の部分一致パターンで、値の抽出には使用しない（値の照合は完全一致のみ）。
+"""
+import logging
+from collections.abc import Iterable
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+try:
+    from src.config_loader import get_accounting_standard_mapping, load_null_classification
+    from src.parser.context_resolver import context_date
+    from src.parser.fact_table import FactTable
+    from src.parser.xbrl_parser import TagFilter
+except ModuleNotFoundError:
+    from config_loader import get_accounting_standard_mapping, load_null_classification
+    from parser.context_resolver import context_date
+    from parser.fact_table import FactTable
+    from parser.xbrl_parser import TagFilter
+
+logger = logging.getLogger(__name__)
+
+NULL_CATEGORIES = ("economic", "accounting_standard", "nil", "extraction_failure")
+
+# 判定材料の状態（値ありが空値に優先する）
+_NIL = "nil"
+_VALUE = "value"
+
+_REASON_NIL = "当期タグあり (xsi:nil/空値)"
+_REASON_FAILURE = "当期コンテキストに値ありタグが存在"
+_REASON_CONSOLIDATED_NIL = "当期連結コンテキストにタグあり (xsi:nil/空値)"
+_REASON_CONSOLIDATED_FAILURE = "当期連結コンテキストに値ありタグが存在"
+_REASON_NON_CONSOLIDATED_ONLY = "連結BSに該当タグなし (個別BSのみ存在)"
+_REASON_NO_TAG = "raw XBRLに該当タグなし"
+
+
+class NullClassifier:
+    """null_classification.yaml の分類ルール。"""
+
+    def __init__(self, filename: str | Path = "null_classification.yaml") -> None:
+        config = load_null_classification(filename)
+        self.categories: dict[str, str] = dict(config.get("categories") or {})
+        self.tag_hints: dict[str, tuple[str, ...]] = {
+            key: tuple(patterns) for key, patterns in (config.get("tag_hints") or {}).items()
+            if patterns
+        }
+        self.traits: dict[str, tuple[tuple[str, ...], int]] = {
+            name: (tuple(spec.get("keywords") or ()), int(spec.get("min_matches", 1)))
+            for name, spec in (config.get("document_traits") or {}).items()
+        }
+        self.standard_rules: dict[str, list[dict[str, Any]]] = dict(
+            config.get("accounting_standard_rules") or {},
+        )
+        self.consolidated_keys = frozenset(config.get("consolidated_keys") or ())
+        self.complementary_keys: dict[str, dict[str, Any]] = dict(
+            config.get("complementary_keys") or {},
+        )
+        # ローカル名 → 一致する fact_key（タグ種類数分だけ計算する）
+        self._keys_by_local: dict[str, tuple[str, ...]] = {}
+
+    @property
+    def keywords(self) -> tuple[str, ...]:
+        """判定に使う全パターン（tag_hints と document_traits のキーワード）。"""
+        keywords: dict[str, None] = {}
+        for patterns in self.tag_hints.values():
+            keywords.update(dict.fromkeys(patterns))
+        for trait_keywords, _ in self.traits.values():
+            keywords.update(dict.fromkeys(trait_keywords))
+        return tuple(keywords)
+
+    def extend_filter(self, tag_filter: TagFilter) -> TagFilter:
+        """パース用フィルタに判定用パターンを追加する（normalizer 出力は変わらない）。"""
+        keywords = tag_filter.keywords + tuple(
+            k for k in self.keywords if k not in tag_filter.keywords
+        )
+        return TagFilter(tag_filter.local_names, keywords)
+
+    # ------------------------------------------------------------------
+    # 判定材料の収集（FactNormalizer）
+    # ------------------------------------------------------------------
+
+    def _keys_for(self, local_name: str) -> tuple[str, ...]:
+        keys = self._keys_by_local.get(local_name)
+        if keys is None:
+            keys = self._keys_by_local[local_name] = tuple(
+                key for key, patterns in self.tag_hints.items()
+                if any(p in local_name for p in patterns)
+            )
+        return keys
+
+    def document_traits(self, facts: FactTable) -> list[str]:
+        """書類に付与される document_traits の名前を返す。"""
+        local_names = set(facts.tag_local_names())
+        result: list[str] = []
+        for name, (keywords, min_matches) in self.traits.items():
+            matched = sum(1 for kw in keywords if any(kw in local for local in local_names))
+            if matched >= min_matches:
+                result.append(name)
+        return result
+
+    def collect_evidence(
+        self,
+        facts: FactTable,
+        context_map: dict[str, dict[str, Any]],
+        dates: Iterable[str | None],
+    ) -> dict[str | None, dict[str, dict[str, str]]]:
+        """
+        期末日ごとに tag_hints の一致タグの有無・値の状態を1回の走査で収集する。
+
+        Args:
+            context_map: 注釈済み context_map（is_consolidated を参照する）
+            dates: 対象期の期末日（instant は date、duration は end_date と比較）。None は全日付を対象とする
+
+        Returns:
+            {期末日: {fact_key: {"any": "value"|"nil",
+                                 "consolidated": "value"|"nil",
+                                 "non_consolidated": "value"|"nil"}}}
+            一致タグが無い fact_key・context 区分は含まない。
+        """
+        def bucket_key(context_ref: str) -> tuple[str, bool] | None:
+            ctx = context_map.get(context_ref)
+            if ctx is None or ctx.get("type") not in ("duration", "instant"):
+                return None
+            return context_date(ctx), ctx["is_consolidated"]
+
+        buckets = facts.bucket_rows(bucket_key, lambda local: bool(self._keys_for(local)))
+        values = facts.values
+        evidence: dict[str | None, dict[str, dict[str, str]]] = {}
+        for target in dict.fromkeys(dates):
+            states: dict[str, dict[str, str]] = {}
+            for local, by_key in buckets.items():
+                keys = self._keys_for(local)
+                for (date, consolidated), rows in by_key.items():
+                    if target and date != target:
+                        continue
+                    state = _VALUE if any(
+                        (values[row] or "").strip() and not facts.is_nil(row) for row in rows
+                    ) else _NIL
+                    scope = "consolidated" if consolidated else "non_consolidated"
+                    for key in keys:
+                        entry = states.setdefault(key, {})
+                        for field in ("any", scope):
+                            if entry.get(field) != _VALUE:
+                                entry[field] = state
+            evidence[target] = states
+        return evidence
+
+    # ------------------------------------------------------------------
+    # 分類（FinancialMaster）
+    # ------------------------------------------------------------------
+
+    def _standard_reason(
+        self, key: str, standard: str | None, traits: set[str],
+    ) -> str | None:
+        for rule in self.standard_rules.get(key) or ():
+            standards = rule.get("accounting_standards")
+            if standards and standard not in standards:
+                continue
+            required = rule.get("traits")
+            if required and not set(required) <= traits:
+                continue
+            return rule.get("reason", "")
+        return None
+
+    def classify(
+        self,
+        metrics: dict[str, Any],
+        evidence: dict[str, dict[str, str]],
+        *,
+        traits: Iterable[str] = (),
+        accounting_standard: str | None = None,
+        consolidation_type: str | None = None,
+    ) -> dict[str, dict[str, str]]:
+        """
+        metrics の NULL を分類する。
+
+        Args:
+            evidence: collect_evidence() の当該期の結果
+
+        Returns:
+            {fact_key: {"category": 分類ID, "reason": 理由}}（NULL の fact_key のみ）
+        """
+        standard = (
+            get_accounting_standard_mapping().get(accounting_standard, accounting_standard)
+            if accounting_standard else None
+        )
+        trait_set = set(traits)
+        result: dict[str, dict[str, str]] = {}
+        for key, value in metrics.items():
+            if value is not None:
+                continue
+            category, reason = self._classify_key(
+                key, metrics, evidence.get(key) or {}, standard, trait_set,
+                consolidation_type == "consolidated",
+            )
+            result[key] = {"category": category, "reason": reason}
+        return result
+
+    def _classify_key(
+        self,
+        key: str,
+        metrics: dict[str, Any],
+        entry: dict[str, str],
+        standard: str | None,
+        traits: set[str],
+        consolidated_document: bool,
+    ) -> tuple[str, str]:
+        reason = self._standard_reason(key, standard, traits)
+        if reason is not None:
+            return "accounting_standard", reason
+
+        if key in self.tag_hints:
+            if consolidated_document and key in self.consolidated_keys:
+                state = entry.get("consolidated")
+                if state == _NIL:
+                    return "nil", _REASON_CONSOLIDATED_NIL
+                if state == _VALUE:
+                    return "extraction_failure", _REASON_CONSOLIDATED_FAILURE
+                if entry.get("non_consolidated"):
+                    return "economic", _REASON_NON_CONSOLIDATED_ONLY
+            else:
+                state = entry.get("any")
+                if state == _NIL:
+                    return "nil", _REASON_NIL
+                if state == _VALUE:
+                    return "extraction_failure", _REASON_FAILURE
+
+        complement = self.complementary_keys.get(key)
+        if complement and any(metrics.get(k) is not None for k in complement.get("keys") or ()):
+            return "economic", complement.get("reason", "")
+
+        return "economic", _REASON_NO_TAG
+
+
+@lru_cache(maxsize=1)
+def get_null_classifier() -> NullClassifier:
+    """config/null_classification.yaml の NullClassifier を返す。"""
+    return NullClassifier()
@@ -0,0 +1,224 @@
+"""
+CompanyIndex
+銘柄ごとの出力履歴インデックス（{DATASET_PATH}/metadata/company_index.json）。
+
+security_code → [{data_version, doc_id, report_type, path, content_hash}] を保持し、
+銘柄の過年度履歴を決算期ディレクトリの走査や存在確認なしに、1回の索引参照と N 回の直接読み込みで取得できるようにする。
+
+    {
+      "schema_version": "1.0",
+      "engine_version": "...",
+      "generated_at": "...",
+      "companies": {
+        "7203": [
+          {"report_type": "annual", "data_version": "2025FY", "doc_id": "S100...",
+           "path": "annual/2025FY/7203.json", "content_hash": "..."},
+          ...
+        ]
+      }
+    }
+
+entries は report_type ごとに data_version の降順。path は DATASET_PATH からの相対パス、
+content_hash は generated_at を除いた内容の SHA-256（dataset_io.payload_hash）。
+JSONExporter が出力に合わせて差分更新し、manifest 等と併せて JSONExporter.flush() で1回だけ保存する
+（export ごとにはインデックス全体を保存し直さない）。インデックスが無い・不正な場合は全銘柄別ファイルから再構築する。
+"""
+import logging
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+_project_root = Path(__file__).resolve().parent.parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+from src import __version__
+try:
+    from src.output.dataset_io import payload_hash, write_json_if_changed
+    from src.output.dataset_lock import DatasetLock
+    from src.output.serializer import DATASET_SUFFIXES, CompactSerializer, dataset_stem, read_dataset_json
+except ModuleNotFoundError:
+    from output.dataset_io import payload_hash, write_json_if_changed
+    from output.dataset_lock import DatasetLock
+    from output.serializer import DATASET_SUFFIXES, CompactSerializer, dataset_stem, read_dataset_json
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = "1.0"
+COMPANY_INDEX_PATH = Path("metadata") / "company_index.json"
+REPORT_TYPES = ("annual", "quarterly")
+# manifest と同じく無効な決算期は含めない
+EXCLUDED_PERIOD_NAMES = frozenset({"UNKNOWN"})
+
+# 約4,000社 × 数十期の索引のため空白なし JSON で保存する
+_SERIALIZER = CompactSerializer()
+
+
+class CompanyIndex:
+    """銘柄ごとの出力履歴インデックス。"""
+
+    def __init__(self, base_dir: str | Path | None = None) -> None:
+        if base_dir is None:
+            base_dir = os.environ.get("DATASET_PATH")
+            if not base_dir:
+                raise EnvironmentError("DATASET_PATH 環境変数が設定されていません。")
+        self.base_dir = Path(base_dir)
+        self._companies: dict[str, list[dict[str, str]]] | None = None
+        self.dirty = False
+
+    @property
+    def path(self) -> Path:
+        return self.base_dir / COMPANY_INDEX_PATH
+
+    # ------------------------------------------------------------------
+    # 参照
+    # ------------------------------------------------------------------
+
+    def history(self, security_code: str, report_type: str | None = "annual") -> list[dict[str, str]]:
+        """
+        銘柄の出力履歴を返す（data_version の降順）。
+
+        Args:
+            report_type: "annual" / "quarterly"。None の場合は両方
+        """
+        entries = self._state().get(security_code) or []
+        return [dict(e) for e in entries if report_type is None or e["report_type"] == report_type]
+
+    def security_codes(self) -> list[str]:
+        return sorted(self._state())
+
+    def load_history(
+        self,
+        security_code: str,
+        report_type: str | None = "annual",
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        銘柄の出力ファイルを新しい決算期から最大 limit 件読み込む（索引参照1回 + 直接読み込み）。
+        """
+        entries = self.history(security_code, report_type)[:limit]
+        return [read_dataset_json(self.base_dir / entry["path"]) for entry in entries]
+
+    # ------------------------------------------------------------------
+    # 更新（JSONExporter）
+    # ------------------------------------------------------------------
+
+    def load(self) -> None:
+        """インデックスを未読込なら読み込む（無い・不正な場合は全件スキャンで再構築する）。"""
+        self._state()
+
+    def reset(self) -> None:
+        """読み込み済みのインデックスを破棄する（次の参照時に保存済みのものを読み直す）。"""
+        self._companies = None
+        self.dirty = False
+
+    def _state(self) -> dict[str, list[dict[str, str]]]:
+        if self._companies is None:
+            self._companies = self._read()
+            if self._companies is None:
+                logger.info("Company index not found or invalid, rebuilding: %s", self.base_dir)
+                self._companies = self._scan()
+                self.dirty = True
+        return self._companies
+
+    def _read(self) -> dict[str, list[dict[str, str]]] | None:
+        try:
+            index = read_dataset_json(self.path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Failed to read company index: %s (%s)", self.path, e)
+            return None
+        if not isinstance(index, dict) or index.get("schema_version") != SCHEMA_VERSION:
+            return None
+        companies = index.get("companies")
+        return companies if isinstance(companies, dict) else None
+
+    def _scan(self) -> dict[str, list[dict[str, str]]]:
+        """全銘柄別ファイルを読み込んでインデックスを生成する。"""
+        self._companies = {}
+        for report_type in REPORT_TYPES:
+            category_dir = self.base_dir / report_type
+            if not category_dir.is_dir():
+                continue
+            with os.scandir(category_dir) as periods:
+                period_dirs = [p for p in periods if p.is_dir() and p.name not in EXCLUDED_PERIOD_NAMES]
+            for period_dir in period_dirs:
+                with os.scandir(period_dir.path) as entries:
+                    files = [e for e in entries if e.name.endswith(DATASET_SUFFIXES) and e.is_file()]
+                for entry in files:
+                    try:
+                        data = read_dataset_json(entry.path)
+                    except (OSError, ValueError) as e:
+                        logger.warning("Failed to read dataset file: %s (%s)", entry.path, e)
+                        continue
+                    self.update(
+                        data.get("security_code") or dataset_stem(entry.name),
+                        report_type, period_dir.name, data.get("doc_id") or "",
+                        Path(entry.path), payload_hash(data),
+                    )
+        return self._companies
+
+    def update(
+        self,
+        security_code: str,
+        report_type: str,
+        data_version: str,
+        doc_id: str,
+        path: Path,
+        content_hash: str,
+    ) -> None:
+        """出力1件のエントリを追加・差し替える（内容が同一なら変更なし）。"""
+        if data_version in EXCLUDED_PERIOD_NAMES:
+            return
+        entry = {
+            "report_type": report_type,
+            "data_version": data_version,
+            "doc_id": doc_id,
+            "path": path.relative_to(self.base_dir).as_posix(),
+            "content_hash": content_hash,
+        }
+        entries = self._state().setdefault(security_code, [])
+        for i, existing in enumerate(entries):
+            if existing["report_type"] == report_type and existing["data_version"] == data_version:
+                if existing != entry:
+                    entries[i] = entry
+                    self.dirty = True
+                return
+        entries.append(entry)
+        entries.sort(key=lambda e: e["data_version"], reverse=True)
+        entries.sort(key=lambda e: REPORT_TYPES.index(e["report_type"]))
+        self.dirty = True
+
+    def flush(self) -> str | None:
+        """
+        変更があればインデックスを保存する。
+
+        Returns:
+            保存されたファイルのパス。変更が無ければ None。
+        """
+        if not self.dirty:
+            return None
+        companies = self._state()
+        index = {
+            "schema_version": SCHEMA_VERSION,
+            "engine_version": __version__,
+            "generated_at": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "companies": {code: companies[code] for code in sorted(companies)},
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if write_json_if_changed(self.path, index, _SERIALIZER):
+            logger.info("Company index saved to: %s (%d companies)", self.path, len(companies))
+        else:
+            logger.info("Company index unchanged: %s", self.path)
+        self.dirty = False
+        return str(self.path)
+
+    def rebuild(self) -> str:
+        """全銘柄別ファイルからインデックスを再生成して保存する（修復用）。"""
+        with DatasetLock(self.base_dir).metadata():
+            self._companies = self._scan()
+            self.dirty = True
+            return self.flush()
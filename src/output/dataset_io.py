@@ -0,0 +1,182 @@
+"""
+financial-dataset のファイル書き込み。
+
+出力 JSON は内容（generated_at を除くペイロード）のハッシュが既存ファイルと一致すれば書き込まない。
+再実行で変更の無いファイルが差分にならないため、financial-dataset への push は実際の変更分のみになる。
+
+書き込みは同じディレクトリの一時ファイルに書いてから rename で置き換える（読み手が書きかけを読まない）。
+一時ファイル名は .json / .json.gz で終わらないため、manifest の集計対象にならない。
+置き換え後のパーミッションは既存ファイルと同じ（新規は open() と同じく 0o666 & ~umask）。
+
+既存ファイルと内容が異なる場合に書き込むかどうかは supersedes で判定できる（複数文書が同じ出力先を持つ場合の優先順位）。
+"""
+import hashlib
+import json
+import logging
+import os
+import stat
+import tempfile
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any
+
+try:
+    from src.output.serializer import DatasetSerializer, read_dataset_json
+except ModuleNotFoundError:
+    from output.serializer import DatasetSerializer, read_dataset_json
+
+logger = logging.getLogger(__name__)
+
+# ハッシュ対象から除外するキー（生成時刻は内容に含めない）
+VOLATILE_KEYS = frozenset({"generated_at"})
+TEMP_SUFFIX = ".tmp"
+
+_PRETTY = DatasetSerializer()
+
+
+def _current_umask() -> int:
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# mkstemp は 0600 で作成するため、新規ファイルは open() と同じパーミッションに揃える
+_NEW_FILE_MODE = 0o666 & ~_current_umask()
+
+
+def payload_hash(data: Any) -> str:
+    """generated_at を除いた内容の SHA-256（キー順・インデントに依存しない）。"""
+    if isinstance(data, dict):
+        data = {k: v for k, v in data.items() if k not in VOLATILE_KEYS}
+    encoded = json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def read_payload_hash(path: str | Path) -> str | None:
+    """既存ファイル（gzip 含む）の payload_hash。存在しない・読み込めない場合は None。"""
+    existing = _read_existing(path)
+    return None if existing is None else payload_hash(existing)
+
+
+def _read_existing(path: str | Path) -> Any:
+    """既存ファイル（gzip 含む）の内容。存在しない・読み込めない場合は None。"""
+    try:
+        return read_dataset_json(path)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning("Failed to read existing dataset file: %s (%s)", path, e)
+        return None
+
+
+@contextmanager
+def atomic_writer(path: str | Path, mode: str = "w") -> Iterator[IO]:
+    """
+    path を置き換える一時ファイルを開く。with ブロックが正常終了した時のみ rename で置き換える。
+
+    mode: "w"（テキスト, UTF-8）または "wb"（バイナリ）
+    """
+    path = Path(path)
+    fd, temp_path = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=TEMP_SUFFIX,
+    )
+    try:
+        with os.fdopen(fd, mode, encoding=None if "b" in mode else "utf-8") as f:
+            yield f
+        os.chmod(temp_path, _target_mode(path))
+        os.replace(temp_path, path)
+    except BaseException:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+
+
+def _target_mode(path: Path) -> int:
+    """置き換え後のパーミッション（既存ファイルがあればそのモード）。"""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return _NEW_FILE_MODE
+
+
+def write_json_atomic(path: str | Path, data: Any) -> None:
+    """一時ファイルに書き出してから rename で置き換える。"""
+    with atomic_writer(path) as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def write_json_if_changed(
+    path: str | Path,
+    data: Any,
+    serializer: DatasetSerializer | None = None,
+) -> bool:
+    """
+    内容が既存ファイルと異なる場合のみ書き込む。
+
+    Args:
+        serializer: エンコード形式（serializer.py）。None は pretty（indent=2 の JSON）
+
+    Returns:
+        書き込んだ場合 True、内容が同一でスキップした場合 False。
+    """
+    return write_dataset_file(path, data, serializer).written
+
+
+class WriteResult:
+    """
+    write_dataset_file() の結果。size / sha256 は書き込んだファイルのバイト列（書き込まなかった場合は None）。
+
+    kept: 既存ファイルが優先されて書き込まなかった（content_hash は既存ファイルの内容ハッシュ）
+    """
+
+    __slots__ = ("written", "content_hash", "size", "sha256", "kept")
+
+    def __init__(
+        self,
+        written: bool,
+        content_hash: str,
+        raw: bytes | None = None,
+        *,
+        kept: bool = False,
+    ) -> None:
+        self.written = written
+        self.content_hash = content_hash
+        self.kept = kept
+        self.size = len(raw) if raw is not None else None
+        self.sha256 = hashlib.sha256(raw).hexdigest() if raw is not None else None
+
+
+def write_dataset_file(
+    path: str | Path,
+    data: Any,
+    serializer: DatasetSerializer | None = None,
+    *,
+    supersedes: Callable[[Any], bool] | None = None,
+) -> WriteResult:
+    """
+    write_json_if_changed() と同じ。内容ハッシュと書き込んだバイト列のサイズ・SHA-256 も返す。
+
+    Args:
+        supersedes: 内容が異なる既存ファイルの内容を受け取り、上書きする場合 True を返す。None は常に上書き
+    """
+    serializer = serializer or _PRETTY
+    payload = serializer.prepare(data)
+    content_hash = payload_hash(payload)
+    existing = _read_existing(path)
+    if existing is not None:
+        existing_hash = payload_hash(existing)
+        if existing_hash == content_hash:
+            return WriteResult(False, content_hash)
+        if supersedes is not None and not supersedes(existing):
+            return WriteResult(False, existing_hash, kept=True)
+    raw = serializer.dumps(payload)
+    with atomic_writer(path, "wb") as f:
+        f.write(raw)
+    return WriteResult(True, content_hash, raw)
+
+
+def file_digest(path: str | Path) -> tuple[int, str]:
+    """ファイルの (サイズ, バイト列の SHA-256)。"""
+    with open(path, "rb") as f:
+        raw = f.read()
+    return len(raw), hashlib.sha256(raw).hexdigest()
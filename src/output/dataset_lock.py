@@ -0,0 +1,138 @@
+"""
+DatasetLock
+financial-dataset に複数プロセスが同時に出力する場合の排他ロック。
+
+ロックファイルは {DATASET_PATH}/metadata/.locks/ に置く（OS のアドバイザリロック。プロセス終了時に自動解放）。
+
+| ロック | 対象 |
+|---|---|
+| metadata() | dataset_manifest.json・ファイル一覧・銘柄インデックス・決算期スナップショットの読み込み〜保存 |
+| path(path) | 銘柄別ファイル・NULL 分類サイドカーの存在確認〜書き込み（パスのハッシュで 64 本に分散） |
+
+同一プロセス内のスレッド間でも排他し、同じスレッドからは再入できる。
+"""
+import hashlib
+import os
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+LOCK_DIR = Path("metadata") / ".locks"
+METADATA_LOCK_NAME = "metadata.lock"
+DEFAULT_STRIPES = 64
+
+# ロックファイルの絶対パス → _FileLock（同一プロセス内で共有する）
+_locks: dict[str, "_FileLock"] = {}
+_locks_guard = threading.Lock()
+
+
+class _FileLock:
+    """1つのロックファイルに対するプロセス間・スレッド間の排他ロック（スレッド単位で再入可）。"""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd: int | None = None
+
+    def acquire(self) -> None:
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                try:
+                    _lock_fd(fd)
+                except BaseException:
+                    os.close(fd)
+                    raise
+            except BaseException:
+                self._thread_lock.release()
+                raise
+            self._fd = fd
+        self._depth += 1
+
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            fd, self._fd = self._fd, None
+            try:
+                _unlock_fd(fd)
+            finally:
+                os.close(fd)
+        self._thread_lock.release()
+
+
+def _lock_fd(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        return
+    while True:
+        try:
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            return
+        except OSError:  # LK_LOCK は約10秒で諦めるため待ち続ける
+            continue
+
+
+def _unlock_fd(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        return
+    os.lseek(fd, 0, os.SEEK_SET)
+    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+def _file_lock(path: Path) -> _FileLock:
+    key = str(path.resolve())
+    with _locks_guard:
+        lock = _locks.get(key)
+        if lock is None:
+            lock = _locks[key] = _FileLock(Path(key))
+        return lock
+
+
+class DatasetLock:
+    """financial-dataset の出力先 base_dir のロック。"""
+
+    def __init__(self, base_dir: str | Path, stripes: int = DEFAULT_STRIPES) -> None:
+        self.base_dir = Path(base_dir)
+        self.stripes = stripes
+
+    @property
+    def lock_dir(self) -> Path:
+        return self.base_dir / LOCK_DIR
+
+    @contextmanager
+    def metadata(self) -> Iterator[None]:
+        """メタデータ（manifest・ファイル一覧・銘柄インデックス・スナップショット）の更新ロック。"""
+        with self._hold(self.lock_dir / METADATA_LOCK_NAME):
+            yield
+
+    @contextmanager
+    def path(self, path: str | Path) -> Iterator[None]:
+        """出力ファイル path の書き込みロック（base_dir からの相対パスで決まる）。"""
+        try:
+            key = Path(path).relative_to(self.base_dir).as_posix()
+        except ValueError:
+            key = Path(path).as_posix()
+        stripe = int.from_bytes(hashlib.sha1(key.encode("utf-8")).digest()[:4], "big") % self.stripes
+        with self._hold(self.lock_dir / f"write-{stripe:02d}.lock"):
+            yield
+
+    @staticmethod
+    @contextmanager
+    def _hold(lock_path: Path) -> Iterator[None]:
+        lock = _file_lock(lock_path)
+        lock.acquire()
+        try:
+            yield
+        finally:
+            lock.release()
@@ -0,0 +1,381 @@
+"""
+DatasetQuery
+決算期スナップショットの列に対するスクリーニングクエリ（NumPy によるベクトル演算）。
+
+条件式・並び替え式は Python の式の構文で canonical key（fact_keys）と文字列列を参照する。
+
+    equity > 1e10 and operating_income > 0
+    operating_income / net_sales >= 0.1 and accounting_standard in ("IFRS", "US-GAAP")
+    ordinary_income is None
+
+| 構文 | 内容 |
+|---|---|
+| fact_keys（例: equity） | 数値列（null は NaN） |
+| security_code / doc_id / period_start / period_end / accounting_standard / consolidation_type | 文字列列（空文字は null） |
+| + - * / 単項 - abs() | 算術（null を含む・0除算の結果は null） |
+| < <= > >= == != （連鎖可） / in / not in | 比較 |
+| is None / is not None | null 判定 |
+| and / or / not | 論理演算（SQL と同じ3値論理） |
+
+null との比較は「不明」となり、条件を満たした（真の）行のみ残す。
+例えば `not (equity > 0)` は equity が null の行を含まない（`equity is None or not (equity > 0)` と書く）。
+"""
+import ast
+import logging
+import operator
+import time
+from collections.abc import Callable, Iterable
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+
+try:
+    from src.output.dataset_reader import DatasetReader
+    from src.output.period_snapshot import STRING_COLUMNS
+except ModuleNotFoundError:
+    from output.dataset_reader import DatasetReader
+    from output.period_snapshot import STRING_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+# 評価結果: ("num", float 配列) / ("str", 文字列配列) / ("bool", (真の行, 偽の行))
+_Value = tuple[str, Any]
+_Node = Callable[["_Columns"], _Value]
+
+_COMPARE_OPS: dict[type, Callable[[Any, Any], Any]] = {
+    ast.Lt: operator.lt, ast.LtE: operator.le, ast.Gt: operator.gt, ast.GtE: operator.ge,
+    ast.Eq: operator.eq, ast.NotEq: operator.ne,
+}
+_ARITHMETIC_OPS: dict[type, Callable[[Any, Any], Any]] = {
+    ast.Add: np.add, ast.Sub: np.subtract, ast.Mult: np.multiply, ast.Div: np.true_divide,
+}
+
+
+class QueryResult:
+    """スクリーニング結果（並び替え・件数制限後の行）。"""
+
+    __slots__ = ("data_version", "rows", "security_codes", "columns", "matched", "total", "timings")
+
+    def __init__(
+        self,
+        data_version: str,
+        rows: np.ndarray,
+        security_codes: list[str],
+        columns: dict[str, np.ndarray],
+        matched: int,
+        total: int,
+        timings: dict[str, float],
+    ) -> None:
+        self.data_version = data_version
+        self.rows = rows                      # スナップショットの行番号
+        self.security_codes = security_codes
+        self.columns = columns                # 列名（式） → 値（null は NaN）
+        self.matched = matched                # 条件を満たした件数（件数制限前）
+        self.total = total                    # 決算期の銘柄数
+        self.timings = timings                # load / filter / sort / total（ミリ秒）
+
+    @property
+    def elapsed_ms(self) -> float:
+        return self.timings["total"]
+
+    def __len__(self) -> int:
+        return len(self.security_codes)
+
+    def to_records(self) -> list[dict[str, Any]]:
+        """行ごとの辞書（security_code と各列。null は None）。"""
+        records = []
+        for i, code in enumerate(self.security_codes):
+            record: dict[str, Any] = {"security_code": code}
+            for name, values in self.columns.items():
+                value = values[i].item()
+                record[name] = None if isinstance(value, float) and np.isnan(value) else value
+            records.append(record)
+        return records
+
+
+class DatasetQuery:
+    """決算期スナップショットに対するスクリーニング（DatasetReader 経由で列を読み込む）。"""
+
+    def __init__(self, reader: DatasetReader | None = None) -> None:
+        """
+        Args:
+            reader: 読み込みに使う DatasetReader。None の場合は DATASET_PATH 基準で生成する
+        """
+        self.reader = reader if reader is not None else DatasetReader()
+
+    def screen(
+        self,
+        where: str | None = None,
+        data_version: str | None = None,
+        report_type: str = "annual",
+        order_by: str | None = None,
+        descending: bool = True,
+        limit: int | None = None,
+        columns: Iterable[str] = (),
+    ) -> QueryResult:
+        """
+        条件式を満たす銘柄を返す。
+
+        Args:
+            where: 条件式。None の場合は全銘柄
+            data_version: 決算期。None の場合は manifest の最新決算期
+            order_by: 並び替えの数値式。null は順序に依らず末尾。同値は security_code 順
+            descending: 降順（既定）
+            limit: 上位 N 件（order_by がある場合は部分選択で求める）
+            columns: 結果に含める列（fact_key・文字列列・数値式）
+
+        Raises:
+            ValueError: 式が不正・未定義のキーを参照した・決算期が存在しない場合
+        """
+        start = time.perf_counter()
+        if data_version is None:
+            data_version = self.reader.latest_period(report_type)
+        arrays = self.reader.load_period(data_version, report_type) if data_version else None
+        if arrays is None:
+            raise ValueError(f"決算期が存在しません: {report_type}/{data_version}")
+        env = _Columns(arrays)
+        loaded = time.perf_counter()
+
+        if where is None:
+            rows = np.arange(env.n)
+        else:
+            rows = np.flatnonzero(_evaluate_condition(where, env))
+        matched = len(rows)
+        filtered = time.perf_counter()
+
+        if order_by is not None:
+            rows = _top_k(rows, _evaluate_numeric(order_by, env)[rows], descending, limit)
+        elif limit is not None:
+            rows = rows[:limit]
+        result_columns = {name: _evaluate_column(name, env)[rows] for name in columns}
+        sorted_at = time.perf_counter()
+
+        timings = {
+            "load": (loaded - start) * 1000,
+            "filter": (filtered - loaded) * 1000,
+            "sort": (sorted_at - filtered) * 1000,
+            "total": (sorted_at - start) * 1000,
+        }
+        logger.debug("Screen %s/%s: %d/%d rows in %.2f ms (where=%r, order_by=%r)",
+                     report_type, data_version, matched, env.n, timings["total"], where, order_by)
+        return QueryResult(
+            data_version, rows, arrays["security_code"][rows].tolist(), result_columns, matched, env.n, timings,
+        )
+
+
+class _Columns:
+    """スナップショット配列への列参照（数値列は参照時に1度だけ取り出す）。"""
+
+    def __init__(self, arrays: dict[str, np.ndarray]) -> None:
+        self.arrays = arrays
+        self.n = len(arrays["security_code"])
+        self._positions = {key: j for j, key in enumerate(arrays["fact_keys"].tolist())}
+        self._numeric: dict[str, np.ndarray] = {}
+
+    def column(self, name: str) -> _Value:
+        if name in self._positions:
+            values = self._numeric.get(name)
+            if values is None:
+                # Fortran 順のため列は連続領域（メモリマップでも1回の連続読み込み）
+                values = self._numeric[name] = np.asarray(self.arrays["values"][:, self._positions[name]])
+            return "num", values
+        if name in STRING_COLUMNS:
+            return "str", self.arrays[name]
+        raise ValueError(f"未定義のキーです: {name}")
+
+
+# ----------------------------------------------------------------------
+# 式のコンパイル・評価
+# ----------------------------------------------------------------------
+
+
+def _evaluate_condition(expression: str, env: _Columns) -> np.ndarray:
+    kind, value = compile_expression(expression)(env)
+    if kind != "bool":
+        raise ValueError(f"条件式ではありません: {expression}")
+    return np.broadcast_to(value[0], (env.n,))
+
+
+def _evaluate_numeric(expression: str, env: _Columns) -> np.ndarray:
+    kind, value = compile_expression(expression)(env)
+    if kind != "num":
+        raise ValueError(f"数値式ではありません: {expression}")
+    return np.broadcast_to(np.asarray(value, dtype=float), (env.n,))
+
+
+def _evaluate_column(expression: str, env: _Columns) -> np.ndarray:
+    kind, value = compile_expression(expression)(env)
+    if kind == "bool":
+        value = value[0]
+    return np.broadcast_to(value, (env.n,))
+
+
+@lru_cache(maxsize=256)
+def compile_expression(expression: str) -> _Node:
+    """
+    式を評価関数にコンパイルする（同じ式は再利用する）。
+
+    Raises:
+        ValueError: 構文エラー・未対応の構文
+    """
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"式の構文エラー: {expression} ({e.msg})") from None
+    return _compile(tree.body, expression)
+
+
+def _compile(node: ast.AST, expression: str) -> _Node:
+    if isinstance(node, ast.Name):
+        name = node.id
+        return lambda env: env.column(name)
+
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float, str)) and not isinstance(node.value, bool):
+        value = ("str", node.value) if isinstance(node.value, str) else ("num", float(node.value))
+        return lambda env: value
+
+    if isinstance(node, ast.BoolOp):
+        operands = [_compile(v, expression) for v in node.values]
+        combine = _and if isinstance(node.op, ast.And) else _or
+        def bool_op(env: _Columns) -> _Value:
+            result = _as_bool(operands[0](env), expression)
+            for operand in operands[1:]:
+                result = combine(result, _as_bool(operand(env), expression))
+            return "bool", result
+        return bool_op
+
+    if isinstance(node, ast.UnaryOp):
+        operand = _compile(node.operand, expression)
+        if isinstance(node.op, ast.Not):
+            return lambda env: ("bool", _as_bool(operand(env), expression)[::-1])
+        if isinstance(node.op, (ast.USub, ast.UAdd)):
+            sign = -1.0 if isinstance(node.op, ast.USub) else 1.0
+            return lambda env: ("num", sign * _as_num(operand(env), expression))
+
+    if isinstance(node, ast.BinOp) and type(node.op) in _ARITHMETIC_OPS:
+        op = _ARITHMETIC_OPS[type(node.op)]
+        left, right = _compile(node.left, expression), _compile(node.right, expression)
+        def arithmetic(env: _Columns) -> _Value:
+            with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+                result = op(_as_num(left(env), expression), _as_num(right(env), expression))
+            # 0除算・オーバーフローの結果は null とする
+            return "num", np.where(np.isfinite(result), result, np.nan)
+        return arithmetic
+
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "abs" \
+            and len(node.args) == 1 and not node.keywords:
+        operand = _compile(node.args[0], expression)
+        return lambda env: ("num", np.abs(_as_num(operand(env), expression)))
+
+    if isinstance(node, ast.Compare):
+        comparisons = []
+        left_node = node.left
+        for op, right_node in zip(node.ops, node.comparators):
+            comparisons.append(_compile_compare(left_node, op, right_node, expression))
+            left_node = right_node
+        def compare(env: _Columns) -> _Value:
+            result = comparisons[0](env)
+            for comparison in comparisons[1:]:
+                result = _and(result, comparison(env))
+            return "bool", result
+        return compare
+
+    raise ValueError(f"未対応の構文です: {ast.unparse(node)} ({expression})")
+
+
+def _compile_compare(
+    left_node: ast.AST, op: ast.cmpop, right_node: ast.AST, expression: str,
+) -> Callable[[_Columns], tuple[Any, Any]]:
+    left = _compile(left_node, expression)
+
+    if isinstance(op, (ast.Is, ast.IsNot)):
+        if not (isinstance(right_node, ast.Constant) and right_node.value is None):
+            raise ValueError(f"is / is not は None とのみ比較できます: {expression}")
+        negate = isinstance(op, ast.IsNot)
+        def null_check(env: _Columns) -> tuple[Any, Any]:
+            is_null = _null_mask(left(env), expression)
+            return (~is_null, is_null) if negate else (is_null, ~is_null)
+        return null_check
+
+    if isinstance(op, (ast.In, ast.NotIn)):
+        if not (isinstance(right_node, (ast.Tuple, ast.List, ast.Set))
+                and all(isinstance(e, ast.Constant) for e in right_node.elts)):
+            raise ValueError(f"in は定数のタプル・リストとのみ比較できます: {expression}")
+        members = [e.value for e in right_node.elts]
+        negate = isinstance(op, ast.NotIn)
+        def membership(env: _Columns) -> tuple[Any, Any]:
+            kind, values = left(env)
+            if kind == "bool":
+                raise ValueError(f"論理値は in で比較できません: {expression}")
+            candidates = [m for m in members if isinstance(m, str) == (kind == "str")]
+            known = ~_null_mask((kind, values), expression)
+            found = np.isin(values, candidates) if candidates else np.zeros(np.shape(values), dtype=bool)
+            if negate:
+                found = ~found
+            return found & known, ~found & known
+        return membership
+
+    compare_op = _COMPARE_OPS.get(type(op))
+    if compare_op is None:
+        raise ValueError(f"未対応の比較演算子です: {expression}")
+    right = _compile(right_node, expression)
+    def comparison(env: _Columns) -> tuple[Any, Any]:
+        left_value, right_value = left(env), right(env)
+        if left_value[0] == "bool" or right_value[0] == "bool" or left_value[0] != right_value[0]:
+            raise ValueError(f"型の異なる値は比較できません: {expression}")
+        known = ~(_null_mask(left_value, expression) | _null_mask(right_value, expression))
+        result = np.asarray(compare_op(left_value[1], right_value[1]))
+        return result & known, ~result & known
+    return comparison
+
+
+def _and(a: tuple[Any, Any], b: tuple[Any, Any]) -> tuple[Any, Any]:
+    # 3値論理: 偽が1つでもあれば偽、全て真なら真、それ以外は不明
+    return a[0] & b[0], a[1] | b[1]
+
+
+def _or(a: tuple[Any, Any], b: tuple[Any, Any]) -> tuple[Any, Any]:
+    return a[0] | b[0], a[1] & b[1]
+
+
+def _as_bool(value: _Value, expression: str) -> tuple[Any, Any]:
+    if value[0] != "bool":
+        raise ValueError(f"論理演算の対象が条件ではありません: {expression}")
+    return value[1]
+
+
+def _as_num(value: _Value, expression: str) -> Any:
+    if value[0] != "num":
+        raise ValueError(f"算術演算の対象が数値ではありません: {expression}")
+    return value[1]
+
+
+def _null_mask(value: _Value, expression: str) -> Any:
+    kind, values = value
+    if kind == "num":
+        return np.isnan(values)
+    if kind == "str":
+        return np.asarray(values) == ""
+    raise ValueError(f"論理値は null 判定できません: {expression}")
+
+
+def _top_k(rows: np.ndarray, keys: np.ndarray, descending: bool, limit: int | None) -> np.ndarray:
+    """
+    keys で並び替えた上位 limit 行（null は末尾、同値は行番号順）。
+
+    limit 件のみ必要な場合は部分選択（argpartition）で境界値を求め、境界値以上の候補だけを整列する。
+    """
+    known = ~np.isnan(keys)
+    order_keys = -keys if descending else keys
+    candidates = np.flatnonzero(known)
+    if limit is not None and limit < len(candidates):
+        if limit <= 0:
+            return rows[:0]
+        kth = np.partition(order_keys[candidates], limit - 1)[limit - 1]
+        candidates = candidates[order_keys[candidates] <= kth]
+    ordered = candidates[np.lexsort((rows[candidates], order_keys[candidates]))]
+    if limit is None or len(ordered) < limit:
+        nulls = np.flatnonzero(~known)
+        ordered = np.concatenate([ordered, nulls])
+    return rows[ordered[:limit]]
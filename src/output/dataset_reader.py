@@ -0,0 +1,310 @@
+"""
+DatasetReader
+financial-dataset の読み取り API（valuation-engine / screening-engine・分析ノートブック向け）。
+
+| メソッド | 内容 |
+|---|---|
+| get(code, data_version) | 銘柄別ファイル1件（pretty / compact / gzip を判別） |
+| history(code) | 銘柄の過年度ファイル（company_index.json 参照 + 直接読み込み、新しい順） |
+| load_period(data_version) | 決算期全体の列指向配列（snapshot.npz をメモリマップ。無ければ JSON から構築） |
+| periods() / latest_period() | manifest の決算期一覧・最新決算期 |
+
+読み込んだ内容はバイト数の上限付き LRU キャッシュに保持する。サイズはオブジェクトのメモリ使用量
+（配列は nbytes、メモリマップはマップしたバイト数）で数える。
+参照のたびに dataset_manifest.json の stat を確認し、変更されていれば period_revisions が変わった決算期の
+キャッシュと銘柄インデックスを破棄する（書き込み側の flush() で revision が上がった時点で新しい内容を読む）。
+
+返却する辞書・配列はキャッシュと共有するため変更しないこと（配列は読み取り専用）。
+"""
+import logging
+import os
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+try:
+    from src.output.company_index import CompanyIndex
+    from src.output.manifest_generator import DatasetManifestGenerator
+    from src.output.period_snapshot import SNAPSHOT_FILENAME, PeriodSnapshot, load_snapshot, map_snapshot
+    from src.output.serializer import GZIP_SUFFIX, JSON_SUFFIX, read_dataset_json
+except ModuleNotFoundError:
+    from output.company_index import CompanyIndex
+    from output.manifest_generator import DatasetManifestGenerator
+    from output.period_snapshot import SNAPSHOT_FILENAME, PeriodSnapshot, load_snapshot, map_snapshot
+    from output.serializer import GZIP_SUFFIX, JSON_SUFFIX, read_dataset_json
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+
+
+class DatasetReader:
+    """financial-dataset の読み取り API（バイト数上限付き LRU キャッシュ）。"""
+
+    def __init__(
+        self,
+        base_dir: str | Path | None = None,
+        cache_bytes: int = DEFAULT_CACHE_BYTES,
+        mmap: bool = True,
+    ) -> None:
+        """
+        Args:
+            base_dir: financial-dataset のパス。None の場合は DATASET_PATH 環境変数
+            cache_bytes: キャッシュの上限バイト数（0 でキャッシュしない）
+            mmap: スナップショットをメモリマップする。False の場合はメモリに読み込む
+                  （Windows ではマップ中のファイルを置き換えられないため、書き込み側と併用する場合は False）
+        """
+        if base_dir is None:
+            base_dir = os.environ.get("DATASET_PATH")
+            if not base_dir:
+                raise EnvironmentError("DATASET_PATH 環境変数が設定されていません。")
+        self.base_dir = Path(base_dir)
+        self.mmap = mmap
+        self._generator = DatasetManifestGenerator(str(self.base_dir))
+        self._index = CompanyIndex(self.base_dir)
+        self._cache = _LRUCache(cache_bytes)
+        self._lock = threading.RLock()
+        self._manifest: dict[str, Any] | None = None
+        self._manifest_stat: tuple[int, int, int] | None = None
+        self.invalidations = 0
+
+    # ------------------------------------------------------------------
+    # 参照
+    # ------------------------------------------------------------------
+
+    def get(self, security_code: str, data_version: str, report_type: str = "annual") -> dict[str, Any] | None:
+        """銘柄別ファイルを読み込む。存在しない場合は None。"""
+        with self._lock:
+            self.refresh()
+            period_dir = self.base_dir / report_type / data_version
+            return self._read_file(
+                report_type, data_version, security_code,
+                *(period_dir / f"{security_code}{suffix}" for suffix in (JSON_SUFFIX, GZIP_SUFFIX)),
+            )
+
+    def history(
+        self,
+        security_code: str,
+        report_type: str | None = "annual",
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        銘柄の出力ファイルを新しい決算期から最大 limit 件返す（CompanyIndex.history の順）。
+
+        Args:
+            report_type: "annual" / "quarterly"。None の場合は両方
+        """
+        with self._lock:
+            self.refresh()
+            documents = []
+            for entry in self._index.history(security_code, report_type)[:limit]:
+                data = self._read_file(
+                    entry["report_type"], entry["data_version"], security_code, self.base_dir / entry["path"],
+                )
+                if data is not None:
+                    documents.append(data)
+            return documents
+
+    def load_period(self, data_version: str, report_type: str = "annual") -> dict[str, np.ndarray] | None:
+        """
+        決算期全体を列指向配列で返す（配列は period_snapshot.py の snapshot.npz と同じ）。
+
+        スナップショットがあればメモリマップ（mmap=False の場合は読み込み）、
+        無ければ決算期ディレクトリの JSON から構築する。決算期が存在しない場合は None。
+        """
+        with self._lock:
+            self.refresh()
+            key = ("period", report_type, data_version)
+            arrays = self._cache.get(key)
+            if arrays is not None:
+                return arrays
+            period_dir = self.base_dir / report_type / data_version
+            snapshot_path = period_dir / SNAPSHOT_FILENAME
+            arrays = map_snapshot(snapshot_path) if self.mmap else load_snapshot(snapshot_path)
+            if arrays is None:
+                if not period_dir.is_dir():
+                    return None
+                arrays = PeriodSnapshot.open(period_dir).to_arrays()
+            for array in arrays.values():
+                array.flags.writeable = False
+            self._cache.put(key, arrays, sum(array.nbytes for array in arrays.values()), (report_type, data_version))
+            return arrays
+
+    def security_codes(self, data_version: str, report_type: str = "annual") -> list[str]:
+        """決算期の銘柄コード一覧（security_code 順）。"""
+        arrays = self.load_period(data_version, report_type)
+        return [] if arrays is None else arrays["security_code"].tolist()
+
+    def periods(self, report_type: str = "annual") -> list[str]:
+        """manifest の決算期一覧（降順）。"""
+        with self._lock:
+            self.refresh()
+            return list(self._manifest.get(f"{report_type}_periods") or [])
+
+    def latest_period(self, report_type: str = "annual") -> str | None:
+        with self._lock:
+            self.refresh()
+            return self._manifest.get(f"latest_{report_type}")
+
+    @property
+    def revision(self) -> int:
+        """読み込み済み manifest の dataset_revision。"""
+        with self._lock:
+            self.refresh()
+            return self._manifest.get("dataset_revision", 0)
+
+    # ------------------------------------------------------------------
+    # キャッシュ
+    # ------------------------------------------------------------------
+
+    def refresh(self) -> bool:
+        """
+        manifest が更新されていれば読み直し、revision が変わった決算期のキャッシュを破棄する。
+
+        manifest が無い間は変更を検知できないため、キャッシュは manifest が作成・更新されるまで保持する。
+
+        Returns:
+            キャッシュを破棄した場合 True。
+        """
+        with self._lock:
+            try:
+                st = os.stat(self._generator.manifest_path)
+                stat = (st.st_mtime_ns, st.st_size, st.st_ino)
+            except OSError:
+                stat = None
+            if self._manifest is not None and stat == self._manifest_stat:
+                return False
+            previous = self._manifest
+            manifest = self._generator.load() or {}
+            self._manifest_stat = stat
+            self._manifest = manifest
+            if previous is None:
+                return False
+            if "dataset_revision" in previous and manifest.get("dataset_revision") == previous["dataset_revision"]:
+                return False
+
+            old_revisions = previous.get("period_revisions") or {}
+            new_revisions = manifest.get("period_revisions") or {}
+            changed = {
+                (category, period)
+                for category in old_revisions.keys() | new_revisions.keys()
+                for period in (old_revisions.get(category) or {}).keys() | (new_revisions.get(category) or {}).keys()
+                if (old_revisions.get(category) or {}).get(period) != (new_revisions.get(category) or {}).get(period)
+            }
+            if changed and old_revisions:
+                for period_key in changed:
+                    self._cache.discard_group(period_key)
+            else:
+                # revision を持たない manifest は決算期単位で判別できないため全件破棄する
+                self._cache.clear()
+            self._index.reset()
+            self.invalidations += 1
+            logger.debug("Dataset revision changed: %s -> %s (%d periods)",
+                         previous.get("dataset_revision"), manifest.get("dataset_revision"), len(changed))
+            return True
+
+    def clear(self) -> None:
+        """キャッシュを全件破棄する。"""
+        with self._lock:
+            self._cache.clear()
+            self._index.reset()
+
+    def cache_info(self) -> dict[str, int]:
+        """キャッシュの統計（hits / misses / evictions / entries / bytes / max_bytes）。"""
+        with self._lock:
+            return self._cache.info()
+
+    def _read_file(
+        self, report_type: str, data_version: str, security_code: str, *paths: Path,
+    ) -> dict[str, Any] | None:
+        """キャッシュに無ければ paths を順に読み込む（最初に存在したもの）。"""
+        key = ("file", report_type, data_version, security_code)
+        data = self._cache.get(key)
+        if data is not None:
+            return data
+        for path in paths:
+            try:
+                data = read_dataset_json(path)
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError) as e:
+                logger.warning("Failed to read dataset file: %s (%s)", path, e)
+                return None
+            self._cache.put(key, data, _object_size(data), (report_type, data_version))
+            return data
+        return None
+
+
+class _LRUCache:
+    """バイト数上限付き LRU（group 単位で破棄できる）。"""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, tuple[Any, int, Hashable]] = OrderedDict()
+        self._groups: dict[Hashable, set[Hashable]] = {}
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: Hashable, value: Any, nbytes: int, group: Hashable) -> None:
+        self._remove(key)
+        if nbytes > self.max_bytes:
+            return
+        self._entries[key] = (value, nbytes, group)
+        self._groups.setdefault(group, set()).add(key)
+        self.bytes += nbytes
+        while self.bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def discard_group(self, group: Hashable) -> None:
+        for key in list(self._groups.get(group, ())):
+            self._remove(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._groups.clear()
+        self.bytes = 0
+
+    def info(self) -> dict[str, int]:
+        return {
+            "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+            "entries": len(self._entries), "bytes": self.bytes, "max_bytes": self.max_bytes,
+        }
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.bytes -= entry[1]
+        keys = self._groups[entry[2]]
+        keys.discard(key)
+        if not keys:
+            del self._groups[entry[2]]
+
+
+def _object_size(obj: Any) -> int:
+    """JSON 由来のオブジェクト（dict / list / スカラー）のメモリ使用量の概算。"""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += sys.getsizeof(key) + _object_size(value)
+    elif isinstance(obj, list):
+        for value in obj:
+            size += _object_size(value)
+    return size
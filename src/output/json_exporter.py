@@ -13,10 +13,13 @@ DATASET_PATH 環境変数で出力先を指定する。
 
 FACT_KEYS / DERIVED_KEYS / 会計基準マッピングは config/canonical_keys.yaml から読み込む。
 """
-import json
+import atexit
 import logging
 import os
 import sys
+import threading
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -33,6 +36,21 @@ try:
         get_fact_keys,
         get_valid_accounting_standards,
     )
+    from src.output.company_index import CompanyIndex
+    from src.output.dataset_io import WriteResult, file_digest, payload_hash, write_dataset_file
+    from src.output.dataset_lock import DatasetLock
+    from src.output.period_snapshot import SnapshotIndex
+    from src.output.serializer import (
+        DATASET_SUFFIXES,
+        DatasetSerializer,
+        dataset_stem,
+        get_serializer,
+        read_dataset_json,
+    )
+    from src.output.manifest_generator import (
+        DatasetManifestGenerator,
+        IncrementalManifest,
+    )
 except ModuleNotFoundError:
     from config_loader import (
         get_accounting_standard_mapping,
@@ -40,10 +58,32 @@ except ModuleNotFoundError:
         get_fact_keys,
         get_valid_accounting_standards,
     )
+    from output.company_index import CompanyIndex
+    from output.dataset_io import WriteResult, file_digest, payload_hash, write_dataset_file
+    from output.dataset_lock import DatasetLock
+    from output.period_snapshot import SnapshotIndex
+    from output.serializer import (
+        DATASET_SUFFIXES,
+        DatasetSerializer,
+        dataset_stem,
+        get_serializer,
+        read_dataset_json,
+    )
+    from output.manifest_generator import (
+        DatasetManifestGenerator,
+        IncrementalManifest,
+    )
 
 logger = logging.getLogger(__name__)
 
 SCHEMA_VERSION = "1.0"
+# 過年度（主要な経営指標等の推移）由来の出力の source。当該期の有価証券報告書由来の出力より優先度が低い
+HISTORY_SOURCE = "history"
+# NULL 分類サイドカーの出力先（DATASET_PATH 基準）
+NULL_REASONS_DIR = Path("metadata") / "null_reasons"
+# ExportSession の書き込みスレッド数・書き出し待ち件数の上限（上限に達すると export() が待つ）
+DEFAULT_WRITER_THREADS = 4
+DEFAULT_MAX_PENDING = 256
 
 DERIVED_KEYS = get_derived_keys()
 FACT_KEYS = get_fact_keys()
@@ -91,13 +131,42 @@ class JSONExporter:
     """
     FinancialMaster の出力を JSON ファイルとして保存する。
     出力先: {DATASET_PATH}/{report_type}/{data_version}/{security_code}.json
+    NULL 分類（FinancialMaster(null_reasons=True)）がある場合はサイドカーを
+    {DATASET_PATH}/metadata/null_reasons/{report_type}/{data_version}/{security_code}.json に保存する。
 
     financial-dataset には財務Factのみを保存する。
     Derived指標は出力しない。値が取得できなかった項目はnullで出力する。
     全項目がnullの年度ブロックは省略する。
+
+    dataset_manifest.json・決算期ごとの列指向スナップショット（{report_type}/{data_version}/snapshot.npz）・
+    銘柄インデックス（metadata/company_index.json）は出力に合わせて差分更新する（全件スキャンしない）。
+    これらのメタデータは export ごとには保存せず、flush() / close()（with ブロックの終了時）でまとめて1回保存する。
+    close() されずに破棄された場合は保存せずに警告する。プロセス終了時に残っている未 close() の出力は
+    atexit で保存する（フォールバック）。defer_manifest=True の場合は atexit でも保存しない。
+    大量出力時は session() でバックグラウンド書き込みのバッチ出力を使う。
+
+    出力形式は serializer で指定する（pretty（既定）/ compact / gzip、serializer.py）。
+    gzip の場合は {security_code}.json.gz に保存する。NULL 分類サイドカー・manifest は常に pretty。
+
+    内容（generated_at を除く）が既存ファイルと同一の場合は書き込まない（generated_at も更新しない）。
+    書き込みは一時ファイル + rename で行う（dataset_io）。
+
+    複数プロセスから同じ出力先に同時に出力できる（dataset_lock.py）:
+    - 銘柄別ファイルの存在確認〜書き込みは出力先ごとのロックの中で行う
+    - 複数の文書が同じ出力先を持つ場合は、過年度（source: "history"）より当該期の書類由来の出力を、
+      同じ種類の中では doc_id の大きい（新しい）文書を優先する（処理順に依らない）。
+      優先順位が同じ場合は後から出力した内容で上書きする
+    - manifest・ファイル一覧・スナップショット・銘柄インデックスは flush() でメタデータロックを取り、
+      他プロセスが保存していれば読み直してから、前回の flush() 以降の出力を反映して保存する
     """
 
-    def __init__(self, base_dir: str | None = None) -> None:
+    def __init__(
+        self,
+        base_dir: str | None = None,
+        *,
+        defer_manifest: bool = False,
+        serializer: str | DatasetSerializer | None = None,
+    ) -> None:
         if base_dir is None:
             base_dir_str = os.environ.get("DATASET_PATH")
             if not base_dir_str:
@@ -108,6 +177,23 @@ class JSONExporter:
             base_dir = base_dir_str
 
         self.base_dir = Path(base_dir)
+        self._defer_manifest = defer_manifest
+        self.serializer = get_serializer(serializer)
+        self._manifest = IncrementalManifest(DatasetManifestGenerator(str(self.base_dir)))
+        self._snapshots = SnapshotIndex(self.base_dir)
+        self._company_index = CompanyIndex(self.base_dir)
+        self._lock = DatasetLock(self.base_dir)
+        self._created_dirs: set[Path] = set()
+        # flush() で manifest 等に反映する出力（書き込み順）
+        self._journal: list[_ExportRecord] = []
+        self._journal_lock = threading.Lock()
+        self._manifest_loaded = False
+        # 最後に読み込み・保存した時点の manifest の (サイズ, SHA-256)（他プロセスの保存の検出用）
+        self._seen_manifest: tuple[int, str] | None = None
+        # 書き込んだ件数 / 内容が同一で書き込みをスキップした件数 / 優先順位の高い既存出力を優先した件数
+        self.written = 0
+        self.unchanged = 0
+        self.kept = 0
 
     def _generate_data_version(
         self, fiscal_year_end: str | None, report_type: str | None,
@@ -156,10 +242,63 @@ class JSONExporter:
 
         return clean if clean else None
 
-    def export(self, financial_dict: dict[str, Any]) -> str:
+    def __enter__(self) -> "JSONExporter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        # ファイナライザではロック・ファイル I/O を行わない（未反映の出力は警告のみ）
+        pending = len(getattr(self, "_journal", ()))
+        if pending:
+            logger.warning(
+                "JSONExporter: close() / flush() されずに破棄されました。"
+                "%d 件の出力が manifest 等に未反映です（--rebuild-manifest で再生成できます）: %s",
+                pending, self.base_dir,
+            )
+
+    def export(self, financial_dict: dict[str, Any], *, overwrite: bool = True) -> str | None:
         """
         財務Factのみを JSON として書き出し、保存パスを返す。
+
+        manifest・ファイル一覧・スナップショット・銘柄インデックスへの反映は flush() まで保留する
+        （出力ごとにメタデータ全体を保存し直さない）。
+
+        overwrite=False の場合、出力先が既に存在すれば書き出さずに None を返す
+        （過年度バックフィルが当該期の有価証券報告書由来の出力を上書きしないため）。
+        """
+        record = self._prepare(financial_dict)
+        record.overwrite = overwrite
+        if not overwrite and _output_exists(record.output_path):
+            logger.info("JSONExporter: 既存のためスキップ - %s", record.output_path)
+            return None
+        self._load_manifest()
+
+        if not self._write(record):
+            return None
+        self._record_metadata(record)
+        if not self._defer_manifest:
+            _open_exporters.add(self)
+
+        return str(record.output_path)
+
+    def session(
+        self,
+        max_workers: int = DEFAULT_WRITER_THREADS,
+        max_pending: int = DEFAULT_MAX_PENDING,
+    ) -> "ExportSession":
         """
+        バッチ出力セッションを返す。export() は検証のみ行って書き込みをキューに積み、
+        バックグラウンドの書き込みスレッドで保存する。終了時に全件の書き込みを待って manifest・スナップショットを保存する。
+
+            with JSONExporter().session() as session:
+                session.export(financial_dict)
+        """
+        return ExportSession(self, max_workers=max_workers, max_pending=max_pending)
+
+    def _prepare(self, financial_dict: dict[str, Any]) -> "_ExportRecord":
+        """出力内容を検証・組み立てる（ファイルには書き込まない）。"""
         raw_code = financial_dict.get("security_code")
         if not raw_code or not str(raw_code).strip():
             raise ValueError(
@@ -212,9 +351,6 @@ class JSONExporter:
             len(prior_metrics) if prior_metrics else 0,
         )
 
-        output_dir = self.base_dir / report_type / data_version
-        output_dir.mkdir(parents=True, exist_ok=True)
-
         current_block: dict[str, Any] = {"metrics": current_metrics}
         current_period = current_data.get("period")
         if current_period:
@@ -235,6 +371,9 @@ class JSONExporter:
             "current_year": current_block,
         }
 
+        if financial_dict.get("source") == HISTORY_SOURCE:
+            output_dict["source"] = HISTORY_SOURCE
+
         if prior_metrics:
             prior_block: dict[str, Any] = {"metrics": prior_metrics}
             prior_period = prior_data.get("period")
@@ -242,18 +381,457 @@ class JSONExporter:
                 prior_block["period"] = prior_period
             output_dict["prior_year"] = prior_block
 
-        output_path = output_dir / f"{sc}.json"
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(output_dict, f, indent=2, ensure_ascii=False)
+        return _ExportRecord(
+            output_path=self.base_dir / report_type / data_version / f"{sc}{self.serializer.suffix}",
+            output_dict=output_dict,
+            sidecar_path=self.base_dir / NULL_REASONS_DIR / report_type / data_version / f"{sc}.json",
+            sidecar=self._build_null_reasons(financial_dict, output_dict),
+        )
+
+    def _ensure_dir(self, path: Path) -> None:
+        """出力ディレクトリを作成する（作成済みのディレクトリは再作成しない）。"""
+        if path not in self._created_dirs:
+            path.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(path)
+
+    def _write(self, record: "_ExportRecord") -> bool:
+        """
+        出力ファイルと NULL 分類サイドカーを出力先のロックの中で書き出す。
+
+        内容（generated_at を除く）が既存ファイルと同一のファイルは書き込まない。
+        既存ファイルの方が優先順位が高い場合は書き込まない（record.result.kept、_ExportRecord.supersedes）。
+        NULL 分類が無い場合は、上書きした出力と食い違わないよう既存のサイドカーを削除する。
+        current_year の NULL 分類（manifest の件数用）は record に保持する。
+
+        Returns:
+            overwrite=False で出力先が既に存在した場合 False。
+        """
+        self._ensure_dir(record.output_path.parent)
+        # 出力形式（.json / .json.gz）に依らず銘柄ごとに排他する
+        with self._lock.path(record.output_path.with_name(dataset_stem(record.output_path.name))):
+            record.existed = _output_exists(record.output_path)
+            if not record.overwrite and record.existed:
+                logger.info("JSONExporter: 既存のためスキップ - %s", record.output_path)
+                return False
+            self._write_locked(record)
+            record.stat = _stat_key(record.output_path)
+        return True
+
+    def _write_locked(self, record: "_ExportRecord") -> None:
+        record.result = _kept_variant(record) or write_dataset_file(
+            record.output_path, record.output_dict, self.serializer, supersedes=record.supersedes,
+        )
+        if record.result.kept:
+            logger.info(
+                "JSONExporter: 優先順位の高い既存出力を優先 - %s (doc_id=%s)",
+                record.output_path, record.output_dict["doc_id"],
+            )
+            return
+        if record.existed:
+            # 出力形式を変更した場合は旧形式のファイルを削除する（manifest の二重計上防止）
+            for stale in _output_variants(record.output_path):
+                if stale.exists():
+                    stale.unlink(missing_ok=True)
+                    record.stale.append(stale.name)
+        if record.result.written:
+            logger.info(
+                "JSONExporter: 保存完了 - %s (data_version=%s)",
+                record.output_path, record.output_dict["data_version"],
+            )
+        else:
+            logger.info("JSONExporter: 変更なし - %s", record.output_path)
+
+        sidecar_path = record.sidecar_path
+        if record.sidecar is None:
+            sidecar_path.unlink(missing_ok=True)
+            return
 
-        logger.info("JSONExporter: 保存完了 - %s (data_version=%s)", output_path, data_version)
+        self._ensure_dir(sidecar_path.parent)
+        write_dataset_file(sidecar_path, record.sidecar)
+        record.null_reasons = {key: item["category"] for key, item in record.sidecar["current_year"].items()}
 
+    def _load_manifest(self) -> None:
+        """
+        manifest を読み込む（全件スキャン時に書き出し済みの分を二重計上しないよう、書き込み前に呼ぶ）。
+
+        manifest が無く全件スキャンした場合はその場で保存する
+        （後から開始したプロセスが他プロセスの反映前の出力を含めてスキャンしないため）。
+        """
+        if self._manifest_loaded:
+            return
         try:
-            from src.output.manifest_generator import DatasetManifestGenerator
-            manifest_generator = DatasetManifestGenerator()
-            manifest_path = manifest_generator.save()
-            logger.info("Dataset manifest generated: %s", manifest_path)
+            with self._lock.metadata():
+                self._manifest.load()
+                if self._manifest.dirty:
+                    self._manifest.flush()
+                self._seen_manifest = self._manifest_digest()
+            self._manifest_loaded = True
+        except Exception as e:
+            logger.warning("Failed to load dataset manifest: %s", e)
+
+    def _manifest_digest(self) -> tuple[int, str] | None:
+        try:
+            return file_digest(self.base_dir / "metadata" / "dataset_manifest.json")
+        except FileNotFoundError:
+            return None
+
+    def _record_metadata(self, record: "_ExportRecord") -> None:
+        """書き出した出力を件数に数え、flush() で manifest 等に反映するよう記録する。"""
+        with self._journal_lock:
+            if record.result.kept:
+                self.kept += 1
+                return
+            if record.result.written:
+                self.written += 1
+            else:
+                self.unchanged += 1
+            self._journal.append(record)
+
+    def _sync(self) -> None:
+        """
+        メタデータロックの中で、他プロセスが保存していれば manifest 等を読み直し、前回の flush() 以降の出力を反映する。
+
+        書き込み後に他の出力で置き換えられていない（ファイル識別子が書き込み直後と同じ）出力のみ反映する
+        （置き換えた出力は書き込んだプロセスが反映する）。
+        """
+        if self._manifest_digest() != self._seen_manifest:
+            logger.info("Dataset metadata updated by another writer, reloading: %s", self.base_dir)
+            self._manifest.reset()
+            self._snapshots.reset()
+            self._company_index.reset()
+        with self._journal_lock:
+            journal, self._journal = self._journal, []
+        for record in journal:
+            self._apply(record)
+
+    def _apply(self, record: "_ExportRecord") -> None:
+        report_type = record.output_dict["report_type"]
+        data_version = record.output_dict["data_version"]
+        current = _stat_key(record.output_path) == record.stat
+        try:
+            if current and record.result.written:
+                self._manifest.record_file(
+                    report_type, data_version, record.output_path.name,
+                    record.result.size, record.result.sha256, record.null_reasons,
+                )
+            elif current:
+                self._manifest.record_null_reasons(
+                    report_type, data_version, record.output_path.name, record.null_reasons,
+                )
+            for name in record.stale:
+                if not (record.output_path.parent / name).exists():
+                    self._manifest.remove_file(report_type, data_version, name)
+        except Exception as e:
+            logger.warning("Failed to update dataset manifest: %s", e)
+        if not current:
+            logger.debug("JSONExporter: 他の出力で置き換え済み - %s", record.output_path)
+            return
+        try:
+            self._snapshots.update(record.output_dict)
+        except Exception as e:
+            logger.warning("Failed to update period snapshot: %s", e)
+        try:
+            self._company_index.update(
+                record.output_dict["security_code"], report_type, data_version,
+                record.output_dict["doc_id"], record.output_path, record.result.content_hash,
+            )
+        except Exception as e:
+            logger.warning("Failed to update company index: %s", e)
+
+    def flush(self) -> str | None:
+        """
+        前回の flush() 以降の出力を反映した決算期スナップショット・銘柄インデックス・dataset_manifest.json を
+        メタデータロックの中で保存する（変更が無ければ何もしない）。
+
+        manifest（dataset_revision）は利用側の同期の起点のため最後に保存する。
+
+        Returns:
+            保存された manifest のパス。保存しなかった場合は None。
+        """
+        with self._lock.metadata():
+            self._sync()
+            self._flush_snapshots()
+            try:
+                self._company_index.flush()
+            except Exception as e:
+                logger.warning("Failed to save company index: %s", e)
+            manifest_path = self._flush_manifest()
+            self._seen_manifest = self._manifest_digest()
+        return manifest_path
+
+    def close(self) -> str | None:
+        """
+        未反映の出力があれば flush() する。以降も export() できる。
+
+        Returns:
+            保存された manifest のパス。保存しなかった場合は None。
+        """
+        _open_exporters.discard(self)
+        with self._journal_lock:
+            pending = bool(self._journal)
+        return self.flush() if pending else None
+
+    def _flush_snapshots(self) -> list[str]:
+        """
+        変更のあった決算期のスナップショットを保存し、manifest のファイル一覧に反映する。
+
+        Returns:
+            保存されたファイルのパス。
+        """
+        try:
+            paths = self._snapshots.flush()
+        except Exception as e:
+            logger.warning("Failed to save period snapshot: %s", e)
+            return []
+        for path in paths:
+            snapshot_path = Path(path)
+            try:
+                size, sha256 = file_digest(snapshot_path)
+                self._manifest.record_file(
+                    snapshot_path.parent.parent.name, snapshot_path.parent.name,
+                    snapshot_path.name, size, sha256,
+                )
+            except Exception as e:
+                logger.warning("Failed to update dataset manifest: %s", e)
+        return paths
+
+    def flush_manifest(self) -> str | None:
+        """
+        flush() と同じ（manifest はスナップショット・銘柄インデックスと併せて保存する）。
+
+        Returns:
+            保存されたファイルのパス。保存しなかった場合は None。
+        """
+        return self.flush()
+
+    def _flush_manifest(self) -> str | None:
+        try:
+            manifest_path = self._manifest.flush()
         except Exception as e:
             logger.warning("Failed to generate dataset manifest: %s", e)
+            return None
+        if manifest_path:
+            logger.info("Dataset manifest generated: %s", manifest_path)
+        return manifest_path
+
+    def _build_null_reasons(
+        self,
+        financial_dict: dict[str, Any],
+        output_dict: dict[str, Any],
+    ) -> dict[str, Any] | None:
+        """出力した metrics の NULL 分類サイドカーの内容を返す。NULL 分類が無ければ None。"""
+        null_reasons = financial_dict.get("null_reasons")
+        if null_reasons is None:
+            return None
 
-        return str(output_path)
+        sidecar: dict[str, Any] = {
+            "schema_version": SCHEMA_VERSION,
+            "data_version": output_dict["data_version"],
+            "doc_id": output_dict["doc_id"],
+            "security_code": output_dict["security_code"],
+        }
+        for year in ("current_year", "prior_year"):
+            if year not in output_dict:
+                continue
+            reasons = null_reasons.get(year) or {}
+            sidecar[year] = {
+                key: reasons[key]
+                for key, value in output_dict[year]["metrics"].items()
+                if value is None and key in reasons
+            }
+
+        return sidecar
+
+
+def _output_variants(path: Path) -> list[Path]:
+    """path と同じ銘柄の、他の出力形式のファイルパス。"""
+    stem = dataset_stem(path.name)
+    return [
+        path.with_name(stem + suffix) for suffix in DATASET_SUFFIXES
+        if path.name != stem + suffix
+    ]
+
+
+def _output_exists(path: Path) -> bool:
+    """出力先（いずれかの出力形式）が既に存在するか。"""
+    return path.exists() or any(p.exists() for p in _output_variants(path))
+
+
+def _kept_variant(record: "_ExportRecord") -> WriteResult | None:
+    """出力先が他の出力形式でのみ存在し、その優先順位の方が高い場合の結果（既存を優先）。"""
+    if not record.existed or record.output_path.exists():
+        return None
+    for variant in _output_variants(record.output_path):
+        try:
+            existing = read_dataset_json(variant)
+        except FileNotFoundError:
+            continue
+        if not record.supersedes(existing):
+            return WriteResult(False, payload_hash(existing), kept=True)
+    return None
+
+
+def _stat_key(path: Path) -> tuple[int, int, int] | None:
+    """ファイルの識別子（inode, 更新時刻, サイズ）。rename で置き換えられると変わる。存在しない場合は None。"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+class _ExportRecord:
+    """検証・組み立て済みの出力1件（書き込み待ち）。"""
+
+    __slots__ = (
+        "output_path", "output_dict", "sidecar_path", "sidecar", "overwrite", "existed",
+        "result", "stale", "stat", "null_reasons",
+    )
+
+    def __init__(
+        self,
+        output_path: Path,
+        output_dict: dict[str, Any],
+        sidecar_path: Path,
+        sidecar: dict[str, Any] | None,
+    ) -> None:
+        self.output_path = output_path
+        self.output_dict = output_dict
+        self.sidecar_path = sidecar_path
+        self.sidecar = sidecar
+        self.overwrite = True
+        self.existed = False
+        # 書き込み結果（内容ハッシュ・サイズ・SHA-256）と、削除した旧形式のファイル名
+        self.result: WriteResult | None = None
+        self.stale: list[str] = []
+        # 書き込み直後の出力ファイルの識別子（_stat_key）
+        self.stat: tuple[int, int, int] | None = None
+        # current_year の fact_key → NULL 分類ID（サイドカーが無ければ空）
+        self.null_reasons: dict[str, str] = {}
+
+    def supersedes(self, existing: Any) -> bool:
+        """
+        内容の異なる既存の出力を上書きするか。
+
+        当該期の書類由来の出力は過年度（source: "history"）の出力を常に上書きし、その逆は上書きしない。
+        同じ種類の出力どうしは doc_id が既存以上の場合に上書きする
+        （EDINET の doc_id は提出順に大きくなるため、訂正報告書等の新しい文書を優先する）。
+        """
+        existing = existing if isinstance(existing, dict) else {}
+        return _priority(self.output_dict) >= _priority(existing)
+
+
+def _priority(output: dict[str, Any]) -> tuple[bool, str]:
+    """同じ出力先を持つ出力の優先順位（大きい方を優先）。過年度由来より当該期の書類由来、次に doc_id の大きい方。"""
+    return output.get("source") != HISTORY_SOURCE, output.get("doc_id") or ""
+
+
+# 未反映の出力を持つ JSONExporter（プロセス終了時に close() するフォールバック。明示的な close() を前提とする）
+_open_exporters: "weakref.WeakSet[JSONExporter]" = weakref.WeakSet()
+
+
+def _close_open_exporters() -> None:
+    for exporter in list(_open_exporters):
+        logger.warning("JSONExporter: close() されていないため終了時に保存します: %s", exporter.base_dir)
+        try:
+            exporter.close()
+        except Exception as e:
+            logger.warning("Failed to flush dataset metadata: %s", e)
+
+
+atexit.register(_close_open_exporters)
+
+
+class ExportSession:
+    """
+    JSONExporter のバッチ出力セッション（JSONExporter.session() で生成する）。
+
+    export() は呼び出し元スレッドで検証と出力内容の組み立てのみを行い、
+    JSON エンコード・ファイル書き込みをバックグラウンドの書き込みスレッドに渡す。
+    パイプライン（パース・正規化）はディスク書き込みを待たない。
+
+    - 同じ出力先への書き込みは export() の呼び出し順に行う
+    - overwrite=False は書き込み待ちの出力も既存として扱う
+    - 書き出し待ちが max_pending 件に達した場合のみ export() が待つ（メモリ使用量の上限）
+    - 終了時に全件の書き込みを待ち、dataset_manifest.json と決算期スナップショットを1回だけ保存する
+    - 書き込みエラーはログに記録し、終了時に最初のエラーを送出する
+    """
+
+    def __init__(
+        self,
+        exporter: JSONExporter,
+        *,
+        max_workers: int = DEFAULT_WRITER_THREADS,
+        max_pending: int = DEFAULT_MAX_PENDING,
+    ) -> None:
+        self._exporter = exporter
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="json-export",
+        )
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._manifest_lock = threading.Lock()
+        # 出力先 → 最後に投入した書き込み（呼び出し元スレッドのみが参照する）
+        self._pending: dict[Path, Future] = {}
+        self._errors: list[Exception] = []
+        self._closed = False
+
+    def __enter__(self) -> "ExportSession":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close(raise_errors=exc_type is None)
+
+    def export(self, financial_dict: dict[str, Any], *, overwrite: bool = True) -> str | None:
+        """
+        出力を書き込みキューに積み、保存先パスを返す（書き込み完了は待たない）。
+
+        検証エラーは JSONExporter.export() と同様に呼び出し元で ValueError を送出する。
+        overwrite=False で出力先が既に存在（または書き込み待ち）の場合は None を返す。
+        """
+        if self._closed:
+            raise RuntimeError("ExportSession は終了しています")
+
+        record = self._exporter._prepare(financial_dict)
+        record.overwrite = overwrite
+        path = record.output_path
+        previous = self._pending.get(path)
+        if not overwrite and (previous is not None or _output_exists(path)):
+            logger.info("JSONExporter: 既存のためスキップ - %s", path)
+            return None
+        self._exporter._load_manifest()
+
+        self._slots.acquire()
+        try:
+            self._pending[path] = self._executor.submit(self._write, record, previous)
+        except BaseException:
+            self._slots.release()
+            raise
+        return str(path)
+
+    def _write(self, record: _ExportRecord, previous: Future | None) -> None:
+        try:
+            if previous is not None:
+                wait((previous,))
+            if not self._exporter._write(record):
+                return
+            with self._manifest_lock:
+                self._exporter._record_metadata(record)
+        except Exception as e:
+            logger.error("JSONExporter: 書き込み失敗 - %s: %s", record.output_path, e)
+            with self._manifest_lock:
+                self._errors.append(e)
+        finally:
+            self._slots.release()
+
+    def close(self, *, raise_errors: bool = True) -> None:
+        """全件の書き込み完了を待ち、dataset_manifest.json と決算期スナップショットを保存する。"""
+        if self._closed:
+            return
+        self._closed = True
+        self._executor.shutdown(wait=True)
+        self._pending.clear()
+        self._exporter.flush()
+        if self._errors:
+            logger.error("JSONExporter: 書き込み失敗 %d 件", len(self._errors))
+            if raise_errors:
+                raise self._errors[0]
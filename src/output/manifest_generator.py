@@ -2,6 +2,19 @@
 DatasetManifestGenerator
 Data Repo内のフォルダをスキャンし、dataset_manifest.json を自動生成する。
 
+IncrementalManifest
+出力ファイルの追加に合わせて manifest をメモリ上で差分更新し、バッチ終了時に1回だけ保存する。
+全件スキャン（DatasetManifestGenerator.save()）は修復用に必要な時のみ行う。
+
+差分同期用に、決算期ディレクトリのファイル一覧（サイズ・SHA-256・最終変更日時・変更 revision）を
+metadata/files/{category}/{period}.json に保存し、manifest に単調増加の dataset_revision と
+決算期ごとの最終変更 revision（period_revisions）を持つ。
+利用側は前回同期した revision より新しい決算期のファイル一覧のみを取得し、変更ファイルのみを同期できる（changed_files()）。
+
+複数プロセスが同じ financial-dataset に出力する場合、保存はメタデータロック（dataset_lock.py）の中で行う。
+決算期の件数と NULL 分類の件数は差分ではなくファイル一覧（銘柄別ファイルごとの NULL 分類を含む）から数えるため、
+他プロセスの保存後の manifest に読み込み直して反映しても、反映順に依らず二重計上・計上漏れが起きない。
+
 型安全・拡張可能・Screening互換設計。
 
 外部データリポジトリ（financial-dataset）をスキャンする。
@@ -21,6 +34,16 @@ if str(_project_root) not in sys.path:
     sys.path.insert(0, str(_project_root))
 
 from src import __version__
+try:
+    from src.output.dataset_io import file_digest, write_json_if_changed
+    from src.output.dataset_lock import DatasetLock
+    from src.output.period_snapshot import SNAPSHOT_FILENAME
+    from src.output.serializer import DATASET_SUFFIXES, dataset_stem
+except ModuleNotFoundError:
+    from output.dataset_io import file_digest, write_json_if_changed
+    from output.dataset_lock import DatasetLock
+    from output.period_snapshot import SNAPSHOT_FILENAME
+    from output.serializer import DATASET_SUFFIXES, dataset_stem
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +52,10 @@ SCHEMA_VERSION = "1.0"
 ENGINE_VERSION = __version__
 # manifestに含めない無効な決算期（不正データ防止）
 EXCLUDED_PERIOD_NAMES = frozenset({"UNKNOWN"})
+# JSONExporter が保存する NULL 分類サイドカーのディレクトリ（base_path 基準）
+NULL_REASONS_DIR = Path("metadata") / "null_reasons"
+# 決算期ごとのファイル一覧の保存先（base_path 基準）
+FILE_INDEX_DIR = Path("metadata") / "files"
 
 
 class DatasetManifestGenerator:
@@ -44,6 +71,8 @@ class DatasetManifestGenerator:
         │   ├── 2025Q1/
         │   └── ...
         └── metadata/
+            ├── files/          # 決算期ごとのファイル一覧（差分同期用）
+            └── null_reasons/   # NULL 分類サイドカー（任意）
     """
 
     def __init__(self, base_path: str | None = None) -> None:
@@ -85,10 +114,7 @@ class DatasetManifestGenerator:
         record_counts: dict[str, int] = {}
 
         # サブディレクトリを走査
-        for period_dir in category_dir.iterdir():
-            if not period_dir.is_dir():
-                continue
-
+        for period_dir in _scan_dirs(category_dir):
             period_name = period_dir.name
 
             # 無効な決算期（UNKNOWN等）はスキップ
@@ -96,9 +122,8 @@ class DatasetManifestGenerator:
                 logger.debug("Skipping excluded period: %s", period_name)
                 continue
 
-            # .json ファイルのみカウント
-            json_files = list(period_dir.glob("*.json"))
-            count = len(json_files)
+            # 銘柄別ファイル（.json / .json.gz）のみカウント
+            count = sum(1 for _ in _scan_json_files(period_dir.path, DATASET_SUFFIXES))
 
             if count > 0:
                 periods.append(period_name)
@@ -117,6 +142,31 @@ class DatasetManifestGenerator:
 
         return periods, record_counts
 
+    def _scan_null_reasons(self, category: str) -> dict[str, dict[str, dict[str, int]]]:
+        """
+        指定カテゴリの NULL 分類サイドカーを集計する。
+
+        Returns:
+            決算期 → NULL 分類ID → fact_key → 件数（current_year の NULL のみ）。
+            サイドカーが無ければ空辞書。
+        """
+        category_dir = self.base_path / NULL_REASONS_DIR / category
+        if not category_dir.exists():
+            return {}
+
+        counts: dict[str, dict[str, dict[str, int]]] = {}
+        for period_dir in _scan_dirs(category_dir):
+            if period_dir.name in EXCLUDED_PERIOD_NAMES:
+                continue
+            period_counts: dict[str, dict[str, int]] = {}
+            for sidecar_path in _scan_json_files(period_dir.path):
+                for key, null_category in read_null_reasons(sidecar_path).items():
+                    by_key = period_counts.setdefault(null_category, {})
+                    by_key[key] = by_key.get(key, 0) + 1
+            if period_counts:
+                counts[period_dir.name] = _sorted_null_counts(period_counts)
+        return dict(sorted(counts.items()))
+
     def generate(self) -> dict[str, Any]:
         """
         フォルダ構造をスキャンし、manifest辞書を生成する。
@@ -135,6 +185,18 @@ class DatasetManifestGenerator:
         # UTC ISO8601形式の生成日時
         generated_at = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
 
+        # revision はファイルの変更履歴のためスキャンでは決まらない（保存済み manifest の値を引き継ぐ）
+        previous = self.load() or {}
+        previous_revisions = previous.get("period_revisions") or {}
+        period_revisions = {
+            category: {
+                period: revision
+                for period, revision in (previous_revisions.get(category) or {}).items()
+                if period in periods
+            }
+            for category, periods in (("annual", annual_periods), ("quarterly", quarterly_periods))
+        }
+
         manifest: dict[str, Any] = {
             "schema_version": SCHEMA_VERSION,
             "engine_version": ENGINE_VERSION,
@@ -147,6 +209,12 @@ class DatasetManifestGenerator:
                 "annual": annual_counts,  # 常に dict
                 "quarterly": quarterly_counts,  # 常に dict（空でも {}、null禁止）
             },
+            "null_reason_counts": {
+                "annual": self._scan_null_reasons("annual"),  # 常に dict
+                "quarterly": self._scan_null_reasons("quarterly"),  # 常に dict
+            },
+            "dataset_revision": previous.get("dataset_revision", 0),
+            "period_revisions": period_revisions,
         }
 
         logger.info(
@@ -162,23 +230,431 @@ class DatasetManifestGenerator:
 
         return manifest
 
-    def save(self) -> str:
+    @property
+    def manifest_path(self) -> Path:
+        return self.base_path / "metadata" / "dataset_manifest.json"
+
+    def load(self) -> dict[str, Any] | None:
+        """
+        保存済みの manifest を読み込む。
+
+        Returns:
+            manifest辞書。存在しない・形式が不正・schema_version が異なる場合は None。
+        """
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(manifest, dict) or manifest.get("schema_version") != SCHEMA_VERSION:
+            return None
+        for key in ("annual_periods", "quarterly_periods", "record_counts", "null_reason_counts"):
+            if key not in manifest:
+                return None
+        return manifest
+
+    def file_index_path(self, category: str, period: str) -> Path:
+        return self.base_path / FILE_INDEX_DIR / category / f"{period}.json"
+
+    def load_file_index(self, category: str, period: str) -> dict[str, Any] | None:
+        """
+        保存済みの決算期のファイル一覧を読み込む。
+
+        Returns:
+            {"schema_version", "category", "period", "revision", "null_reasons": true,
+             "files": {ファイル名: {"size", "sha256", "changed_at", "revision", "null_reasons"（任意）}}}。
+            銘柄別ファイルの null_reasons は NULL 分類サイドカーの current_year（fact_key → NULL 分類ID、無ければ省略）。
+            存在しない・形式が不正な場合は None。
+        """
+        try:
+            with open(self.file_index_path(category, period), "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(index, dict) or not isinstance(index.get("files"), dict):
+            return None
+        return index
+
+    def scan_file_index(self, category: str, period: str, revision: int) -> dict[str, Any]:
+        """
+        決算期ディレクトリの全ファイルのサイズ・SHA-256 からファイル一覧を生成する。
+
+        変更履歴が不明なため、全ファイルを revision で変更されたものとし、最終変更日時は mtime とする。
+        """
+        files: dict[str, dict[str, Any]] = {}
+        period_dir = self.base_path / category / period
+        if period_dir.is_dir():
+            for path in _scan_json_files(period_dir, _PERIOD_FILE_SUFFIXES):
+                size, sha256 = file_digest(path)
+                files[os.path.basename(path)] = {
+                    "size": size,
+                    "sha256": sha256,
+                    "changed_at": datetime.utcfromtimestamp(os.path.getmtime(path)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                    "revision": revision,
+                }
+        index = {
+            "schema_version": SCHEMA_VERSION,
+            "category": category,
+            "period": period,
+            "revision": revision,
+            "files": files,
+        }
+        self.fill_null_reasons(category, period, index)
+        return index
+
+    def fill_null_reasons(self, category: str, period: str, index: dict[str, Any]) -> None:
+        """ファイル一覧の銘柄別ファイルに NULL 分類サイドカーの current_year を設定する。"""
+        sidecar_dir = self.base_path / NULL_REASONS_DIR / category / period
+        for name, entry in index["files"].items():
+            stem = dataset_stem(name)
+            if stem is None:
+                continue
+            reasons = read_null_reasons(sidecar_dir / f"{stem}.json")
+            if reasons:
+                entry["null_reasons"] = dict(sorted(reasons.items()))
+            else:
+                entry.pop("null_reasons", None)
+        index["null_reasons"] = True
+
+    def _rescan_file_indexes(self, manifest: dict[str, Any]) -> None:
+        """
+        各決算期のファイル一覧を全件スキャンと照合して保存し直す（修復用）。
+
+        サイズ・SHA-256 が変わった・追加・削除されたファイルがある決算期は次の revision で変更されたものとし、
+        dataset_revision と period_revisions を進める（利用側のキャッシュ・差分同期が変更を検知できるようにする）。
+        変わっていないファイルは保存済みの revision・最終変更日時を引き継ぐ。
+        """
+        revision = manifest["dataset_revision"] + 1
+        changed = False
+        for category in ("annual", "quarterly"):
+            by_period = manifest["period_revisions"].setdefault(category, {})
+            for period in manifest[f"{category}_periods"]:
+                index = self.scan_file_index(category, period, revision)
+                saved = self.load_file_index(category, period)
+                saved_files = saved["files"] if saved is not None else {}
+                modified = saved is None or saved_files.keys() != index["files"].keys()
+                for name, entry in index["files"].items():
+                    previous = saved_files.get(name)
+                    if previous is None or (previous.get("size"), previous.get("sha256")) != (entry["size"], entry["sha256"]):
+                        modified = True
+                    else:
+                        entry["changed_at"] = previous.get("changed_at", entry["changed_at"])
+                        entry["revision"] = previous.get("revision", entry["revision"])
+                if modified:
+                    by_period[period] = revision
+                    changed = True
+                    logger.info("File index changed on rescan: %s/%s", category, period)
+                else:
+                    index["revision"] = saved.get("revision", by_period.get(period, 0))
+                self.save_file_index(category, period, index)
+            manifest["period_revisions"][category] = dict(sorted(by_period.items(), reverse=True))
+        if changed:
+            manifest["dataset_revision"] = revision
+
+    def save_file_index(self, category: str, period: str, index: dict[str, Any]) -> str:
+        """決算期のファイル一覧を保存する（ファイル名順）。"""
+        path = self.file_index_path(category, period)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_json_if_changed(path, {**index, "files": dict(sorted(index["files"].items()))})
+        return str(path)
+
+    def save(self, manifest: dict[str, Any] | None = None) -> str:
         """
         metadata/dataset_manifest.json に保存する。
 
+        Args:
+            manifest: 保存する manifest辞書。None の場合はフォルダを全件スキャンして生成する（修復用）。
+                ファイル一覧も全件スキャンで照合し、内容が変わった決算期の revision を進める。
+
         Returns:
             保存されたファイルのパス。
         """
-        manifest = self.generate()
+        if manifest is None:
+            with DatasetLock(self.base_path).metadata():
+                manifest = self.generate()
+                self._rescan_file_indexes(manifest)
+                return self.save(manifest)
 
         # metadata ディレクトリを作成
         metadata_dir = self.base_path / "metadata"
         metadata_dir.mkdir(parents=True, exist_ok=True)
 
-        # JSONファイルに保存
-        output_path = metadata_dir / "dataset_manifest.json"
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(manifest, f, indent=2, ensure_ascii=False)
-
-        logger.info("Manifest saved to: %s", output_path)
+        # JSONファイルに保存（generated_at 以外が同一なら書き込まない）
+        output_path = self.manifest_path
+        if write_json_if_changed(output_path, manifest):
+            logger.info("Manifest saved to: %s", output_path)
+        else:
+            logger.info("Manifest unchanged: %s", output_path)
         return str(output_path)
+
+
+class IncrementalManifest:
+    """
+    dataset_manifest.json をメモリ上で差分更新する。
+
+    load() で保存済み manifest を読み込み（無い・不正な場合のみ全件スキャン）、
+    record_file() / record_null_reasons() / remove_file() でファイル一覧を更新し、flush() で1回だけ保存する。
+    決算期の件数・NULL 分類の件数は、ファイル一覧が変わった決算期のみ flush() 時にファイル一覧から数え直す。
+    全件スキャンした manifest は変更ありとして扱う。
+    """
+
+    def __init__(self, generator: DatasetManifestGenerator | None = None) -> None:
+        self._generator = generator or DatasetManifestGenerator()
+        self._manifest: dict[str, Any] | None = None
+        # (category, period) → ファイル一覧（初回参照時に読み込む）
+        self._file_indexes: dict[tuple[str, str], dict[str, Any]] = {}
+        self._dirty_periods: set[tuple[str, str]] = set()
+        # NULL 分類のみ変わった決算期（revision を進めない）
+        self._null_dirty_periods: set[tuple[str, str]] = set()
+        self.dirty = False
+
+    def load(self) -> None:
+        """manifest を未読込なら読み込む（2回目以降は何もしない）。"""
+        self._state()
+
+    def reset(self) -> None:
+        """読み込み済みの manifest・ファイル一覧を破棄する（次の参照時に保存済みのものを読み直す）。"""
+        self._manifest = None
+        self._file_indexes.clear()
+        self._dirty_periods.clear()
+        self._null_dirty_periods.clear()
+        self.dirty = False
+
+    def _state(self) -> dict[str, Any]:
+        if self._manifest is None:
+            self._manifest = self._generator.load()
+            if self._manifest is None:
+                logger.info("Manifest not found or invalid, rescanning: %s", self._generator.base_path)
+                self._manifest = self._generator.generate()
+                self.dirty = True
+            self._manifest.setdefault("dataset_revision", 0)
+            revisions = self._manifest.setdefault("period_revisions", {})
+            for category in ("annual", "quarterly"):
+                revisions.setdefault(category, {})
+        return self._manifest
+
+    def _file_index(self, category: str, period: str) -> dict[str, Any]:
+        key = (category, period)
+        index = self._file_indexes.get(key)
+        if index is None:
+            index = self._generator.load_file_index(category, period)
+            if index is None:
+                # 変更履歴が不明なファイルは次の revision で変更されたものとする（利用側は再同期する）
+                index = self._generator.scan_file_index(
+                    category, period, self._state()["dataset_revision"] + 1,
+                )
+                self._dirty_periods.add(key)
+                self.dirty = True
+            elif not index.get("null_reasons"):
+                # NULL 分類を持たない旧形式のファイル一覧はサイドカーから補う
+                self._generator.fill_null_reasons(category, period, index)
+                self._null_dirty_periods.add(key)
+                self.dirty = True
+            self._file_indexes[key] = index
+        return index
+
+    def record_file(
+        self,
+        category: str,
+        period: str,
+        filename: str,
+        size: int,
+        sha256: str,
+        null_reasons: dict[str, str] | None = None,
+    ) -> None:
+        """
+        決算期ディレクトリのファイルの書き込みをファイル一覧に反映する（内容が同一なら変更なし）。
+
+        Args:
+            null_reasons: 銘柄別ファイルの NULL 分類（current_year の fact_key → NULL 分類ID）。None は変更なし
+        """
+        if period in EXCLUDED_PERIOD_NAMES:
+            return
+        files = self._file_index(category, period)["files"]
+        entry = files.get(filename)
+        if entry is not None and entry["size"] == size and entry["sha256"] == sha256:
+            if null_reasons is not None:
+                self.record_null_reasons(category, period, filename, null_reasons)
+            return
+        files[filename] = {
+            "size": size,
+            "sha256": sha256,
+            "changed_at": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "revision": self._state()["dataset_revision"] + 1,
+        }
+        if null_reasons is None and entry is not None and "null_reasons" in entry:
+            files[filename]["null_reasons"] = entry["null_reasons"]
+        elif null_reasons:
+            files[filename]["null_reasons"] = dict(sorted(null_reasons.items()))
+        self._dirty_periods.add((category, period))
+        self.dirty = True
+
+    def record_null_reasons(
+        self,
+        category: str,
+        period: str,
+        filename: str,
+        null_reasons: dict[str, str],
+    ) -> None:
+        """
+        銘柄別ファイルの NULL 分類の差し替えをファイル一覧に反映する。
+
+        ファイル自体は変わらないため revision は進めない（件数は flush() 時にファイル一覧から数え直す）。
+        """
+        if period in EXCLUDED_PERIOD_NAMES:
+            return
+        entry = self._file_index(category, period)["files"].get(filename)
+        if entry is None or entry.get("null_reasons", {}) == null_reasons:
+            return
+        if null_reasons:
+            entry["null_reasons"] = dict(sorted(null_reasons.items()))
+        else:
+            del entry["null_reasons"]
+        self._null_dirty_periods.add((category, period))
+        self.dirty = True
+
+    def remove_file(self, category: str, period: str, filename: str) -> None:
+        """削除したファイルをファイル一覧から除く。"""
+        if period in EXCLUDED_PERIOD_NAMES:
+            return
+        if self._file_index(category, period)["files"].pop(filename, None) is not None:
+            self._dirty_periods.add((category, period))
+            self.dirty = True
+
+    def flush(self) -> str | None:
+        """
+        変更があれば manifest を保存する。
+
+        Returns:
+            保存されたファイルのパス。変更が無ければ None。
+        """
+        if not self.dirty:
+            return None
+        manifest = self._state()
+        if self._dirty_periods:
+            revision = manifest["dataset_revision"] + 1
+            manifest["dataset_revision"] = revision
+            revisions = manifest["period_revisions"]
+            for category, period in sorted(self._dirty_periods):
+                self._file_indexes[(category, period)]["revision"] = revision
+                by_period = revisions.setdefault(category, {})
+                by_period[period] = revision
+                revisions[category] = dict(sorted(by_period.items(), reverse=True))
+        for category, period in sorted(self._dirty_periods | self._null_dirty_periods):
+            index = self._file_indexes[(category, period)]
+            self._generator.save_file_index(category, period, index)
+            self._update_counts(category, period, index)
+        self._dirty_periods.clear()
+        self._null_dirty_periods.clear()
+        manifest["engine_version"] = ENGINE_VERSION
+        manifest["generated_at"] = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+        path = self._generator.save(manifest)
+        self.dirty = False
+        return path
+
+    def _update_counts(self, category: str, period: str, index: dict[str, Any]) -> None:
+        """決算期の件数・NULL 分類の件数・決算期一覧・latest をファイル一覧に合わせる。"""
+        manifest = self._state()
+        count = 0
+        period_counts: dict[str, dict[str, int]] = {}
+        for name, entry in index["files"].items():
+            if not name.endswith(DATASET_SUFFIXES):
+                continue
+            count += 1
+            for key, null_category in (entry.get("null_reasons") or {}).items():
+                by_key = period_counts.setdefault(null_category, {})
+                by_key[key] = by_key.get(key, 0) + 1
+
+        counts = manifest["record_counts"].setdefault(category, {})
+        periods: list[str] = manifest[f"{category}_periods"]
+        if count > 0:
+            counts[period] = count
+            if period not in periods:
+                periods.append(period)
+                periods.sort(reverse=True)
+        else:
+            counts.pop(period, None)
+            if period in periods:
+                periods.remove(period)
+        manifest[f"latest_{category}"] = periods[0] if periods else None
+
+        by_period = manifest["null_reason_counts"].setdefault(category, {})
+        if period_counts:
+            by_period[period] = _sorted_null_counts(period_counts)
+        else:
+            by_period.pop(period, None)
+        manifest["null_reason_counts"][category] = dict(sorted(by_period.items()))
+
+
+def changed_files(
+    since_revision: int,
+    base_path: str | Path | None = None,
+) -> list[dict[str, Any]]:
+    """
+    since_revision より後に変更された決算期ディレクトリのファイルを返す（差分同期用）。
+
+    manifest の period_revisions で変更のあった決算期のファイル一覧のみを読み込む。
+
+    Returns:
+        [{"path": base_path からの相対パス, "size", "sha256", "changed_at", "revision"}]（revision 順）
+    """
+    generator = DatasetManifestGenerator(str(base_path) if base_path is not None else None)
+    manifest = generator.load() or {}
+    changed: list[dict[str, Any]] = []
+    for category, by_period in (manifest.get("period_revisions") or {}).items():
+        for period, revision in by_period.items():
+            if revision <= since_revision:
+                continue
+            index = generator.load_file_index(category, period)
+            if index is None:
+                continue
+            for name, entry in index["files"].items():
+                if entry["revision"] > since_revision:
+                    changed.append({
+                        "path": f"{category}/{period}/{name}",
+                        **{k: entry[k] for k in ("size", "sha256", "changed_at", "revision")},
+                    })
+    changed.sort(key=lambda e: (e["revision"], e["path"]))
+    return changed
+
+
+def read_null_reasons(sidecar_path: str | Path) -> dict[str, str]:
+    """
+    NULL 分類サイドカーの current_year を fact_key → NULL 分類ID で返す。
+
+    存在しない・読み込めない場合は空辞書。
+    """
+    try:
+        with open(sidecar_path, "r", encoding="utf-8") as f:
+            sidecar = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning("Failed to read null_reasons sidecar: %s (%s)", sidecar_path, e)
+        return {}
+    return {key: item["category"] for key, item in (sidecar.get("current_year") or {}).items()}
+
+
+# ファイル一覧の対象（銘柄別ファイルとスナップショット）
+_PERIOD_FILE_SUFFIXES = DATASET_SUFFIXES + (SNAPSHOT_FILENAME,)
+
+
+def _scan_dirs(path: Path) -> list[os.DirEntry]:
+    """path 直下のディレクトリを返す（os.scandir で stat を省略する）。"""
+    with os.scandir(path) as entries:
+        return [entry for entry in entries if entry.is_dir()]
+
+
+def _scan_json_files(path: str | Path, suffixes: tuple[str, ...] = (".json",)) -> list[str]:
+    """path 直下の suffixes で終わるファイルのパスを返す。"""
+    with os.scandir(path) as entries:
+        return [entry.path for entry in entries if entry.name.endswith(suffixes) and entry.is_file()]
+
+
+def _sorted_null_counts(
+    period_counts: dict[str, dict[str, int]],
+) -> dict[str, dict[str, int]]:
+    return {
+        null_category: dict(sorted(by_key.items()))
+        for null_category, by_key in sorted(period_counts.items())
+    }
@@ -0,0 +1,280 @@
+"""
+PeriodSnapshot
+決算期ごとの列指向スナップショット（{DATASET_PATH}/{report_type}/{data_version}/snapshot.npz）。
+
+決算期ディレクトリの全銘柄の current_year を1ファイル（非圧縮 npz）にまとめ、
+下流エンジンが数千の JSON を開かずに1回の読み込みで決算期全体を取得できるようにする。
+
+配列:
+    fact_keys            (k,)   列順（canonical_keys.yaml の fact_keys 定義順）
+    values               (n, k) float64（Fortran 順: 列ごとに連続）。null は NaN
+    null_mask            (n, k) bool。True = null
+    security_code / doc_id / period_start / period_end /
+    accounting_standard / consolidation_type  (n,) 文字列（欠損は空文字）
+
+行は security_code 順。JSONExporter が出力に合わせてメモリ上で差分更新し（SnapshotIndex）、
+保存はバッチ・セッションの終了時（JSONExporter.flush() / close()、ExportSession の終了）に1回だけ行う
+（保存は決算期全体の書き直しのため、export ごとには行わない）。
+ファイル名は .json / .json.gz で終わらないため manifest の集計対象にならない。
+
+非圧縮 npz のため、map_snapshot() は各配列を読み込まずにファイル上の位置へ直接メモリマップする。
+"""
+import logging
+import os
+import struct
+import zipfile
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+try:
+    from src.config_loader import get_fact_key_order
+    from src.output.dataset_io import atomic_writer
+    from src.output.serializer import DATASET_SUFFIXES, read_dataset_json
+except ModuleNotFoundError:
+    from config_loader import get_fact_key_order
+    from output.dataset_io import atomic_writer
+    from output.serializer import DATASET_SUFFIXES, read_dataset_json
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FILENAME = "snapshot.npz"
+STRING_COLUMNS = (
+    "security_code", "doc_id", "period_start", "period_end",
+    "accounting_standard", "consolidation_type",
+)
+
+_ARRAY_NAMES = frozenset(("fact_keys", "values", "null_mask") + STRING_COLUMNS)
+
+_Row = tuple[tuple[str, ...], tuple[float | None, ...]]
+
+
+def snapshot_row(output_dict: dict[str, Any], fact_keys: tuple[str, ...]) -> _Row:
+    """JSONExporter の出力1件をスナップショットの1行（文字列列, 値）に変換する。"""
+    current = output_dict.get("current_year") or {}
+    metrics = current.get("metrics") or {}
+    period = current.get("period") or {}
+    strings = (
+        output_dict.get("security_code") or "",
+        output_dict.get("doc_id") or "",
+        period.get("start") or "",
+        period.get("end") or "",
+        output_dict.get("accounting_standard") or "",
+        output_dict.get("consolidation_type") or "",
+    )
+    values = tuple(
+        None if metrics.get(key) is None else float(metrics[key]) for key in fact_keys
+    )
+    return strings, values
+
+
+class PeriodSnapshot:
+    """1決算期ディレクトリのスナップショット（security_code → 行）。"""
+
+    __slots__ = ("path", "fact_keys", "rows", "dirty")
+
+    def __init__(self, path: Path, fact_keys: tuple[str, ...]) -> None:
+        self.path = path
+        self.fact_keys = fact_keys
+        self.rows: dict[str, _Row] = {}
+        self.dirty = False
+
+    @classmethod
+    def open(cls, period_dir: str | Path, fact_keys: tuple[str, ...] | None = None) -> "PeriodSnapshot":
+        """
+        保存済みスナップショットを読み込む。
+
+        無い・読み込めない・列構成が異なる場合は決算期ディレクトリの JSON を全件読み込んで再構築する。
+        """
+        period_dir = Path(period_dir)
+        snapshot = cls(period_dir / SNAPSHOT_FILENAME, fact_keys or get_fact_key_order())
+        if not snapshot._load():
+            logger.info("Snapshot not found or outdated, rebuilding: %s", period_dir)
+            snapshot._scan(period_dir)
+        return snapshot
+
+    def _load(self) -> bool:
+        arrays = load_snapshot(self.path)
+        if arrays is None or not _ARRAY_NAMES <= arrays.keys():
+            return False
+        if tuple(arrays["fact_keys"].tolist()) != self.fact_keys:
+            return False
+        strings = zip(*(arrays[column].tolist() for column in STRING_COLUMNS))
+        values = np.where(arrays["null_mask"], None, arrays["values"]).tolist()
+        for row_strings, row_values in zip(strings, values):
+            self.rows[row_strings[0]] = (row_strings, tuple(row_values))
+        return True
+
+    def _scan(self, period_dir: Path) -> None:
+        if period_dir.is_dir():
+            with os.scandir(period_dir) as entries:
+                for entry in entries:
+                    if not (entry.name.endswith(DATASET_SUFFIXES) and entry.is_file()):
+                        continue
+                    try:
+                        self.update(read_dataset_json(entry.path))
+                    except (OSError, ValueError) as e:
+                        logger.warning("Failed to read dataset file: %s (%s)", entry.path, e)
+        self.dirty = True
+
+    def update(self, output_dict: dict[str, Any]) -> None:
+        """出力1件の行を追加・差し替える（内容が同一なら変更なし）。"""
+        row = snapshot_row(output_dict, self.fact_keys)
+        if self.rows.get(row[0][0]) != row:
+            self.rows[row[0][0]] = row
+            self.dirty = True
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """スナップショットの配列（security_code 順）を返す。"""
+        codes = sorted(self.rows)
+        k = len(self.fact_keys)
+        values = np.full((len(codes), k), np.nan, order="F")
+        null_mask = np.ones((len(codes), k), dtype=bool, order="F")
+        columns: list[list[str]] = [[] for _ in STRING_COLUMNS]
+        for i, code in enumerate(codes):
+            strings, row_values = self.rows[code]
+            for column, value in zip(columns, strings):
+                column.append(value)
+            for j, value in enumerate(row_values):
+                if value is not None:
+                    values[i, j] = value
+                    null_mask[i, j] = False
+
+        arrays: dict[str, np.ndarray] = {
+            "fact_keys": np.asarray(self.fact_keys, dtype=str),
+            "values": values,
+            "null_mask": null_mask,
+        }
+        for name, column in zip(STRING_COLUMNS, columns):
+            arrays[name] = np.asarray(column, dtype=str)
+        return arrays
+
+    def save(self) -> str:
+        """スナップショットを保存する（一時ファイル + rename）。"""
+        with atomic_writer(self.path, "wb") as f:
+            np.savez(f, **self.to_arrays())
+        self.dirty = False
+        logger.info("Snapshot saved to: %s (%d rows)", self.path, len(self.rows))
+        return str(self.path)
+
+
+class SnapshotIndex:
+    """
+    出力先配下の決算期スナップショットを出力に合わせて差分更新する。
+
+    決算期ごとに初回の update() で保存済みスナップショットを読み込み（無ければ再構築）、
+    flush() で変更のあった決算期のみ保存する。update() はファイルに書き込まない。
+    """
+
+    def __init__(self, base_dir: str | Path, fact_keys: tuple[str, ...] | None = None) -> None:
+        self.base_dir = Path(base_dir)
+        self.fact_keys = fact_keys or get_fact_key_order()
+        self._snapshots: dict[tuple[str, str], PeriodSnapshot] = {}
+
+    def update(self, output_dict: dict[str, Any]) -> None:
+        """JSONExporter の出力1件を該当決算期のスナップショットに反映する。"""
+        key = (output_dict["report_type"], output_dict["data_version"])
+        snapshot = self._snapshots.get(key)
+        if snapshot is None:
+            snapshot = self._snapshots[key] = PeriodSnapshot.open(
+                self.base_dir.joinpath(*key), self.fact_keys,
+            )
+        snapshot.update(output_dict)
+
+    def reset(self) -> None:
+        """読み込み済みのスナップショットを破棄する（次の update() で保存済みのものを読み直す）。"""
+        self._snapshots.clear()
+
+    def flush(self) -> list[str]:
+        """
+        変更のあった決算期のスナップショットを保存する。
+
+        Returns:
+            保存されたファイルのパス。
+        """
+        return [snapshot.save() for snapshot in self._snapshots.values() if snapshot.dirty]
+
+
+def load_snapshot(path: str | Path) -> dict[str, np.ndarray] | None:
+    """
+    スナップショットを1回の読み込みで配列辞書として返す。
+
+    Returns:
+        {配列名: ndarray}。存在しない・読み込めない場合は None。
+    """
+    try:
+        with np.load(path, allow_pickle=False) as npz:
+            return {name: npz[name] for name in npz.files}
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning("Failed to read snapshot: %s (%s)", path, e)
+        return None
+
+
+def load_period_snapshot(
+    report_type: str,
+    data_version: str,
+    base_dir: str | Path | None = None,
+) -> dict[str, np.ndarray] | None:
+    """
+    決算期のスナップショットを読み込む。
+
+    Args:
+        report_type: "annual" または "quarterly"
+        data_version: 決算期（例: "2025FY"）
+        base_dir: financial-dataset のパス。None の場合は DATASET_PATH 環境変数
+    """
+    if base_dir is None:
+        base_dir = os.environ.get("DATASET_PATH")
+        if not base_dir:
+            raise EnvironmentError("DATASET_PATH 環境変数が設定されていません。")
+    return load_snapshot(Path(base_dir) / report_type / data_version / SNAPSHOT_FILENAME)
+
+
+def map_snapshot(path: str | Path) -> dict[str, np.ndarray] | None:
+    """
+    スナップショットの各配列を読み込まずにメモリマップで返す（読み取り専用）。
+
+    npz 内の .npy が非圧縮で格納されていることを利用し、各配列のデータ位置に np.memmap する。
+    圧縮されている等でマップできない場合は load_snapshot() で読み込む。
+
+    Returns:
+        {配列名: ndarray（np.memmap）}。存在しない・読み込めない場合は None。
+    """
+    try:
+        with zipfile.ZipFile(path) as archive, open(path, "rb") as f:
+            arrays: dict[str, np.ndarray] = {}
+            for info in archive.infolist():
+                if info.compress_type != zipfile.ZIP_STORED or not info.filename.endswith(".npy"):
+                    return load_snapshot(path)
+                arrays[info.filename[:-4]] = _map_member(path, f, info)
+            return arrays
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, zipfile.BadZipFile) as e:
+        logger.warning("Failed to map snapshot: %s (%s)", path, e)
+        return None
+
+
+def _map_member(path: str | Path, f, info: zipfile.ZipInfo) -> np.ndarray:
+    # ローカルファイルヘッダ（30バイト + ファイル名 + 拡張フィールド）の後ろが .npy の先頭
+    f.seek(info.header_offset + 26)
+    name_length, extra_length = struct.unpack("<HH", f.read(4))
+    start = info.header_offset + 30 + name_length + extra_length
+    f.seek(start)
+    version = np.lib.format.read_magic(f)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+    else:
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+    if dtype.hasobject:
+        raise ValueError(f"object 配列はマップできません: {info.filename}")
+    if 0 in shape or not shape:
+        # 空配列・0次元配列は mmap できないため読み込む
+        f.seek(start)
+        return np.lib.format.read_array(f, allow_pickle=False)
+    return np.memmap(
+        path, dtype=dtype, mode="r", offset=f.tell(), shape=shape, order="F" if fortran_order else "C",
+    )
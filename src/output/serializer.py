@@ -0,0 +1,132 @@
+"""
+DatasetSerializer
+financial-dataset の銘柄別ファイルのエンコード形式。
+
+| 名前 | 拡張子 | 内容 |
+|---|---|---|
+| pretty（既定） | .json | indent=2 の JSON（従来出力とバイト互換） |
+| compact | .json | 空白なし JSON。円金額（data_type: monetary）の整数値は整数で出力 |
+| gzip | .json.gz | compact を gzip 圧縮 |
+
+orjson がインストールされていれば compact / gzip のエンコードと read_dataset_json のデコードに使う
+（pretty は従来出力とのバイト互換のため標準 json を使う）。
+読み込みは read_dataset_json() が形式を判別する（gzip はマジックバイトで判定）。
+"""
+import gzip
+import json
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # 任意依存（未インストール時は標準 json）
+    orjson = None
+
+try:
+    from src.config_loader import get_monetary_fact_keys
+except ModuleNotFoundError:
+    from config_loader import get_monetary_fact_keys
+
+JSON_SUFFIX = ".json"
+GZIP_SUFFIX = ".json.gz"
+# 銘柄別ファイルの拡張子（manifest の件数・スナップショットの再構築の対象）
+DATASET_SUFFIXES = (JSON_SUFFIX, GZIP_SUFFIX)
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+class DatasetSerializer:
+    """pretty: indent=2 の JSON（既定・従来形式）。"""
+
+    name = "pretty"
+    suffix = JSON_SUFFIX
+
+    def prepare(self, data: dict[str, Any]) -> dict[str, Any]:
+        """エンコード前の出力内容（内容ハッシュはこの結果で比較する）。"""
+        return data
+
+    def dumps(self, payload: dict[str, Any]) -> bytes:
+        """prepare() 済みの内容をバイト列にエンコードする。"""
+        return json.dumps(payload, indent=2, ensure_ascii=False).encode("utf-8")
+
+    def encode(self, data: dict[str, Any]) -> bytes:
+        return self.dumps(self.prepare(data))
+
+
+class CompactSerializer(DatasetSerializer):
+    """compact: 空白なし JSON。円金額の整数値は整数で出力する。"""
+
+    name = "compact"
+
+    def prepare(self, data: dict[str, Any]) -> dict[str, Any]:
+        return yen_as_int(data)
+
+    def dumps(self, payload: dict[str, Any]) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(payload)
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class GzipSerializer(CompactSerializer):
+    """gzip: compact を gzip 圧縮（mtime=0 で同一内容は同一バイト列）。"""
+
+    name = "gzip"
+    suffix = GZIP_SUFFIX
+
+    def dumps(self, payload: dict[str, Any]) -> bytes:
+        return gzip.compress(super().dumps(payload), compresslevel=6, mtime=0)
+
+
+SERIALIZERS: dict[str, type[DatasetSerializer]] = {
+    cls.name: cls for cls in (DatasetSerializer, CompactSerializer, GzipSerializer)
+}
+
+
+def get_serializer(serializer: str | DatasetSerializer | None = None) -> DatasetSerializer:
+    """名前（pretty / compact / gzip）または DatasetSerializer から serializer を返す。None は pretty。"""
+    if isinstance(serializer, DatasetSerializer):
+        return serializer
+    name = serializer or DatasetSerializer.name
+    if name not in SERIALIZERS:
+        raise ValueError(f"未定義の出力形式: {name}（{', '.join(SERIALIZERS)}）")
+    return SERIALIZERS[name]()
+
+
+def yen_as_int(data: dict[str, Any]) -> dict[str, Any]:
+    """current_year / prior_year の円金額のうち整数値の float を int に置き換えた浅いコピーを返す。"""
+    monetary = get_monetary_fact_keys()
+    result = dict(data)
+    for year in ("current_year", "prior_year"):
+        block = data.get(year)
+        if not isinstance(block, dict) or not isinstance(block.get("metrics"), dict):
+            continue
+        result[year] = {**block, "metrics": {
+            key: int(value)
+            if key in monetary and isinstance(value, float) and value.is_integer()
+            else value
+            for key, value in block["metrics"].items()
+        }}
+    return result
+
+
+def decode_dataset_bytes(raw: bytes) -> Any:
+    """銘柄別ファイルのバイト列をデコードする（gzip は自動判別）。"""
+    if raw[:2] == _GZIP_MAGIC:
+        raw = gzip.decompress(raw)
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def read_dataset_json(path: str | Path) -> Any:
+    """銘柄別ファイル（pretty / compact / gzip のいずれか）を読み込む。"""
+    with open(path, "rb") as f:
+        return decode_dataset_bytes(f.read())
+
+
+def dataset_stem(filename: str) -> str | None:
+    """銘柄別ファイル名から拡張子を除いた名前（security_code）を返す。対象外のファイルは None。"""
+    for suffix in (GZIP_SUFFIX, JSON_SUFFIX):
+        if filename.endswith(suffix):
+            return filename[: -len(suffix)]
+    return None
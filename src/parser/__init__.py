@@ -1,6 +1,8 @@
 """
 XBRLパーサーモジュール
 """
-from .xbrl_parser import XBRLParser
+from .fact_table import Fact, FactTable
+from .parse_cache import ParseCache
+from .xbrl_parser import TagFilter, XBRLParser
 
-__all__ = ["XBRLParser"]
+__all__ = ["Fact", "FactTable", "ParseCache", "TagFilter", "XBRLParser"]
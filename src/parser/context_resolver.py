@@ -5,9 +5,14 @@ XBRLのcontextノードを解析し、contextRef → 期間情報のマップを
 責務:
   - XBRLインスタンスの xbrli:context を走査
   - instant / duration を判定し context_map を返す
-  - 日付解決（current_year / prior_year 判定）は FactNormalizer の責務
+  - segment / scenario の xbrldi:explicitMember から dimension を解析
+  - 連結/単体・セグメント有無・日付序数・当期/前期区分を context ごとに事前計算
+
+XBRLParser.parse() は単一走査で context_map を構築済みのため、
+通常は ContextResolver.from_parsed() でその結果を参照するだけの薄いビューとして使う。
 """
 import logging
+from datetime import datetime
 from typing import Any
 
 from lxml import etree
@@ -15,6 +20,206 @@ from lxml import etree
 logger = logging.getLogger(__name__)
 
 XBRLI_NS = "http://www.xbrl.org/2003/instance"
+CONTEXT_TAG = f"{{{XBRLI_NS}}}context"
+
+_PERIOD_TAG = f"{{{XBRLI_NS}}}period"
+_INSTANT_TAG = f"{{{XBRLI_NS}}}instant"
+_START_DATE_TAG = f"{{{XBRLI_NS}}}startDate"
+_END_DATE_TAG = f"{{{XBRLI_NS}}}endDate"
+_ENTITY_TAG = f"{{{XBRLI_NS}}}entity"
+_SEGMENT_TAG = f"{{{XBRLI_NS}}}segment"
+_SCENARIO_TAG = f"{{{XBRLI_NS}}}scenario"
+_EXPLICIT_MEMBER_TAG = "{http://xbrl.org/2006/xbrldi}explicitMember"
+
+# 連結/単体区分を表すメンバー。セグメント dimension とはみなさない
+_NON_CONSOLIDATED_MEMBER = "NonConsolidatedMember"
+_CONSOLIDATION_MEMBERS = frozenset({"ConsolidatedMember", _NON_CONSOLIDATED_MEMBER})
+
+# build_context_map() が付与する派生属性
+DERIVED_CONTEXT_KEYS = (
+    "is_consolidated", "has_segment_dimension", "date_ordinal",
+    "is_current_year", "is_prior_year",
+)
+
+
+def _local_name(qname: str) -> str:
+    """QName 文字列からローカル名を取得する（prefix:local → local）。"""
+    return qname.rpartition(":")[2]
+
+
+def _parse_dimensions(context_elem: etree._Element) -> dict[str, str]:
+    """entity/segment と scenario の xbrldi:explicitMember を {dimension: member} で返す。"""
+    dimensions: dict[str, str] = {}
+    containers = []
+    entity_elem = context_elem.find(_ENTITY_TAG)
+    if entity_elem is not None:
+        containers.append(entity_elem.find(_SEGMENT_TAG))
+    containers.append(context_elem.find(_SCENARIO_TAG))
+    for container in containers:
+        if container is None:
+            continue
+        for member_elem in container.iter(_EXPLICIT_MEMBER_TAG):
+            dimension = member_elem.get("dimension")
+            if dimension:
+                dimensions[dimension] = (member_elem.text or "").strip()
+    return dimensions
+
+
+def _date_ordinal(value: str | None) -> int | None:
+    """YYYY-MM-DD を日付序数に変換する。解析できない場合は None。"""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").toordinal()
+    except ValueError:
+        return None
+
+
+def _is_consolidated_context_id(context_ref: str) -> bool:
+    """contextRef の命名から連結か判定する（dimension 未解析の context_map 用）。"""
+    return "NonConsolidated" not in context_ref
+
+
+def _has_member_dimension_id(context_ref: str) -> bool:
+    """contextRef の命名からセグメント dimension の有無を判定する（dimension 未解析の context_map 用）。
+
+    NonConsolidatedMember は連結/単体区分なので除外対象外。
+    """
+    if "Member" not in context_ref:
+        return False
+    if context_ref.endswith("_NonConsolidatedMember"):
+        return False
+    for part in context_ref.split("_")[1:]:
+        if "Member" in part and part != _NON_CONSOLIDATED_MEMBER:
+            return True
+    return False
+
+
+def resolve_period_ends(
+    context_map: dict[str, dict[str, Any]],
+    count: int,
+) -> list[str | None]:
+    """context_map の duration end_date から当期末・1期前末・…・(count-1)期前末を算出する。
+
+    当期末は最も新しい end_date。k 期前末は年が当期末の年 - k となる最も新しい end_date
+    （該当なしは None）。有価証券報告書の「主要な経営指標等の推移」は4期前まで持つ。
+    """
+    ends: list[str | None] = [None] * count
+    end_dates: list[str] = []
+    for ctx in context_map.values():
+        if ctx.get("type") == "duration" and ctx.get("end_date"):
+            end_dates.append(ctx["end_date"])
+    if not end_dates or count <= 0:
+        return ends
+
+    sorted_dates = sorted(set(end_dates), reverse=True)
+    ends[0] = sorted_dates[0]
+    try:
+        current_year = datetime.strptime(sorted_dates[0], "%Y-%m-%d").year
+    except ValueError:
+        logger.warning("日付解析失敗: %s", sorted_dates[0])
+        return ends
+    for d in sorted_dates:
+        try:
+            offset = current_year - datetime.strptime(d, "%Y-%m-%d").year
+        except ValueError:
+            continue
+        if 0 < offset < count and ends[offset] is None:
+            ends[offset] = d
+    return ends
+
+
+def resolve_year_ends(
+    context_map: dict[str, dict[str, Any]],
+) -> tuple[str | None, str | None]:
+    """context_map の duration end_date から current_year_end / prior_year_end を算出する。"""
+    current_year_end, prior_year_end = resolve_period_ends(context_map, 2)
+    return current_year_end, prior_year_end
+
+
+def context_date(ctx: dict[str, Any]) -> str:
+    """context の基準日（instant は date、duration は end_date）を返す。"""
+    if ctx.get("type") == "instant":
+        return ctx.get("date", "")
+    return ctx.get("end_date", "")
+
+
+def annotate_context_map(
+    context_map: dict[str, dict[str, Any]],
+) -> dict[str, dict[str, Any]]:
+    """各 context に派生属性（DERIVED_CONTEXT_KEYS）を付与した context_map を返す。
+
+    dimensions を持たない context（旧形式の context_map）は contextRef の命名から判定する。
+    元の context_map は変更しない。
+    """
+    current_year_end, prior_year_end = resolve_year_ends(context_map)
+    annotated: dict[str, dict[str, Any]] = {}
+    for context_id, ctx in context_map.items():
+        info = dict(ctx)
+        dimensions = ctx.get("dimensions")
+        if dimensions is None:
+            info["is_consolidated"] = _is_consolidated_context_id(context_id)
+            info["has_segment_dimension"] = _has_member_dimension_id(context_id)
+        else:
+            members = [_local_name(m) for m in dimensions.values()]
+            info["is_consolidated"] = _NON_CONSOLIDATED_MEMBER not in members
+            info["has_segment_dimension"] = any(
+                m not in _CONSOLIDATION_MEMBERS for m in members
+            )
+        base_date = context_date(ctx)
+        info["date_ordinal"] = _date_ordinal(base_date)
+        has_period = ctx.get("type") in ("duration", "instant")
+        info["is_current_year"] = (
+            has_period and current_year_end is not None and base_date == current_year_end
+        )
+        info["is_prior_year"] = (
+            has_period and prior_year_end is not None and base_date == prior_year_end
+        )
+        annotated[context_id] = info
+    return annotated
+
+
+def is_annotated(context_map: dict[str, dict[str, Any]]) -> bool:
+    """context_map が annotate_context_map() 済みか判定する。"""
+    return all("is_current_year" in ctx for ctx in context_map.values())
+
+
+def parse_context_element(context_elem: etree._Element) -> tuple[str, dict[str, Any]] | None:
+    """
+    xbrli:context 要素1つを解析し、(context_id, context情報) を返す。
+
+    context情報には期間と dimensions（{dimension QName: member QName}）を含む。
+    id または期間情報が欠けている場合は None を返す。
+    """
+    context_id = context_elem.get("id")
+    if not context_id:
+        return None
+
+    period_elem = context_elem.find(_PERIOD_TAG)
+    if period_elem is None:
+        return None
+
+    instant_elem = period_elem.find(_INSTANT_TAG)
+    if instant_elem is not None and instant_elem.text:
+        return context_id, {
+            "type": "instant",
+            "date": instant_elem.text.strip(),
+            "dimensions": _parse_dimensions(context_elem),
+        }
+
+    start_date_elem = period_elem.find(_START_DATE_TAG)
+    end_date_elem = period_elem.find(_END_DATE_TAG)
+    if start_date_elem is not None and end_date_elem is not None:
+        start_date = start_date_elem.text.strip() if start_date_elem.text else ""
+        end_date = end_date_elem.text.strip() if end_date_elem.text else ""
+        if start_date and end_date:
+            return context_id, {
+                "type": "duration",
+                "start_date": start_date,
+                "end_date": end_date,
+                "dimensions": _parse_dimensions(context_elem),
+            }
+    return None
 
 
 class ContextResolver:
@@ -23,14 +228,39 @@ class ContextResolver:
     contextRef をキーとする context_map を構築する。
 
     context_map の各値:
-      - duration: {"type": "duration", "start_date": "...", "end_date": "..."}
-      - instant:  {"type": "instant", "date": "..."}
+      - duration: {"type": "duration", "start_date": "...", "end_date": "...", ...}
+      - instant:  {"type": "instant", "date": "...", ...}
+
+    共通の付加属性:
+      - dimensions: {dimension QName: member QName}
+      - is_consolidated: NonConsolidatedMember を持たなければ True
+      - has_segment_dimension: 連結/単体区分以外のメンバーを持てば True
+      - date_ordinal: 基準日（instant は date、duration は end_date）の日付序数
+      - is_current_year / is_prior_year: 基準日が当期末 / 前期末と一致するか
     """
 
-    def __init__(self, xbrl_root: etree._Element) -> None:
+    def __init__(
+        self,
+        xbrl_root: etree._Element | None = None,
+        *,
+        context_map: dict[str, dict[str, Any]] | None = None,
+    ) -> None:
+        """
+        Args:
+            xbrl_root: XBRLルート要素。context_map 未指定時に走査する。
+            context_map: XBRLParser が構築済みの context_map。指定時は再走査しない。
+        """
+        if xbrl_root is None and context_map is None:
+            raise ValueError("xbrl_root または context_map のいずれかを指定してください")
         self._root = xbrl_root
+        self._raw_context_map = context_map
         self._context_map: dict[str, dict[str, Any]] | None = None
 
+    @classmethod
+    def from_parsed(cls, parsed_data: dict[str, Any]) -> "ContextResolver":
+        """XBRLParser.parse() の結果から、構築済み context_map を参照する ContextResolver を返す。"""
+        return cls(context_map=parsed_data["context_map"])
+
     def build_context_map(self) -> dict[str, dict[str, Any]]:
         """
         contextノードを解析し、contextRef -> context情報のマップを構築する。
@@ -41,41 +271,17 @@ class ContextResolver:
         if self._context_map is not None:
             return self._context_map
 
-        context_map: dict[str, dict[str, Any]] = {}
-
-        for context_elem in self._root.iter():
-            if etree.QName(context_elem).namespace != XBRLI_NS:
-                continue
-            if etree.QName(context_elem).localname != "context":
-                continue
-
-            context_id = context_elem.get("id")
-            if not context_id:
-                continue
-
-            period_elem = context_elem.find(f"{{{XBRLI_NS}}}period")
-            if period_elem is None:
-                continue
-
-            instant_elem = period_elem.find(f"{{{XBRLI_NS}}}instant")
-            start_date_elem = period_elem.find(f"{{{XBRLI_NS}}}startDate")
-            end_date_elem = period_elem.find(f"{{{XBRLI_NS}}}endDate")
-
-            if instant_elem is not None and instant_elem.text:
-                context_map[context_id] = {
-                    "type": "instant",
-                    "date": instant_elem.text.strip(),
-                }
-            elif start_date_elem is not None and end_date_elem is not None:
-                start_date = start_date_elem.text.strip() if start_date_elem.text else ""
-                end_date = end_date_elem.text.strip() if end_date_elem.text else ""
-                if start_date and end_date:
-                    context_map[context_id] = {
-                        "type": "duration",
-                        "start_date": start_date,
-                        "end_date": end_date,
-                    }
-
-        self._context_map = context_map
-        logger.debug("context_map構築完了: %d件", len(context_map))
-        return context_map
+        context_map = self._raw_context_map
+        if context_map is None:
+            context_map = {}
+            for context_elem in self._root.iter(CONTEXT_TAG):
+                parsed = parse_context_element(context_elem)
+                if parsed is not None:
+                    context_map[parsed[0]] = parsed[1]
+
+        # ParseCache から復元した context_map は派生属性付与済み
+        self._context_map = (
+            context_map if is_annotated(context_map) else annotate_context_map(context_map)
+        )
+        logger.debug("context_map構築完了: %d件", len(self._context_map))
+        return self._context_map
@@ -0,0 +1,301 @@
+"""
+FactTable
+XBRLParser が抽出した fact を列指向で保持するコンパクトな表現。
+
+tag / contextRef / unitRef / decimals は文字列プールで intern し、
+行ごとには整数IDのみを保持する。value は並列リスト、is_nil はビットマップで持つ。
+
+後方互換:
+  - FactTable を反復すると各行の Fact ビューを返す
+  - Fact は dict と同じく f.get("tag") / f["value"] / "tag" in f でアクセスできる
+"""
+from array import array
+from collections.abc import Callable, Hashable, Iterable, Iterator, Mapping
+from typing import Any
+
+FACT_FIELDS = ("tag", "contextRef", "unitRef", "decimals", "value", "is_nil")
+
+
+class _StringPool:
+    """文字列 -> 連番ID の intern テーブル。"""
+
+    __slots__ = ("ids", "strings")
+
+    def __init__(self) -> None:
+        self.ids: dict[str, int] = {}
+        self.strings: list[str] = []
+
+    def intern(self, s: str) -> int:
+        """文字列のIDを返す。未登録なら追加する。"""
+        sid = self.ids.get(s)
+        if sid is None:
+            sid = len(self.strings)
+            self.ids[s] = sid
+            self.strings.append(s)
+        return sid
+
+
+class Fact:
+    """FactTable の1行を参照する読み取り専用ビュー（dict 互換アクセスを提供）。"""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "FactTable", index: int) -> None:
+        self._table = table
+        self._index = index
+
+    @property
+    def index(self) -> int:
+        """FactTable 内の行番号。"""
+        return self._index
+
+    @property
+    def tag(self) -> str:
+        return self._table.tags.strings[self._table.tag_ids[self._index]]
+
+    @property
+    def context_ref(self) -> str:
+        return self._table.contexts.strings[self._table.context_ids[self._index]]
+
+    @property
+    def unit_ref(self) -> str:
+        return self._table.units.strings[self._table.unit_ids[self._index]]
+
+    @property
+    def decimals(self) -> str:
+        return self._table.decimals.strings[self._table.decimals_ids[self._index]]
+
+    @property
+    def value(self) -> str:
+        return self._table.values[self._index]
+
+    @property
+    def is_nil(self) -> bool:
+        return self._table.is_nil(self._index)
+
+    def __getitem__(self, key: str) -> Any:
+        getter = _FIELD_GETTERS.get(key)
+        if getter is None:
+            raise KeyError(key)
+        return getter(self)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        getter = _FIELD_GETTERS.get(key)
+        if getter is None:
+            return default
+        return getter(self)
+
+    def keys(self) -> tuple[str, ...]:
+        return FACT_FIELDS
+
+    def __contains__(self, key: object) -> bool:
+        return key in _FIELD_GETTERS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(FACT_FIELDS)
+
+    def to_dict(self) -> dict[str, Any]:
+        """従来形式（6キーの dict）に変換する。"""
+        return {key: _FIELD_GETTERS[key](self) for key in FACT_FIELDS}
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Mapping):
+            return self.to_dict() == dict(other)
+        if hasattr(other, "to_dict"):
+            return self.to_dict() == other.to_dict()
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
+
+
+_FIELD_GETTERS = {
+    "tag": Fact.tag.fget,
+    "contextRef": Fact.context_ref.fget,
+    "unitRef": Fact.unit_ref.fget,
+    "decimals": Fact.decimals.fget,
+    "value": Fact.value.fget,
+    "is_nil": Fact.is_nil.fget,
+}
+
+
+class FactTable:
+    """
+    fact の列指向テーブル。
+
+    列:
+      tag_ids / context_ids / unit_ids / decimals_ids: 各文字列プールへのID（array）
+      values: 値文字列のリスト（nil の場合は空文字）
+      nil ビットマップ: is_nil(i) で参照
+    """
+
+    def __init__(self) -> None:
+        self.tags = _StringPool()
+        self.contexts = _StringPool()
+        self.units = _StringPool()
+        self.decimals = _StringPool()
+        self.tag_ids = array("I")
+        self.context_ids = array("I")
+        self.unit_ids = array("I")
+        self.decimals_ids = array("I")
+        self.values: list[str] = []
+        self._nil_bits = bytearray()
+        self._local_index: dict[str, list[int]] | None = None
+
+    @classmethod
+    def from_dicts(cls, facts: Iterable[Mapping[str, Any]]) -> "FactTable":
+        """従来の list[dict] 形式から FactTable を構築する。"""
+        table = cls()
+        for f in facts:
+            table.append(
+                f.get("tag", ""), f.get("contextRef", ""), f.get("unitRef", ""),
+                f.get("decimals", ""), f.get("value", ""), f.get("is_nil", False),
+            )
+        return table
+
+    def append(
+        self,
+        tag: str,
+        context_ref: str,
+        unit_ref: str,
+        decimals: str,
+        value: str,
+        is_nil: bool,
+    ) -> None:
+        """fact を1行追加する。"""
+        index = len(self.values)
+        self.tag_ids.append(self.tags.intern(tag))
+        self.context_ids.append(self.contexts.intern(context_ref))
+        self.unit_ids.append(self.units.intern(unit_ref))
+        self.decimals_ids.append(self.decimals.intern(decimals))
+        self.values.append(value)
+        if index % 8 == 0:
+            self._nil_bits.append(0)
+        if is_nil:
+            self._nil_bits[index >> 3] |= 1 << (index & 7)
+        self._local_index = None
+
+    def is_nil(self, index: int) -> bool:
+        """index 行目が xsi:nil か判定する。"""
+        return bool(self._nil_bits[index >> 3] & (1 << (index & 7)))
+
+    def tag_local_names(self) -> list[str]:
+        """タグID -> ローカル名（prefix 除去済み）のリストを返す。"""
+        return [tag.rpartition(":")[2] for tag in self.tags.strings]
+
+    def rows_with_local_name(self, local_name: str) -> list[int]:
+        """ローカル名が一致する行番号を文書順で返す（初回呼び出し時に索引を構築）。"""
+        return self._rows_by_local_name().get(local_name, [])
+
+    def bucket_rows(
+        self,
+        context_key: Callable[[str], Hashable | None],
+        include_local: Callable[[str], bool] | None = None,
+    ) -> dict[str, dict[Hashable, list[int]]]:
+        """
+        ローカル名 → context_key(contextRef) → 行番号リスト（文書順）の索引を構築する。
+
+        context_key は contextRef の種類ごとに1回だけ呼ばれ、None を返した contextRef の行は除外する。
+        include_local 指定時は、それが True を返すローカル名の行のみを対象とする。
+        """
+        context_strings = self.contexts.strings
+        keys_by_context: dict[int, Hashable | None] = {}
+        context_ids = self.context_ids
+        buckets: dict[str, dict[Hashable, list[int]]] = {}
+        for local, rows in self._rows_by_local_name().items():
+            if include_local is not None and not include_local(local):
+                continue
+            by_key: dict[Hashable, list[int]] = {}
+            for row in rows:
+                context_id = context_ids[row]
+                if context_id in keys_by_context:
+                    key = keys_by_context[context_id]
+                else:
+                    key = keys_by_context[context_id] = context_key(context_strings[context_id])
+                if key is None:
+                    continue
+                bucket = by_key.get(key)
+                if bucket is None:
+                    by_key[key] = [row]
+                else:
+                    bucket.append(row)
+            if by_key:
+                buckets[local] = by_key
+        return buckets
+
+    def select_local_names(self, include_local: Callable[[str], bool]) -> "FactTable":
+        """include_local が True を返すローカル名の行のみを文書順で持つ新しい FactTable を返す。"""
+        locals_by_id = self.tag_local_names()
+        keep_tag = [include_local(local) for local in locals_by_id]
+        table = FactTable()
+        tags, contexts = self.tags.strings, self.contexts.strings
+        units, decimals = self.units.strings, self.decimals.strings
+        for row, tag_id in enumerate(self.tag_ids):
+            if keep_tag[tag_id]:
+                table.append(
+                    tags[tag_id], contexts[self.context_ids[row]], units[self.unit_ids[row]],
+                    decimals[self.decimals_ids[row]], self.values[row], self.is_nil(row),
+                )
+        return table
+
+    def _rows_by_local_name(self) -> dict[str, list[int]]:
+        if self._local_index is None:
+            index: dict[str, list[int]] = {}
+            locals_by_id = self.tag_local_names()
+            for row, tag_id in enumerate(self.tag_ids):
+                index.setdefault(locals_by_id[tag_id], []).append(row)
+            self._local_index = index
+        return self._local_index
+
+    def to_dicts(self) -> list[dict[str, Any]]:
+        """従来形式の list[dict] に変換する。"""
+        return [fact.to_dict() for fact in self]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, index: int) -> Fact:
+        n = len(self.values)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("FactTable index out of range")
+        return Fact(self, index)
+
+    def __iter__(self) -> Iterator[Fact]:
+        for index in range(len(self.values)):
+            yield Fact(self, index)
+
+    def __eq__(self, other: object) -> bool:
+        if _is_fact_table(other):
+            return self.to_dicts() == other.to_dicts()
+        if isinstance(other, list):
+            return self.to_dicts() == [dict(f) for f in other]
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_local_index"] = None
+        return state
+
+    def __repr__(self) -> str:
+        return f"FactTable(rows={len(self)}, tags={len(self.tags.strings)})"
+
+
+def _is_fact_table(obj: object) -> bool:
+    """FactTable か判定する。
+
+    src.parser / parser の両経路で import されうるため、クラス同一性ではなく属性で判定する。
+    """
+    return hasattr(obj, "tag_ids") and hasattr(obj, "rows_with_local_name")
+
+
+def ensure_fact_table(facts: "FactTable | Iterable[Mapping[str, Any]] | None") -> FactTable:
+    """FactTable ならそのまま、list[dict] なら FactTable に変換して返す。"""
+    if _is_fact_table(facts):
+        return facts  # type: ignore[return-value]
+    return FactTable.from_dicts(facts or [])
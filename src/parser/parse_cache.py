@@ -0,0 +1,198 @@
+"""
+ParseCache
+XBRLParser + ContextResolver の出力（facts / context_map 等）をディスクに保持するキャッシュ。
+
+キー: XBRLファイル内容の SHA-256 + PARSER_VERSION
+形式: pickle（FactTable は配列・文字列プールのまま保存される）
+容量: max_bytes を超えた場合、最終アクセス（mtime）が古いものから削除する（LRU）
+
+フィルタなしのパース結果を保存し、TagFilter は読み込み後の FactTable に適用する。
+マッピング（タグフィルタ）の変更・--keys による射影でもキーは変わらず、XML を読まずに済む。
+"""
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from .context_resolver import ContextResolver
+from .xbrl_parser import TagFilter, XBRLParser
+
+logger = logging.getLogger(__name__)
+
+# XBRLParser / ContextResolver の出力形式を変更したら更新する（旧キャッシュは参照されなくなる）
+PARSER_VERSION = "1"
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_CACHE_DIR = _PROJECT_ROOT / "data" / "cache" / "parsed"
+DEFAULT_MAX_MB = 2048
+
+_CACHE_SUFFIX = ".pkl"
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+def _file_sha256(path: Path) -> str:
+    """ファイル内容の SHA-256 を返す。"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """
+    パース結果の永続キャッシュ。
+
+    使用例:
+        cache = ParseCache.from_env()
+        parsed = cache.parse(xbrl_path, tag_filter=build_tag_filter())
+        context_map = ContextResolver.from_parsed(parsed).build_context_map()
+    """
+
+    def __init__(self, cache_dir: Path | None = None, max_bytes: int | None = None) -> None:
+        """
+        Args:
+            cache_dir: キャッシュディレクトリ。未指定時は data/cache/parsed。
+            max_bytes: キャッシュ合計サイズの上限（バイト）。0 以下はキャッシュ無効。
+        """
+        self._dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self._max_bytes = DEFAULT_MAX_MB * 1024 * 1024 if max_bytes is None else max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> "ParseCache":
+        """環境変数 PARSE_CACHE_DIR / PARSE_CACHE_MAX_MB から構築する。MAX_MB=0 で無効化。"""
+        cache_dir = os.environ.get("PARSE_CACHE_DIR") or None
+        max_mb = os.environ.get("PARSE_CACHE_MAX_MB")
+        max_bytes = int(max_mb) * 1024 * 1024 if max_mb else None
+        return cls(Path(cache_dir) if cache_dir else None, max_bytes)
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_bytes > 0
+
+    def key_for(self, xbrl_path: Path) -> str:
+        """キャッシュキー（内容ハッシュ + パーサーバージョン）を返す。"""
+        return f"{_file_sha256(Path(xbrl_path))}-v{PARSER_VERSION}"
+
+    def parse(
+        self,
+        xbrl_path: Path,
+        *,
+        tag_filter: TagFilter | None = None,
+    ) -> dict[str, Any]:
+        """
+        キャッシュがあれば読み込み、なければ XBRLParser（ストリーミング）でパースして保存する。
+
+        返り値は XBRLParser.parse() と同じ構造で、context_map は
+        ContextResolver.build_context_map() 済み（派生属性付き）。
+        doc_id は常に xbrl_path から再設定する（同一内容の別パスでもキーを共有するため）。
+
+        キャッシュにはフィルタなしのパース結果を保存し、tag_filter は返却前に facts へ適用する
+        （discarded_fact_count もフィルタ付きでパースした場合と同じ値になる）。
+        """
+        xbrl_path = Path(xbrl_path)
+        if not self.enabled:
+            return self._parse_xml(xbrl_path, tag_filter)
+
+        key = self.key_for(xbrl_path)
+        parsed = self._load(key)
+        if parsed is None:
+            self.misses += 1
+            parsed = self._parse_xml(xbrl_path, None)
+            self._store(key, parsed)
+        else:
+            self.hits += 1
+            logger.debug("パースキャッシュ hit: %s", xbrl_path.name)
+        parsed["doc_id"] = xbrl_path.parent.name
+        if tag_filter is not None:
+            facts = parsed["facts"]
+            parsed["facts"] = facts.select_local_names(tag_filter.accepts)
+            parsed["discarded_fact_count"] = len(facts) - len(parsed["facts"])
+        return parsed
+
+    def clear(self) -> None:
+        """キャッシュファイルをすべて削除する。"""
+        for entry in self._entries():
+            self._remove(Path(entry.path))
+
+    # ------------------------------------------------------------------
+    # 内部処理
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _parse_xml(xbrl_path: Path, tag_filter: TagFilter | None) -> dict[str, Any]:
+        parsed = XBRLParser(xbrl_path, streaming=True, tag_filter=tag_filter).parse()
+        parsed["context_map"] = ContextResolver.from_parsed(parsed).build_context_map()
+        return parsed
+
+    def _path_for(self, key: str) -> Path:
+        return self._dir / f"{key}{_CACHE_SUFFIX}"
+
+    def _load(self, key: str) -> dict[str, Any] | None:
+        path = self._path_for(key)
+        try:
+            with open(path, "rb") as f:
+                parsed = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("パースキャッシュ破損のため削除: %s (%s)", path.name, e)
+            self._remove(path)
+            return None
+        # 最終アクセス時刻として mtime を更新（LRU 判定に使用）
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return parsed
+
+    def _store(self, key: str, parsed: dict[str, Any]) -> None:
+        try:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self._dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(parsed, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_name, self._path_for(key))
+            except BaseException:
+                self._remove(Path(tmp_name))
+                raise
+        except OSError as e:
+            logger.warning("パースキャッシュ保存失敗: %s", e)
+            return
+        self._evict()
+
+    def _entries(self) -> list[os.DirEntry]:
+        try:
+            with os.scandir(self._dir) as it:
+                return [e for e in it if e.is_file() and e.name.endswith(_CACHE_SUFFIX)]
+        except FileNotFoundError:
+            return []
+
+    def _evict(self) -> None:
+        """合計サイズが上限を超えていれば、最終アクセスの古い順に削除する。"""
+        entries = []
+        for entry in self._entries():
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        if total <= self._max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            self._remove(Path(path))
+            total -= size
+            logger.debug("パースキャッシュ evict: %s", Path(path).name)
+            if total <= self._max_bytes:
+                break
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
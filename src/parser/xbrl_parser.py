@@ -4,11 +4,15 @@ XBRLパーサー
 """
 import re
 import logging
+from collections.abc import Callable, Iterable
 from pathlib import Path
 from typing import Any
 
 from lxml import etree
 
+from .context_resolver import CONTEXT_TAG, XBRLI_NS, parse_context_element
+from .fact_table import FactTable
+
 logger = logging.getLogger(__name__)
 
 # 除外する名前空間URI
@@ -16,8 +20,16 @@ LINK_NS = "http://www.xbrl.org/2003/linkbase"
 XLINK_NS = "http://www.w3.org/1999/xlink"
 XSI_NS = "http://www.w3.org/2001/XMLSchema-instance"
 _XSI_NIL_ATTR = f"{{{XSI_NS}}}nil"
+_XLINK_HREF_ATTR = f"{{{XLINK_NS}}}href"
+_UNIT_TAG = f"{{{XBRLI_NS}}}unit"
+_MEASURE_TAG = f"{{{XBRLI_NS}}}measure"
+_DIVIDE_TAG = f"{{{XBRLI_NS}}}divide"
+_UNIT_NUMERATOR_TAG = f"{{{XBRLI_NS}}}unitNumerator"
+_UNIT_DENOMINATOR_TAG = f"{{{XBRLI_NS}}}unitDenominator"
 # 除外する要素のローカル名
 EXCLUDED_LOCAL_NAMES = frozenset(("context", "unit", "schemaRef"))
+# DEI（書類・企業情報）fact の名前空間 prefix
+DEI_PREFIX = "jpdei_cor"
 # taxonomy_version 抽出用の日付パターン（YYYY-MM-DD）
 TAXONOMY_DATE_PATTERN = re.compile(r"(\d{4}-\d{2}-\d{2})")
 
@@ -30,12 +42,19 @@ def _ns_to_prefix_map(root: etree._Element) -> dict[str, str]:
     return {v or "": k or "" for k, v in nsmap.items()}
 
 
-def _qname_for_element(element: etree._Element, ns_to_prefix: dict[str, str]) -> str:
-    """要素のQName（prefix:localname）を返す。"""
-    tag = element.tag
-    if not isinstance(tag, str) or tag[0] != "{":
-        return tag or ""
+def _fact_qname_for_tag(tag: str, ns_to_prefix: dict[str, str]) -> str | None:
+    """
+    Clark表記のタグから fact 用の QName（prefix:localname）を返す。
+
+    link/xlink 名前空間および EXCLUDED_LOCAL_NAMES の要素は fact ではないため None を返す。
+    """
+    if tag[0] != "{":
+        return None if tag in EXCLUDED_LOCAL_NAMES else tag
     ns_uri, _, local = tag[1:].partition("}")
+    if ns_uri in (LINK_NS, XLINK_NS):
+        return None
+    if local in EXCLUDED_LOCAL_NAMES:
+        return None
     prefix = ns_to_prefix.get(ns_uri, "")
     if prefix:
         return f"{prefix}:{local}"
@@ -47,34 +66,238 @@ def _get_text(element: etree._Element) -> str:
     return (element.text or "").strip()
 
 
+def _measure_text(parent: etree._Element) -> str:
+    """親要素直下の xbrli:measure のテキストを返す（複数ある場合は "*" で連結）。"""
+    return "*".join(_get_text(m) for m in parent.iterfind(_MEASURE_TAG))
+
+
+def _parse_unit_element(unit_elem: etree._Element) -> tuple[str, str] | None:
+    """
+    xbrli:unit 要素を解析し、(unit_id, measure) を返す。
+
+    単純単位は "iso4217:JPY"、除算単位は "iso4217:JPY/xbrli:shares" の形式。
+    """
+    unit_id = unit_elem.get("id")
+    if not unit_id:
+        return None
+    divide_elem = unit_elem.find(_DIVIDE_TAG)
+    if divide_elem is None:
+        return unit_id, _measure_text(unit_elem)
+    numerator = divide_elem.find(_UNIT_NUMERATOR_TAG)
+    denominator = divide_elem.find(_UNIT_DENOMINATOR_TAG)
+    num = _measure_text(numerator) if numerator is not None else ""
+    den = _measure_text(denominator) if denominator is not None else ""
+    return unit_id, f"{num}/{den}"
+
+
+def _taxonomy_version_from_schema_ref(elem: etree._Element) -> str:
+    """link:schemaRef の xlink:href に含まれる最初の日付（YYYY-MM-DD）を返す。"""
+    href = elem.get(_XLINK_HREF_ATTR)
+    if href:
+        m = TAXONOMY_DATE_PATTERN.search(href)
+        if m:
+            return m.group(1)
+    return ""
+
+
+class TagFilter:
+    """
+    fact をローカル名で絞り込むフィルタ（マッピング対象タグのみを materialize する）。
+
+    local_names は完全一致、keywords は部分一致で判定する。
+    判定結果は _DocumentCollector がタグ種類ごとにキャッシュする。
+    """
+
+    def __init__(self, local_names: Iterable[str], keywords: Iterable[str] = ()) -> None:
+        self.local_names = frozenset(local_names)
+        self.keywords = tuple(keywords)
+
+    def accepts(self, local_name: str) -> bool:
+        """ローカル名が取り込み対象か判定する。"""
+        if local_name in self.local_names:
+            return True
+        return any(kw in local_name for kw in self.keywords)
+
+
+class _DocumentCollector:
+    """
+    要素を1つずつ受け取り、taxonomy_version / context_map / unit_map / facts を蓄積する。
+
+    ツリー走査（root.iter()）と iterparse ストリーミングの両方から共通で使う。
+    """
+
+    def __init__(self, ns_to_prefix: dict[str, str], tag_filter: TagFilter | None = None) -> None:
+        self.ns_to_prefix = ns_to_prefix
+        self.tag_filter = tag_filter
+        self.discarded_count = 0
+        self.taxonomy_version = ""
+        self.schema_ref_seen = False
+        self.facts = FactTable()
+        self.context_map: dict[str, dict[str, Any]] = {}
+        self.unit_map: dict[str, str] = {}
+        # Clark表記タグ -> fact QName（fact 対象外・フィルタ除外は None）。タグ種類数分だけ計算する
+        self._qname_cache: dict[str, str | None] = {}
+        self._filtered_tags: set[str] = set()
+
+    def add(self, elem: etree._Element) -> None:
+        """要素1つを分類し、context / unit / schemaRef / fact のいずれかとして取り込む。"""
+        tag = elem.tag
+        if not isinstance(tag, str):
+            return
+
+        context_ref = elem.get("contextRef")
+        if context_ref is None:
+            if tag == CONTEXT_TAG:
+                parsed_context = parse_context_element(elem)
+                if parsed_context is not None:
+                    self.context_map[parsed_context[0]] = parsed_context[1]
+            elif tag == _UNIT_TAG:
+                parsed_unit = _parse_unit_element(elem)
+                if parsed_unit is not None:
+                    self.unit_map[parsed_unit[0]] = parsed_unit[1]
+            elif not self.schema_ref_seen and tag.rpartition("}")[2] == "schemaRef":
+                # 最初の link:schemaRef の xlink:href に含まれる日付を使用
+                self.schema_ref_seen = True
+                self.taxonomy_version = _taxonomy_version_from_schema_ref(elem)
+            return
+
+        # contextRef を持つ要素を fact として収集（link/xlink/context/unit/schemaRef は除外）
+        qname_cache = self._qname_cache
+        if tag in qname_cache:
+            qname = qname_cache[tag]
+        else:
+            qname = self._resolve_qname(tag)
+            qname_cache[tag] = qname
+        if qname is None:
+            if tag in self._filtered_tags:
+                self.discarded_count += 1
+            return
+
+        is_nil = elem.get(_XSI_NIL_ATTR, "").lower() == "true"
+        self.facts.append(
+            qname,
+            context_ref,
+            elem.get("unitRef") or "",
+            elem.get("decimals", ""),
+            "" if is_nil else _get_text(elem),
+            is_nil,
+        )
+
+    def _resolve_qname(self, tag: str) -> str | None:
+        """fact の QName を返す。fact 対象外、またはフィルタで除外されるタグは None。"""
+        qname = _fact_qname_for_tag(tag, self.ns_to_prefix)
+        if qname is None or self.tag_filter is None:
+            return qname
+        if self.tag_filter.accepts(qname.rpartition(":")[2]):
+            return qname
+        self._filtered_tags.add(tag)
+        return None
+
+
 class XBRLParser:
     """
-    XBRLインスタンスから doc_id / taxonomy_version / facts を抽出するパーサー。
+    XBRLインスタンスから doc_id / taxonomy_version / facts / context_map / unit_map を抽出するパーサー。
     """
 
-    def __init__(self, xbrl_path: Path) -> None:
+    def __init__(
+        self,
+        xbrl_path: Path,
+        *,
+        streaming: bool = False,
+        tag_filter: TagFilter | None = None,
+    ) -> None:
         """
         Args:
             xbrl_path: XBRLファイルのパス。
+            streaming: True の場合 iterparse で逐次処理し、処理済み要素を破棄する。
+                       DOM 全体を保持しないため巨大インスタンスでもメモリが一定に保たれる。
+                       ルート要素は保持しないため root プロパティは使用できない。
+            tag_filter: 指定時はローカル名がフィルタに一致する fact のみを収集する。
+                        除外件数は parse() 結果の discarded_fact_count に記録される。
         """
         self._path = Path(xbrl_path)
         if not self._path.is_file():
             raise FileNotFoundError(f"XBRL file not found: {self._path}")
+        self._streaming = streaming
+        self._tag_filter = tag_filter
         self._root: etree._Element | None = None
 
     def parse(self) -> dict[str, Any]:
         """
-        XBRLをパースし、doc_id / taxonomy_version / facts を返す。
+        XBRLをパースし、doc_id / taxonomy_version / facts / context_map / unit_map を返す。
+
+        schemaRef・context・unit・fact はドキュメントを1回だけ走査して同時に収集する。
 
         Returns:
             doc_id: ファイルパスから取得したドキュメントID（例: S100VUAT）
             taxonomy_version: schemaRef から抽出した日付（YYYY-MM-DD）
-            facts: 各factの tag, contextRef, unitRef, decimals, value, is_nil のリスト
+            facts: 各factの tag, contextRef, unitRef, decimals, value, is_nil を保持する FactTable
+                   （反復すると dict 互換の Fact ビューを返す）
+            context_map: contextRef -> 期間情報（ContextResolver と同一形式）
+            unit_map: unitRef -> measure（例: "iso4217:JPY"）
+            discarded_fact_count: tag_filter で除外した fact 数（フィルタなしは 0）
+        """
+        if self._streaming:
+            collector = self._collect_streaming(self._tag_filter)
+        else:
+            collector = self._collect_tree()
+        return self._result(collector)
+
+    def scan_dei(self, local_names: Iterable[str] = ()) -> dict[str, Any]:
         """
+        DEI（jpdei_cor）fact だけを目的とした高速スキャン。
+
+        EDINET インスタンスでは DEI fact が context / unit の直後にまとまって出現するため、
+        DEI fact の後に別の名前空間の fact が現れた時点、または local_names が全て揃った時点で
+        走査を打ち切る。streaming 指定に関わらず iterparse で処理する。
+
+        Args:
+            local_names: 取得したいタグのローカル名。全て揃えば DEI ブロック終了前でも打ち切る。
+                         空（既定）の場合は DEI ブロックの終わりまで読む。
+
+        Returns:
+            parse() と同じ構造。facts は打ち切り時点までの fact（DEI ブロック + 直後の1件）。
+        """
+        remaining = set(local_names)
+        stop_when_found = bool(remaining)
+        seen = 0
+        in_dei_block = False
+
+        def block_finished(collector: _DocumentCollector) -> bool:
+            nonlocal seen, in_dei_block
+            facts = collector.facts
+            if len(facts) == seen:
+                return False
+            seen = len(facts)
+            prefix, _, local = facts[-1].tag.rpartition(":")
+            remaining.discard(local)
+            if prefix == DEI_PREFIX:
+                in_dei_block = True
+            elif in_dei_block:
+                return True
+            return stop_when_found and in_dei_block and not remaining
+
+        collector = self._collect_streaming(None, stop=block_finished)
+        return self._result(collector)
+
+    def _result(self, collector: _DocumentCollector) -> dict[str, Any]:
         doc_id = self._path.parent.name
-        taxonomy_version = ""
-        facts: list[dict[str, str]] = []
+        logger.debug(
+            "XBRLパース完了: doc_id=%s, facts=%d, discarded=%d, contexts=%d, units=%d",
+            doc_id, len(collector.facts), collector.discarded_count,
+            len(collector.context_map), len(collector.unit_map),
+        )
+        return {
+            "doc_id": doc_id,
+            "taxonomy_version": collector.taxonomy_version,
+            "facts": collector.facts,
+            "context_map": collector.context_map,
+            "unit_map": collector.unit_map,
+            "discarded_fact_count": collector.discarded_count,
+        }
 
+    def _collect_tree(self) -> _DocumentCollector:
+        """DOM を構築し、root.iter() の1回の走査で全要素を収集する。"""
         parser = etree.XMLParser(recover=False, remove_blank_text=False)
         try:
             tree = etree.parse(str(self._path), parser=parser)
@@ -84,69 +307,67 @@ class XBRLParser:
 
         root = tree.getroot()
         self._root = root
-        ns_to_prefix = _ns_to_prefix_map(root)
-
-        # schemaRef から taxonomy_version（YYYY-MM-DD）を抽出
-        # link:schemaRef の xlink:href に含まれる日付のうち最初のものを使用
-        xlink_href = f"{{{XLINK_NS}}}href"
+        collector = _DocumentCollector(_ns_to_prefix_map(root), self._tag_filter)
         for elem in root.iter():
-            if etree.QName(elem).localname == "schemaRef":
-                href = elem.get(xlink_href)
-                if href:
-                    m = TAXONOMY_DATE_PATTERN.search(href)
-                    if m:
-                        taxonomy_version = m.group(1)
-                        break
-                break
+            collector.add(elem)
+        return collector
 
-        # contextRef を持つ要素を fact として収集（link/xlink/context/unit/schemaRef は除外）
-        for elem in root.iter():
-            context_ref = elem.get("contextRef")
-            if context_ref is None:
-                continue
-
-            tag_qname = elem.tag
-            if not isinstance(tag_qname, str):
-                continue
-            if tag_qname.startswith("{"):
-                ns_uri = tag_qname[1 : tag_qname.index("}")]
-                local = etree.QName(elem).localname
-            else:
-                ns_uri = ""
-                local = tag_qname
-
-            if ns_uri in (LINK_NS, XLINK_NS):
-                continue
-            if local in EXCLUDED_LOCAL_NAMES:
-                continue
-
-            tag = _qname_for_element(elem, ns_to_prefix)
-            unit_ref = elem.get("unitRef") or ""
-            decimals = elem.get("decimals", "")
-            is_nil = elem.get(_XSI_NIL_ATTR, "").lower() == "true"
-            value = "" if is_nil else _get_text(elem)
-
-            facts.append({
-                "tag": tag,
-                "contextRef": context_ref,
-                "unitRef": unit_ref,
-                "decimals": decimals,
-                "value": value,
-                "is_nil": is_nil,
-            })
+    def _collect_streaming(
+        self,
+        tag_filter: TagFilter | None,
+        stop: Callable[[_DocumentCollector], bool] | None = None,
+    ) -> _DocumentCollector:
+        """
+        iterparse で要素の終了イベントごとに収集し、ルート直下の要素は処理後に破棄する。
 
-        return {
-            "doc_id": doc_id,
-            "taxonomy_version": taxonomy_version,
-            "facts": facts,
-        }
+        context は子要素（period 等）を含めて終了時点で解決される。
+        タプル内にネストした fact は親要素より先に収集される（終了イベント順）。
+
+        Args:
+            tag_filter: fact の取り込みフィルタ（None は全件）。
+            stop: 要素を取り込むたびに呼ばれ、True を返すとそこで走査を打ち切る。
+        """
+        collector = _DocumentCollector({}, tag_filter)
+        ns_to_prefix = collector.ns_to_prefix
+        context = etree.iterparse(
+            str(self._path),
+            events=("start-ns", "end"),
+            remove_blank_text=False,
+            recover=False,
+            huge_tree=True,
+        )
+        try:
+            for event, item in context:
+                if event == "start-ns":
+                    prefix, ns_uri = item
+                    ns_to_prefix[ns_uri or ""] = prefix or ""
+                    continue
+
+                collector.add(item)
+                if stop is not None and stop(collector):
+                    break
+                parent = item.getparent()
+                if parent is None or parent.getparent() is not None:
+                    continue
+                # ルート直下の要素: 子孫も含めて処理済みのため解放し、先行する兄弟も削除する
+                item.clear(keep_tail=False)
+                while item.getprevious() is not None:
+                    del parent[0]
+        except etree.XMLSyntaxError:
+            logger.exception("XBRLのパースに失敗しました: %s", self._path)
+            raise
+        finally:
+            del context
+        return collector
 
     @property
     def root(self) -> etree._Element:
         """
         パース済みのXBRLルート要素を返す。
-        parse()を実行後にアクセス可能。
+        parse()を実行後にアクセス可能。streaming モードでは保持しないため使用できない。
         """
+        if self._streaming:
+            raise RuntimeError("streaming モードではルート要素を保持しません")
         if self._root is None:
             raise RuntimeError("parse()を先に実行してください")
         return self._root